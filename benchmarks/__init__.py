@@ -0,0 +1 @@
+# Výkonnostní měření Playfair šifry (spouštějte z kořene repozitáře)
@@ -0,0 +1,53 @@
+# Měření škálování PlayfairCipher.restore_spaces_and_special
+# Spuštění: python -m benchmarks.bench_restore [--legacy]
+
+import argparse
+import time
+
+from benchmarks import reference
+from benchmarks.corpus import make_text
+from playfair_core import PlayfairCipher
+
+SIZES = [10 * 1024, 1024 * 1024, 10 * 1024 * 1024]
+
+
+def measure(function, *args):
+    """Vrátí dobu běhu funkce v sekundách."""
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Škálování restore_spaces_and_special")
+    parser.add_argument('--legacy', action='store_true',
+                        help="změřit i původní implementaci z benchmarks.reference (jen do --legacy-max bajtů)")
+    parser.add_argument('--legacy-max', type=int, default=64 * 1024,
+                        help="největší vstup pro původní implementaci")
+    args = parser.parse_args(argv)
+
+    cipher = PlayfairCipher()
+    cipher.generate_table("PLAYFAIR")
+
+    print(f"{'velikost':>12} {'mezery':>10} {'výplně':>10} {'čas [s]':>10} {'µs/KB':>8}", end='')
+    print(f" {'původní [s]':>12}" if args.legacy else '')
+    for size in SIZES:
+        text = make_text(size)
+        _, pairs, filtered, spaces = cipher.encrypt(text)
+        padding = cipher.last_encryption_metadata['padding_positions']
+        # Dešifrovaný text je totožný s připravenými bigramy včetně výplní
+        decrypted = ''.join(pairs)
+
+        elapsed = measure(cipher.restore_spaces_and_special, decrypted, spaces, padding)
+        line = f"{size:>12} {len(spaces):>10} {len(padding):>10} {elapsed:>10.4f} {elapsed * 1e6 / (size / 1024):>8.1f}"
+        if args.legacy:
+            if size <= args.legacy_max:
+                legacy_restore = reference.PlayfairCipher().restore_spaces_and_special
+                line += f" {measure(legacy_restore, decrypted, spaces, padding):>12.4f}"
+            else:
+                line += f" {'-':>12}"
+        print(line)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,24 @@
+# Generátor syntetických textů pro měření výkonu
+
+import random
+
+# Slova s častými zdvojenými písmeny a běžnou délkou
+WORDS = {
+    'EN': ["attack", "at", "dawn", "letter", "balloon", "coffee", "all", "see", "bookkeeper",
+           "the", "hidden", "treasure", "committee", "success", "jazz", "will", "address"],
+    'CZ': ["útok", "na", "čeňka", "příliš", "žluťoučký", "kůň", "úpěl", "ďábelské", "ódy",
+           "měkký", "oddíl", "nejjednodušší", "cenný", "vyšší", "šifra", "dvojitý", "vwxyz"],
+}
+
+
+def make_text(size, lang='EN', seed=0):
+    """Vygeneruje text dané délky (ve znacích) s mnoha mezerami a zdvojenými písmeny."""
+    rng = random.Random(seed)
+    words = WORDS[lang]
+    parts = []
+    length = 0
+    while length < size:
+        word = rng.choice(words)
+        parts.append(word)
+        length += len(word) + 1
+    return ' '.join(parts)[:size]
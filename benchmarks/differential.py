@@ -0,0 +1,599 @@
+# Diferenciální fuzzing všech enginů proti zmrazené původní implementaci
+# Spuštění: python -m benchmarks.differential [--cases 200] [--max-size 262144] [--seed 0]
+#
+# Každý případ (jazyk, náhodný klíč, náhodný text) se zašifruje referencí
+# z benchmarks.reference a každým enginem; porovnává se formátovaný šifrový
+# text, pozice mezer a výplní, dešifrování bez metadat (i nesmyslného
+# vstupu) a u malých vstupů i obnova mezer. Zároveň se měří čas enginu
+# a reference nad stejným vstupem a na konci se vypíše zrychlení.
+
+import argparse
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import namedtuple
+from pathlib import Path
+
+import playfair_mmap
+from benchmarks import reference
+from benchmarks.corpus import WORDS
+from playfair_batch import BatchJob, run_batch
+from playfair_bulk import HAS_NUMPY, BulkPlayfairCipher
+from playfair_container import ContainerReader, ContainerWriter
+from playfair_core import (ALPHABET_CZ, ALPHABET_EN, PlayfairCipher, StreamDecryptor, StreamEncryptor,
+                           decrypt_message, decrypt_stream, encrypt_message, get_compiled_key)
+from playfair_incremental import EncryptedDocument
+from playfair_metadata import EncryptionMetadata
+
+LANGUAGES = ['EN', 'CZ']
+
+# Původní obnova mezer je kvadratická; s metadaty se dešifrují jen menší vstupy
+DEFAULT_RESTORE_MAX = 16 * 1024
+
+DEFAULT_MAX_SIZE = 256 * 1024
+
+# Jednobajtová kódování pro bajtový (mmap) engine
+BYTE_ENCODINGS = {'EN': 'latin-1', 'CZ': 'cp1250'}
+
+# Znaky, které filtr mění nebo vypouští: diakritika, J/W, interpunkce, číslice,
+# bílé znaky, písmena mimo latinku i ligatury, jejichž velké písmeno má dva znaky
+NOISE = "áčďéěíňóřšťúůýžÁČĎÉĚÍŇÓŘŠŤÚŮÝŽäöüÿàçñ" "jJwW" ".,;:!?-'\"()0123456789" "\t\n\r " \
+        "ßﬆﬁǅΩωжЖ"
+
+Case = namedtuple('Case', 'number lang key text')
+
+# Neshoda enginu s referencí
+Mismatch = namedtuple('Mismatch', 'engine case check detail')
+
+
+def random_text(rng, lang, size):
+    """
+    Náhodný text dané délky pro daný jazyk.
+
+    Skládá se ze slov korpusu, náhodných písmen v obou velikostech, řad
+    zdvojených písmen (hlavně výplňových X a Q), mezer a šumu z NOISE.
+    """
+    alphabet = ALPHABET_CZ if lang == 'CZ' else ALPHABET_EN
+    words = WORDS[lang]
+    parts = []
+    length = 0
+    while length < size:
+        kind = rng.random()
+        if kind < 0.3:
+            part = rng.choice(words)
+        elif kind < 0.5:
+            part = ''.join(rng.choice(alphabet) for _ in range(rng.randint(1, 8)))
+            part = part.lower() if rng.random() < 0.5 else part
+        elif kind < 0.65:
+            part = rng.choice(alphabet + 'XXXQQ') * rng.randint(2, 4)
+        elif kind < 0.85:
+            part = ' ' * rng.randint(1, 3)
+        else:
+            part = rng.choice(NOISE)
+        parts.append(part)
+        length += len(part)
+    return ''.join(parts)[:size]
+
+
+# Okrajové případy: prázdný text, lichá délka, zdvojené výplně, jen mezery nebo šum
+EDGE_TEXTS = ['', 'a', 'x', 'q', 'xx', 'XXX', 'xq', 'qq', 'xxqq', 'j', 'w', 'jj', 'ww', 'ab ', ' ',
+              '   ', ' a ', 'ß', 'ﬆ', '!?', 'aa aa', 'x x x', 'attack at dawn', 'příliš žluťoučký kůň']
+
+
+def make_cases(rng, languages, count, max_size):
+    """Okrajové případy, `count` náhodných textů na jazyk a jeden text délky max_size."""
+    number = 0
+    for lang in languages:
+        texts = list(EDGE_TEXTS)
+        for _ in range(count):
+            limit = rng.choice([16, 256, 4096])
+            texts.append(random_text(rng, lang, rng.randint(0, min(limit, max_size))))
+        texts.append(random_text(rng, lang, max_size))
+        for text in texts:
+            key = random_text(rng, lang, rng.randint(0, 20))
+            yield Case(number, lang, key, text)
+            number += 1
+
+
+def _timed(function, *args):
+    """Vrátí (výsledek, doba běhu v sekundách)."""
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def _normalize(ciphertext, metadata):
+    """Výsledek šifrování ve tvaru vhodném pro porovnání."""
+    metadata = EncryptionMetadata.coerce(metadata)
+    return ciphertext, list(metadata.spaces), list(metadata.padding_positions)
+
+
+def _split(rng, data, pieces):
+    """Rozdělí text nebo bajty na nejvýše `pieces` náhodně dlouhých kusů."""
+    cuts = sorted(rng.sample(range(1, len(data)), min(pieces, len(data) - 1))) if len(data) > 1 else []
+    bounds = [0] + cuts + [len(data)]
+    return [data[start:stop] for start, stop in zip(bounds, bounds[1:])]
+
+
+class Reference:
+    """Zmrazená implementace pro jeden jazyk a klíč; výsledky i časy se pamatují."""
+
+    def __init__(self, lang, key):
+        self.cipher = reference.PlayfairCipher()
+        self.cipher.set_language(lang)
+        self.cipher.generate_table(key)
+        self._cache = {}
+
+    def _call(self, name, function, *args):
+        entry = (name,) + args
+        if entry not in self._cache:
+            self._cache[entry] = _timed(function, *args)
+        return self._cache[entry]
+
+    def _encrypt(self, text):
+        formatted, _, _, _ = self.cipher.encrypt(text)
+        metadata = self.cipher.last_encryption_metadata
+        return formatted, list(metadata['spaces']), list(metadata['padding_positions'])
+
+    def _decrypt_raw(self, ciphertext):
+        # Bez uložených metadat původní decrypt mezery neobnovuje
+        self.cipher.last_encryption_metadata = None
+        return self.cipher.decrypt(ciphertext)
+
+    def encrypt(self, text):
+        """(šifrový text, pozice mezer, pozice výplní), doba běhu."""
+        return self._call('encrypt', self._encrypt, text)
+
+    def decrypt_raw(self, ciphertext):
+        """Dešifrování bez metadat, doba běhu."""
+        return self._call('decrypt_raw', self._decrypt_raw, ciphertext)
+
+    def decrypt(self, ciphertext, spaces, padding_positions):
+        """Dešifrování s obnovou mezer, doba běhu."""
+        return self._call('decrypt', self.cipher.decrypt, ciphertext, tuple(spaces), tuple(padding_positions))
+
+
+class Engine:
+    """
+    Testovaný engine se stejným rozhraním jako reference.
+
+    Podtřídy implementují encrypt(text) -> (šifrový text, metadata) a
+    decrypt(ciphertext, metadata=None); bez metadat se vrací text bez
+    obnovených mezer. run() porovná výsledky s referencí.
+    """
+
+    name = None
+    # Umí dešifrovat s obnovou mezer z metadat
+    restores = True
+    # Co znamenají časy, pokud se neměří proti referenci na stejné operaci
+    timing_note = None
+
+    def __init__(self, case, rng):
+        self.lang = case.lang
+        self.compiled = get_compiled_key(case.key, case.lang)
+        self.rng = rng
+
+    @classmethod
+    def available(cls):
+        return True
+
+    def prepare(self, text):
+        """Otevřený text, který engine skutečně zpracuje (reference dostane stejný)."""
+        return text
+
+    def prepare_ciphertext(self, text):
+        """Libovolný text předávaný k dešifrování bez metadat."""
+        return text
+
+    def run(self, case, ref, restore_max):
+        """Vrátí (seznam (kontrola, očekávané, skutečné), časy {operace: (engine, reference)})."""
+        text = self.prepare(case.text)
+        expected, reference_encrypt = ref.encrypt(text)
+        (ciphertext, metadata), engine_encrypt = _timed(self.encrypt, text)
+        checks = [('encrypt', expected, _normalize(ciphertext, metadata))]
+
+        raw, reference_decrypt = ref.decrypt_raw(expected[0])
+        actual, engine_decrypt = _timed(self.decrypt, expected[0])
+        checks.append(('decrypt', raw, actual))
+
+        noise = self.prepare_ciphertext(case.text)
+        checks.append(('decrypt_noise', ref.decrypt_raw(noise)[0], self.decrypt(noise)))
+
+        if self.restores and len(text) <= restore_max:
+            plaintext, _ = ref.decrypt(*expected)
+            checks.append(('decrypt_metadata', plaintext,
+                           self.decrypt(expected[0], EncryptionMetadata(expected[1], expected[2]))))
+        return checks, {'encrypt': (engine_encrypt, reference_encrypt),
+                        'decrypt': (engine_decrypt, reference_decrypt)}
+
+
+class CipherEngine(Engine):
+    """PlayfairCipher z playfair_core (objektové rozhraní se stavem)."""
+
+    name = 'cipher'
+
+    def __init__(self, case, rng):
+        super().__init__(case, rng)
+        self.cipher = self._new_cipher()
+        self.cipher.set_language(case.lang)
+        self.cipher.generate_table(case.key)
+
+    def _new_cipher(self):
+        return PlayfairCipher()
+
+    def encrypt(self, text):
+        formatted, _, _, _ = self.cipher.encrypt(text)
+        return formatted, self.cipher.last_encryption_metadata
+
+    def decrypt(self, ciphertext, metadata=None):
+        if metadata is None:
+            self.cipher.last_encryption_metadata = None
+            return self.cipher.decrypt(ciphertext)
+        return self.cipher.decrypt(ciphertext, list(metadata.spaces), list(metadata.padding_positions))
+
+
+class BulkEngine(CipherEngine):
+    """BulkPlayfairCipher s vektorovým převodem (NumPy)."""
+
+    name = 'bulk-numpy'
+    use_numpy = True
+
+    @classmethod
+    def available(cls):
+        return HAS_NUMPY or not cls.use_numpy
+
+    def _new_cipher(self):
+        return BulkPlayfairCipher(self.use_numpy)
+
+
+class BulkPythonEngine(BulkEngine):
+    """BulkPlayfairCipher se slovníkovou variantou."""
+
+    name = 'bulk-python'
+    use_numpy = False
+
+
+class MessageEngine(Engine):
+    """Bezstavové funkce encrypt_message / decrypt_message."""
+
+    name = 'message'
+
+    def encrypt(self, text):
+        return encrypt_message(self.compiled, text)
+
+    def decrypt(self, ciphertext, metadata=None):
+        return decrypt_message(self.compiled, ciphertext, metadata)
+
+
+class StreamEngine(Engine):
+    """StreamEncryptor po náhodných blocích a decrypt_stream nad bajty UTF-8."""
+
+    name = 'stream'
+    restores = False
+
+    def encrypt(self, text):
+        encryptor = StreamEncryptor(self.compiled, collect_metadata=True)
+        output = [encryptor.feed(chunk) for chunk in _split(self.rng, text, self.rng.randint(1, 64))]
+        output.append(encryptor.finish())
+        return ''.join(output), encryptor.metadata()
+
+    def decrypt(self, ciphertext, metadata=None):
+        data = ciphertext.encode('utf-8')
+        chunk_size = self.rng.randint(1, max(1, len(data) // self.rng.randint(1, 32)))
+        return ''.join(decrypt_stream(self.compiled, io.BytesIO(data), chunk_size=chunk_size))
+
+
+class StreamDecryptorEngine(StreamEngine):
+    """StreamDecryptor po náhodných textových blocích."""
+
+    name = 'stream-decryptor'
+
+    def decrypt(self, ciphertext, metadata=None):
+        decryptor = StreamDecryptor(self.compiled)
+        output = [decryptor.feed(chunk) for chunk in _split(self.rng, ciphertext, self.rng.randint(1, 64))]
+        output.append(decryptor.finish())
+        return ''.join(output)
+
+
+class MmapEngine(Engine):
+    """Bajtový engine z playfair_mmap (vstup v jednobajtovém kódování jazyka)."""
+
+    name = 'mmap-numpy'
+    restores = False
+    use_numpy = True
+
+    @classmethod
+    def available(cls):
+        return playfair_mmap.HAS_NUMPY or not cls.use_numpy
+
+    def __init__(self, case, rng):
+        super().__init__(case, rng)
+        self.encoding = BYTE_ENCODINGS[case.lang]
+
+    def prepare(self, text):
+        return text.encode(self.encoding, errors='replace').decode(self.encoding)
+
+    def prepare_ciphertext(self, text):
+        # Šifrový text je vždy ASCII, dešifrování čte bajty jako ASCII
+        return text.encode('ascii', errors='replace').decode('ascii')
+
+    def _with_backend(self, function, *args):
+        """Spustí funkci s vybranou variantou modulu (NumPy nebo čistý Python)."""
+        saved = playfair_mmap.HAS_NUMPY
+        playfair_mmap.HAS_NUMPY = self.use_numpy
+        try:
+            return function(*args)
+        finally:
+            playfair_mmap.HAS_NUMPY = saved
+
+    def _encrypt(self, text):
+        encryptor = playfair_mmap.ByteEncryptor(self.compiled, self.encoding, collect_metadata=True)
+        data = text.encode(self.encoding)
+        output = [bytes(encryptor.feed(chunk)) for chunk in _split(self.rng, data, self.rng.randint(1, 64))]
+        output.append(encryptor.finish())
+        return b''.join(output).decode('ascii'), encryptor.metadata()
+
+    def _decrypt(self, ciphertext):
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, 'cipher')
+            target = os.path.join(directory, 'plain')
+            Path(source).write_bytes(ciphertext.encode('ascii'))
+            # Malé bloky jen u malých vstupů, aby počet bloků (a režie) zůstal omezený
+            chunk_size = max(self.rng.choice([1, 7, 4096]), len(ciphertext) // 16)
+            playfair_mmap.decrypt_file(self.compiled, source, target, chunk_size=chunk_size)
+            return Path(target).read_bytes().decode('ascii')
+
+    def encrypt(self, text):
+        return self._with_backend(self._encrypt, text)
+
+    def decrypt(self, ciphertext, metadata=None):
+        return self._with_backend(self._decrypt, ciphertext)
+
+
+class MmapPythonEngine(MmapEngine):
+    """Bajtový engine bez NumPy."""
+
+    name = 'mmap-python'
+    use_numpy = False
+
+
+class BatchEngine(Engine):
+    """run_batch z playfair_batch (úlohy v aktuálním procesu)."""
+
+    name = 'batch'
+
+    def __init__(self, case, rng):
+        super().__init__(case, rng)
+        self.key = case.key
+
+    @staticmethod
+    def _result(results):
+        result, = results
+        if not result.ok:
+            raise RuntimeError(result.error)
+        return result
+
+    def encrypt(self, text):
+        result = self._result(run_batch([BatchJob(self.key, self.lang, text)], 'encrypt', workers=1))
+        return result.output, result.metadata
+
+    def decrypt(self, ciphertext, metadata=None):
+        if metadata is not None:
+            metadata = metadata.to_bytes()
+        job = BatchJob(self.key, self.lang, ciphertext, metadata)
+        return self._result(run_batch([job], 'decrypt', workers=1)).output
+
+
+class ContainerEngine(Engine):
+    """
+    Kontejner z playfair_container zapsaný po náhodných kusech.
+
+    Každý blok odpovídá samostatnému šifrování svého úseku textu, s tím se
+    porovnává; čas se srovnává se součtem časů reference pro všechny bloky.
+    """
+
+    name = 'container'
+
+    def run(self, case, ref, restore_max):
+        text = case.text
+        rng = self.rng
+        block_size = max(rng.choice([1, 2, 3, 7, 64, 1000]), len(text) // 64)
+        blocks = [text[start:start + block_size] for start in range(0, len(text), block_size)]
+        expected = [ref.encrypt(block) for block in blocks]
+        reference_encrypt = sum(seconds for _, seconds in expected)
+        expected = [(ciphertext.replace(' ', ''), spaces, padding) for (ciphertext, spaces, padding), _ in expected]
+
+        def write():
+            buffer = io.BytesIO()
+            with ContainerWriter(buffer, self.compiled, block_size) as writer:
+                for piece in _split(rng, text, rng.randint(1, 16)):
+                    writer.write(piece)
+            return buffer.getvalue()
+
+        data, engine_encrypt = _timed(write)
+        reader = ContainerReader(io.BytesIO(data))
+        actual = [_normalize(*reader.read_block(number)) for number in range(len(reader.blocks))]
+        checks = [('encrypt', expected, actual)]
+        timings = {'encrypt': (engine_encrypt, reference_encrypt)}
+
+        if len(text) <= restore_max:
+            plaintext = [ref.decrypt(*block) for block in expected]
+            decrypted, engine_decrypt = _timed(reader.decrypt_all, self.compiled)
+            checks.append(('decrypt_metadata', ''.join(block for block, _ in plaintext), decrypted))
+            timings['decrypt'] = (engine_decrypt, sum(seconds for _, seconds in plaintext))
+        return checks, timings
+
+
+class IncrementalEngine(Engine):
+    """
+    EncryptedDocument z playfair_incremental: několik náhodných úprav
+    dokumentu zašifrovaného referencí, pak srovnání s novým šifrováním.
+
+    Úpravy předpokládají, že filtr před místem úpravy nic nevypustil ani
+    nerozšířil; takové znaky se z výchozího textu odstraní a úpravy se
+    dělají jen před prvním z nich ve vkládaném textu.
+    """
+
+    name = 'incremental'
+    EDITS = 4
+    timing_note = ("průměrná latence jedné úpravy; zrychlení proti encrypt_message "
+                   "celého upraveného textu po každé úpravě")
+
+    def _is_plain(self, char):
+        return char == ' ' or len(self.compiled.filter_text(char)[0]) == 1
+
+    def prepare(self, text):
+        plain = {char for char in set(text) if self._is_plain(char)}
+        return ''.join(char for char in text if char in plain)
+
+    def run(self, case, ref, restore_max):
+        rng = self.rng
+        text = self.prepare(case.text)
+        ciphertext, spaces, padding = ref.encrypt(text)[0]
+        document = EncryptedDocument(self.compiled, ciphertext, EncryptionMetadata(spaces, padding))
+        limit = len(text)   # úpravy jen do prvního vypouštěného znaku
+        engine_edits = 0.0
+        full_encrypts = 0.0
+        for _ in range(self.EDITS):
+            offset = rng.randint(0, limit)
+            deleted = rng.randint(0, min(8, limit - offset))
+            inserted = random_text(rng, case.lang, rng.randint(0, 8))
+            engine_edits += _timed(document.apply_edit, offset, deleted, inserted)[1]
+            text = text[:offset] + inserted + text[offset + deleted:]
+            # Alternativa bez inkrementálního dokumentu: zašifrovat upravený text znovu
+            full_encrypts += _timed(encrypt_message, self.compiled, text)[1]
+            dropped = next((i for i, char in enumerate(inserted) if not self._is_plain(char)), None)
+            limit = offset + dropped if dropped is not None else min(limit + len(inserted) - deleted, len(text))
+
+        expected, _ = ref.encrypt(text)
+        checks = [('encrypt', expected, _normalize(document.ciphertext, document.metadata()))]
+        if len(text) <= restore_max:
+            checks.append(('decrypt_metadata', ref.decrypt(*expected)[0], document.decrypt()))
+        return checks, {'encrypt': (engine_edits / self.EDITS, full_encrypts / self.EDITS)}
+
+
+ENGINES = [CipherEngine, MessageEngine, BulkEngine, BulkPythonEngine, StreamEngine,
+           StreamDecryptorEngine, MmapEngine, MmapPythonEngine, BatchEngine, ContainerEngine,
+           IncrementalEngine]
+
+
+def _describe(expected, actual):
+    """Krátký popis prvního rozdílu mezi očekávaným a skutečným výsledkem."""
+    if isinstance(expected, str) and isinstance(actual, str):
+        index = next((i for i, (a, b) in enumerate(zip(expected, actual)) if a != b),
+                     min(len(expected), len(actual)))
+        return (f"délky {len(expected)}/{len(actual)}, první rozdíl na {index}: "
+                f"{expected[index:index + 20]!r} != {actual[index:index + 20]!r}")
+    if isinstance(expected, (tuple, list)) and isinstance(actual, (tuple, list)):
+        if len(expected) != len(actual):
+            return f"počet prvků {len(expected)} != {len(actual)}"
+        for index, (a, b) in enumerate(zip(expected, actual)):
+            if a != b:
+                return f"prvek {index}: {_describe(a, b)}"
+    return f"{expected!r:.80} != {actual!r:.80}"
+
+
+def run(cases, engines, restore_max=DEFAULT_RESTORE_MAX, seed=0, log=None):
+    """
+    Porovná enginy s referencí na všech případech.
+
+    Vrací (neshody, časy); časy jsou pro každý engine a jazyk z největšího
+    vstupu ve tvaru {(engine, jazyk): (velikost, {operace: (engine, reference)})}.
+    """
+    mismatches = []
+    timings = {}
+    for case in cases:
+        ref = Reference(case.lang, case.key)
+        for engine_class in engines:
+            # Náhodné dělení na bloky závisí jen na seedu, případu a enginu
+            rng = random.Random(f"{seed}:{case.number}:{engine_class.name}")
+            try:
+                checks, times = engine_class(case, rng).run(case, ref, restore_max)
+            except Exception as error:
+                checks, times = [('exception', None, f"{type(error).__name__}: {error}")], {}
+            for check, expected, actual in checks:
+                if expected != actual:
+                    mismatch = Mismatch(engine_class.name, case, check, _describe(expected, actual))
+                    mismatches.append(mismatch)
+                    if log:
+                        log(mismatch)
+            entry = (engine_class.name, case.lang)
+            if times and len(case.text) >= timings.get(entry, (-1,))[0]:
+                timings[entry] = (len(case.text), times)
+    return mismatches, timings
+
+
+def _print_mismatch(mismatch):
+    case = mismatch.case
+    print(f"NESHODA {mismatch.engine} {mismatch.check} (případ {case.number}, {case.lang}, "
+          f"klíč {case.key!r}, délka {len(case.text)}): {mismatch.detail}", flush=True)
+
+
+def _print_timings(timings):
+    print(f"{'engine':<18} {'jazyk':<5} {'velikost':>10} {'šifrování [ms]':>15} {'zrychlení':>10} "
+          f"{'dešifrování [ms]':>17} {'zrychlení':>10}")
+    for (name, lang), (size, times) in timings.items():
+        row = f"{name:<18} {lang:<5} {size:>10}"
+        for operation, width in (('encrypt', 15), ('decrypt', 17)):
+            if operation in times:
+                engine, ref = times[operation]
+                speedup = f"{ref / engine:9.1f}x" if engine else ''
+                row += f" {engine * 1000:>{width}.3f} {speedup:>10}"
+            else:
+                row += f" {'-':>{width}} {'':>10}"
+        print(row)
+    names = {name for name, _ in timings}
+    for engine in ENGINES:
+        if engine.timing_note and engine.name in names:
+            print(f"* {engine.name}: {engine.timing_note}")
+
+
+def main(argv=None):
+    names = [engine.name for engine in ENGINES]
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.differential',
+                                     description="Diferenciální test enginů proti původní implementaci")
+    parser.add_argument('--cases', type=int, default=200, help="počet náhodných textů na jazyk")
+    parser.add_argument('--max-size', type=int, default=DEFAULT_MAX_SIZE,
+                        help="délka největšího textu ve znacích (měří se na něm zrychlení)")
+    parser.add_argument('--restore-max', type=int, default=DEFAULT_RESTORE_MAX,
+                        help="největší text dešifrovaný s obnovou mezer (reference je kvadratická)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--lang', nargs='+', choices=LANGUAGES, default=LANGUAGES)
+    parser.add_argument('--engines', nargs='+', choices=names, default=names)
+    parser.add_argument('--output', help="uložit neshody a časy do JSON souboru")
+    args = parser.parse_args(argv)
+
+    engines = [engine for engine in ENGINES if engine.name in args.engines]
+    for engine in engines:
+        if not engine.available():
+            print(f"Engine {engine.name} se přeskakuje (chybí NumPy)", file=sys.stderr)
+    engines = [engine for engine in engines if engine.available()]
+
+    cases = list(make_cases(random.Random(args.seed), args.lang, args.cases, args.max_size))
+    mismatches, timings = run(cases, engines, args.restore_max, args.seed, log=_print_mismatch)
+    _print_timings(timings)
+
+    if args.output:
+        report = {
+            'seed': args.seed,
+            'cases': len(cases),
+            'mismatches': [{'engine': m.engine, 'case': m.case.number, 'lang': m.case.lang, 'key': m.case.key,
+                            'size': len(m.case.text), 'check': m.check, 'detail': m.detail}
+                           for m in mismatches],
+            'timings': [{'engine': name, 'lang': lang, 'size': size,
+                         **{operation: {'seconds': engine, 'reference_seconds': ref}
+                            for operation, (engine, ref) in times.items()}}
+                        for (name, lang), (size, times) in timings.items()],
+        }
+        Path(args.output).write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding='utf-8')
+
+    print(f"Případů: {len(cases)}, enginů: {len(engines)}, neshod: {len(mismatches)}")
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,224 @@
+# Sada výkonnostních měření jádra šifry s porovnáním proti uložené baseline
+# Spuštění: python -m benchmarks [--quick] [--output vysledky.json] [--baseline baseline.json]
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from benchmarks.corpus import make_text
+from playfair_core import KeyCache, PlayfairCipher
+
+# Velikosti vstupů ve znacích (100 B až 50 MB)
+SIZES = [100, 10 * 1000, 1000 * 1000, 10 * 1000 * 1000, 50 * 1000 * 1000]
+QUICK_SIZES = [100, 10 * 1000, 1000 * 1000]
+
+LANGUAGES = ['EN', 'CZ']
+
+KEY = "PLAYFAIR EXAMPLE"
+
+# Výchozí umístění baseline
+DEFAULT_BASELINE = Path(__file__).with_name('baseline.json')
+
+# Výchozí tolerance zpomalení (0.15 = o 15 %)
+DEFAULT_THRESHOLD = 0.15
+
+# Moduly měřené studeným importem a moduly, které se při tom nesmějí načíst
+COLD_IMPORTS = {'playfair_cli': ('tkinter', 'numpy', 'playfair_gui')}
+COLD_IMPORT_RUNS = 5
+
+# Kořen repozitáře (odtud se moduly importují v podprocesu)
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _time_call(function, min_time):
+    """Nejlepší čas jednoho volání; malé vstupy se opakují alespoň po dobu min_time."""
+    best = None
+    total = 0.0
+    runs = 0
+    while runs < 3 or total < min_time:
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+        total += elapsed
+        runs += 1
+        if elapsed > min_time:
+            break
+    return best, runs
+
+
+def _cases(cipher, text):
+    """Vrátí měřené operace nad připraveným vstupem jako (název, funkce)."""
+    filtered, spaces = cipher.filter_text(text)
+    pairs, padding = cipher.prepare_text(filtered)
+    ciphertext, _, _, _ = cipher.encrypt(text)
+    decrypted = ''.join(pairs)
+    return [
+        ('filter_text', lambda: cipher.filter_text(text)),
+        ('prepare_text', lambda: cipher.prepare_text(filtered)),
+        ('encrypt', lambda: cipher.encrypt(text)),
+        ('decrypt', lambda: cipher.decrypt(ciphertext, spaces, padding)),
+        ('restore_spaces_and_special', lambda: cipher.restore_spaces_and_special(decrypted, spaces, padding)),
+    ]
+
+
+def _table_cases(lang):
+    """Měření generate_table bez cache (sestavení tabulky) i s cache (opakovaný klíč)."""
+    cold = PlayfairCipher(key_cache=KeyCache(1))
+    cold.set_language(lang)
+    keys = [KEY, "EXAMPLE PLAYFAIR"]
+    state = {'i': 0}
+
+    def generate_cold():
+        # Střídání dvou klíčů v cache o velikosti 1 vynutí pokaždé nové sestavení
+        state['i'] ^= 1
+        cold.generate_table(keys[state['i']])
+
+    warm = PlayfairCipher(key_cache=KeyCache())
+    warm.set_language(lang)
+    warm.generate_table(KEY)
+    return [
+        ('generate_table', generate_cold),
+        ('generate_table_cached', lambda: warm.generate_table(KEY)),
+    ]
+
+
+def _cold_import(module, forbidden, runs=COLD_IMPORT_RUNS):
+    """
+    Nejlepší kumulativní čas importu modulu v novém procesu (python -X importtime).
+
+    V podprocesu se zároveň ověří, že se nenačetl žádný z modulů forbidden;
+    jinak vyhodí RuntimeError.
+    """
+    check = (f"import sys, {module}; loaded = [name for name in {list(forbidden)!r} if name in sys.modules]; "
+             f"print(','.join(loaded))")
+    best = None
+    for _ in range(runs):
+        completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', check], cwd=ROOT,
+                                   capture_output=True, text=True, check=True)
+        loaded = completed.stdout.strip()
+        if loaded:
+            raise RuntimeError(f"import {module} načetl {loaded}")
+        # Řádek 'import time: vlastní | kumulativní | modul' bez odsazení = import nejvyšší úrovně
+        for line in completed.stderr.splitlines():
+            fields = line.split('|')
+            if len(fields) == 3 and fields[2].rstrip() == f" {module}":
+                seconds = int(fields[1]) / 1e6
+                best = seconds if best is None else min(best, seconds)
+    if best is None:
+        raise RuntimeError(f"import {module} nevypsal čas importu")
+    return best, runs
+
+
+def run(sizes, languages, min_time=0.2, log=None):
+    """Provede všechna měření a vrátí seznam výsledků."""
+    results = []
+
+    def record(name, lang, size, seconds, runs):
+        result = {
+            'name': name,
+            'lang': lang,
+            'size': size,
+            'seconds': seconds,
+            'runs': runs,
+            'mb_per_s': size / seconds / 1e6 if size and seconds else None,
+        }
+        results.append(result)
+        if log:
+            log(result)
+
+    for module, forbidden in COLD_IMPORTS.items():
+        record(f"import {module}", '-', 0, *_cold_import(module, forbidden))
+
+    for lang in languages:
+        for name, function in _table_cases(lang):
+            record(name, lang, 0, *_time_call(function, min_time))
+
+        cipher = PlayfairCipher()
+        cipher.set_language(lang)
+        cipher.generate_table(KEY)
+        for size in sizes:
+            text = make_text(size, lang)
+            for name, function in _cases(cipher, text):
+                record(name, lang, size, *_time_call(function, min_time))
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Porovná výsledky s baseline; vrací seznam (výsledek, čas baseline, poměr) pro zpomalení."""
+    reference = {(item['name'], item['lang'], item['size']): item['seconds'] for item in baseline['results']}
+    regressions = []
+    for result in results:
+        previous = reference.get((result['name'], result['lang'], result['size']))
+        if previous:
+            ratio = result['seconds'] / previous
+            if ratio > 1 + threshold:
+                regressions.append((result, previous, ratio))
+    return regressions
+
+
+def _print_result(result):
+    throughput = f"{result['mb_per_s']:10.2f} MB/s" if result['mb_per_s'] else ''
+    print(f"{result['name']:<28} {result['lang']:<3} {result['size']:>10} "
+          f"{result['seconds'] * 1000:>12.3f} ms {throughput}", flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks',
+                                     description="Výkonnostní měření jádra Playfair šifry")
+    parser.add_argument('--sizes', type=int, nargs='+', help="velikosti vstupů ve znacích")
+    parser.add_argument('--quick', action='store_true', help="jen vstupy do 1 MB")
+    parser.add_argument('--lang', nargs='+', choices=LANGUAGES, default=LANGUAGES)
+    parser.add_argument('--min-time', type=float, default=0.2, help="minimální doba opakování malých vstupů [s]")
+    parser.add_argument('--output', help="uložit výsledky do JSON souboru")
+    parser.add_argument('--baseline', help=f"JSON s výsledky pro porovnání (výchozí {DEFAULT_BASELINE.name})")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="povolené zpomalení proti baseline (0.15 = 15 %%)")
+    parser.add_argument('--update-baseline', action='store_true', help="uložit výsledky jako novou baseline")
+    args = parser.parse_args(argv)
+    baseline_path = Path(args.baseline) if args.baseline else DEFAULT_BASELINE
+    if args.baseline and not args.update_baseline and not baseline_path.exists():
+        # Výslovně zadaná baseline musí existovat, jinak by kontrola tiše neproběhla
+        print(f"Chyba: baseline {baseline_path} neexistuje", file=sys.stderr)
+        return 2
+
+    sizes = args.sizes or (QUICK_SIZES if args.quick else SIZES)
+    try:
+        results = run(sizes, args.lang, args.min_time, log=_print_result)
+    except RuntimeError as error:
+        print(f"Chyba: {error}", file=sys.stderr)
+        return 1
+    report = {
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'results': results,
+    }
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding='utf-8')
+    if args.update_baseline:
+        baseline_path.write_text(json.dumps(report, indent=2), encoding='utf-8')
+        print(f"Baseline uložena do {baseline_path}")
+        return 0
+
+    if not baseline_path.exists():
+        print(f"Baseline {baseline_path} neexistuje, porovnání se přeskakuje")
+        return 0
+
+    baseline = json.loads(baseline_path.read_text(encoding='utf-8'))
+    if (baseline.get('python'), baseline.get('platform')) != (report['python'], report['platform']):
+        print(f"Pozor: baseline je z Pythonu {baseline.get('python')} na {baseline.get('platform')}, "
+              f"časy nemusí být srovnatelné")
+    regressions = compare(results, baseline, args.threshold)
+    for result, previous, ratio in regressions:
+        print(f"ZPOMALENÍ {result['name']} {result['lang']} {result['size']}: "
+              f"{previous * 1000:.3f} ms -> {result['seconds'] * 1000:.3f} ms ({ratio:.2f}x)")
+    if regressions:
+        return 1
+    print("Bez zpomalení proti baseline")
+    return 0
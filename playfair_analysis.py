@@ -0,0 +1,532 @@
+# Statistiky korpusu šifrových textů: bigramy, index koincidence, opakování, výplně
+# License: MIT License
+#
+# Spuštění: python -m playfair_analysis archiv/ --lang CZ
+#           python -m playfair_analysis archiv/*.pfc --key KLIC --workers 8 --json souhrn.json
+#           python -m playfair_analysis --jobs ulohy.jsonl
+#
+# Každý soubor (u kontejneru každý blok) se zpracuje v pracovním procesu
+# do samostatného CorpusStats a dílčí výsledky se sčítají metodou merge().
+# Četnosti jsou v polích array('Q') (25 + 625 buněk pro mřížku 5x5), ne ve
+# slovnících řetězců, takže dílčí výsledek má stejnou velikost bez ohledu
+# na objem textu a přenáší se mezi procesy jako pár desítek kilobajtů.
+
+try:
+    import numpy as np
+except ImportError:  # NumPy je volitelná závislost
+    np = None
+
+import argparse
+import json
+import os
+import sys
+from array import array
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+
+from playfair_batch import METADATA_SUFFIX
+from playfair_container import CONTAINER_MAGIC, ContainerReader, key_fingerprint
+from playfair_core import LANGUAGES, STREAM_CHUNK_SIZE, get_compiled_key, iter_text_chunks, resolve_language
+from playfair_metadata import EncryptionMetadata
+
+HAS_NUMPY = np is not None
+
+# Nejdelší sledovaná vzdálenost opakovaného bigramu (v bigramech); delší jdou do posledního koše
+MAX_DISTANCE = 4096
+
+# Jeden vstup analýzy: soubor se šifrovým textem nebo kontejner, volitelně klíč pro statistiku výplní
+AnalysisJob = namedtuple('AnalysisJob', 'path key label', defaults=(None, None))
+
+
+def key_id(compiled):
+    """Krátký identifikátor tabulky klíče pro hlášení (klíč samotný se nikam nezapisuje)."""
+    return key_fingerprint(compiled, b'').hex()[:12]
+
+
+class PaddingStats:
+    """Počty výplní jednoho klíče: bigramy celkem, primární (X) a sekundární (Q) výplně."""
+
+    __slots__ = ('texts', 'pairs', 'primary', 'secondary', 'unknown')
+
+    def __init__(self):
+        self.texts = 0
+        self.pairs = 0
+        self.primary = 0
+        self.secondary = 0
+        self.unknown = 0    # výplň podle metadat, ale dešifrovaný znak nesedí (jiný klíč, poškozená data)
+
+    def merge(self, other):
+        for name in self.__slots__:
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        return self
+
+    def as_dict(self):
+        result = {name: getattr(self, name) for name in self.__slots__}
+        result['padding_rate'] = (self.primary + self.secondary) / self.pairs if self.pairs else 0.0
+        return result
+
+
+def _add_arrays(target, source):
+    for index, value in enumerate(source):
+        if value:
+            target[index] += value
+
+
+class CorpusStats:
+    """
+    Sčitatelné statistiky šifrových textů v jedné abecedě.
+
+    letters (n buněk) a digraphs (n*n buněk, index první * n + druhý) počítají
+    písmena a bigramy v zarovnání šifry; distances[d] je počet opakování
+    stejného bigramu po d bigramech (v rámci jednoho textu). padding mapuje
+    identifikátor klíče na PaddingStats.
+    """
+
+    def __init__(self, alphabet):
+        size = len(alphabet)
+        self.alphabet = alphabet
+        self.letters = array('Q', [0]) * size
+        self.digraphs = array('Q', [0]) * (size * size)
+        self.distances = array('Q', [0]) * (MAX_DISTANCE + 1)
+        self.texts = 0
+        self.padding = {}
+        self.errors = []
+
+    def merge(self, other):
+        """Přičte jiný dílčí výsledek (stejné abecedy) a vrátí self."""
+        if other.alphabet != self.alphabet:
+            raise ValueError("Statistiky různých abeced nelze sčítat")
+        _add_arrays(self.letters, other.letters)
+        _add_arrays(self.digraphs, other.digraphs)
+        _add_arrays(self.distances, other.distances)
+        self.texts += other.texts
+        for label, padding in other.padding.items():
+            self.padding.setdefault(label, PaddingStats()).merge(padding)
+        self.errors.extend(other.errors)
+        return self
+
+    @property
+    def chars(self):
+        return sum(self.letters)
+
+    @property
+    def pairs(self):
+        return sum(self.digraphs)
+
+    def index_of_coincidence(self, normalized=True):
+        """
+        Index koincidence písmen; normalizovaný je násoben velikostí abecedy
+        (náhodný text ~1.0, přirozený jazyk zhruba 1.5-2).
+        """
+        total = sum(self.letters)
+        if total < 2:
+            return 0.0
+        value = sum(count * (count - 1) for count in self.letters) / (total * (total - 1))
+        return value * len(self.alphabet) if normalized else value
+
+    def digraph_index_of_coincidence(self, normalized=True):
+        """Index koincidence bigramů v zarovnání šifry (normalizovaný velikostí n*n)."""
+        total = sum(self.digraphs)
+        if total < 2:
+            return 0.0
+        value = sum(count * (count - 1) for count in self.digraphs) / (total * (total - 1))
+        return value * len(self.digraphs) if normalized else value
+
+    def top_digraphs(self, count=10):
+        """Nejčastější bigramy jako seznam (bigram, počet)."""
+        size = len(self.alphabet)
+        best = sorted((item for item in enumerate(self.digraphs) if item[1]), key=lambda item: -item[1])
+        return [(self.alphabet[index // size] + self.alphabet[index % size], value)
+                for index, value in best[:count]]
+
+    def top_distances(self, count=10):
+        """Nejčastější vzdálenosti opakovaných bigramů jako seznam (vzdálenost, počet)."""
+        best = sorted((item for item in enumerate(self.distances) if item[1] and item[0] < MAX_DISTANCE),
+                      key=lambda item: -item[1])
+        return best[:count]
+
+    def as_dict(self, top=20):
+        return {
+            'alphabet': self.alphabet,
+            'texts': self.texts,
+            'chars': self.chars,
+            'pairs': self.pairs,
+            'index_of_coincidence': self.index_of_coincidence(),
+            'digraph_index_of_coincidence': self.digraph_index_of_coincidence(),
+            'top_digraphs': self.top_digraphs(top),
+            'repeats': sum(self.distances),
+            'top_distances': self.top_distances(top),
+            'padding': {label: padding.as_dict() for label, padding in sorted(self.padding.items())},
+            'errors': self.errors,
+        }
+
+    def format_report(self, top=10):
+        """Čitelný souhrn pro výpis na terminál."""
+        lines = [
+            f"textů: {self.texts}, písmen: {self.chars}, bigramů: {self.pairs}",
+            f"index koincidence: {self.index_of_coincidence():.4f} "
+            f"(bigramy {self.digraph_index_of_coincidence():.4f})",
+            "nejčastější bigramy: " + ', '.join(f"{pair} {count}" for pair, count in self.top_digraphs(top)),
+            "opakování bigramů po vzdálenosti: "
+            + ', '.join(f"{distance}: {count}" for distance, count in self.top_distances(top)),
+        ]
+        for label, padding in sorted(self.padding.items()):
+            lines.append(f"klíč {label}: bigramů {padding.pairs}, výplní X {padding.primary}, "
+                         f"Q {padding.secondary}, podíl {padding.as_dict()['padding_rate']:.4f}"
+                         + (f", nesedí {padding.unknown}" if padding.unknown else ""))
+        for path, error in self.errors:
+            lines.append(f"chyba: {path}: {error}")
+        return '\n'.join(lines)
+
+
+class _CodeTable(dict):
+    """Překladová tabulka pro str.translate: znak abecedy -> chr(index), ostatní znaky se mažou."""
+
+    def __init__(self, alphabet):
+        super().__init__((ord(char), chr(index)) for index, char in enumerate(alphabet))
+
+    def __missing__(self, code):
+        self[code] = None
+        return None
+
+
+class DigraphCounter:
+    """
+    Proudové počítání jednoho šifrového textu do CorpusStats.
+
+    feed() přijímá libovolné kusy textu (formátovací mezery a konce řádků se
+    ignorují), bigramy se počítají v zarovnání od začátku textu. S compiled
+    a padding_positions (z metadat) se navíc dešifrují jen bigramy s výplní
+    a započítá se, zda je výplní primární nebo sekundární znak.
+    """
+
+    def __init__(self, stats, compiled=None, padding_positions=None, label=None, use_numpy=None):
+        if use_numpy is None:
+            use_numpy = HAS_NUMPY
+        if use_numpy and not HAS_NUMPY:
+            raise ImportError("NumPy není nainstalováno")
+        self.stats = stats
+        self.use_numpy = use_numpy
+        self.size = len(stats.alphabet)
+        self._table = _CodeTable(stats.alphabet)
+        self._carry = ''
+        self.consumed = 0   # počet spárovaných písmen (pozice v připraveném textu)
+
+        cells = self.size * self.size
+        if use_numpy:
+            self._letters = np.zeros(self.size, dtype=np.int64)
+            self._digraphs = np.zeros(cells, dtype=np.int64)
+            self._distances = np.zeros(MAX_DISTANCE + 1, dtype=np.int64)
+            self._last = np.full(cells, -1, dtype=np.int64)
+        else:
+            self._letters = stats.letters
+            self._digraphs = stats.digraphs
+            self._distances = stats.distances
+            self._last = array('q', [-1]) * cells
+
+        self.padding = None
+        if compiled is not None and padding_positions is not None:
+            # Výplň k leží v připraveném textu na pozici padding_positions[k] + k (druhý znak páru)
+            kinds = self._padding_kinds(compiled, stats.alphabet)
+            if use_numpy:
+                count = len(padding_positions)
+                self._pads = np.asarray(padding_positions, dtype=np.int64) + np.arange(count, dtype=np.int64)
+                self._pad_kinds = np.array(kinds, dtype=np.intp)
+            else:
+                self._pads = [position + index for index, position in enumerate(padding_positions)]
+                self._pad_kinds = kinds
+            self._next_pad = 0
+            self.padding = stats.padding.setdefault(label or key_id(compiled), PaddingStats())
+
+    @staticmethod
+    def _padding_kinds(compiled, alphabet):
+        """
+        Druh výplně pro každý šifrový bigram (index první * n + druhý):
+        0 = druhý znak otevřeného textu je primární výplň, 1 = sekundární, 2 = jiný znak.
+        """
+        kinds = []
+        for first in alphabet:
+            for second in alphabet:
+                plain = compiled.decrypt_map.get(first + second, '')
+                char = plain[1:]
+                kinds.append(0 if char == compiled.padding_char
+                             else 1 if char == compiled.secondary_padding_char else 2)
+        return kinds
+
+    def feed(self, text):
+        codes = self._carry + text.translate(self._table)
+        usable = len(codes) - len(codes) % 2
+        self._carry = codes[usable:]
+        if not usable:
+            return
+        codes = codes[:usable]
+        base = self.consumed
+        self.consumed += usable
+        if self.use_numpy:
+            self._count_numpy(codes, base // 2)
+        else:
+            self._count_python(codes, base // 2)
+        if self.padding is not None:
+            self._count_padding(codes, base)
+
+    def _count_numpy(self, codes, first_pair):
+        size = self.size
+        values = np.frombuffer(codes.encode('latin-1'), dtype=np.uint8)
+        self._letters += np.bincount(values, minlength=size)
+        pairs = values[0::2].astype(np.int64) * size + values[1::2]
+        self._digraphs += np.bincount(pairs, minlength=size * size)
+
+        # Opakování: setřídit pozice podle bigramu a brát rozdíly sousedů se stejným bigramem
+        # Hodnoty bigramů se vejdou do 16 bitů, stabilní řazení je pak radixové (lineární)
+        order = np.argsort(pairs.astype(np.uint16), kind='stable')
+        sorted_pairs = pairs[order]
+        positions = order + first_pair
+        same = sorted_pairs[1:] == sorted_pairs[:-1]
+        gaps = positions[1:][same] - positions[:-1][same]
+        # První výskyt každého bigramu v bloku navazuje na poslední výskyt z předchozích bloků
+        firsts = np.flatnonzero(np.concatenate(([True], ~same)))
+        previous = self._last[sorted_pairs[firsts]]
+        known = previous >= 0
+        gaps = np.concatenate((gaps, positions[firsts][known] - previous[known]))
+        self._distances += np.bincount(np.minimum(gaps, MAX_DISTANCE), minlength=MAX_DISTANCE + 1)
+        lasts = np.flatnonzero(np.concatenate((~same, [True])))
+        self._last[sorted_pairs[lasts]] = positions[lasts]
+
+    def _count_python(self, codes, first_pair):
+        size = self.size
+        values = codes.encode('latin-1')
+        letters, digraphs, distances, last = self._letters, self._digraphs, self._distances, self._last
+        for index in range(size):
+            letters[index] += values.count(index)
+        for position, (first, second) in enumerate(zip(values[0::2], values[1::2]), first_pair):
+            pair = first * size + second
+            digraphs[pair] += 1
+            previous = last[pair]
+            if previous >= 0:
+                distances[min(position - previous, MAX_DISTANCE)] += 1
+            last[pair] = position
+
+    def _count_padding(self, codes, base):
+        pads = self._pads
+        size = self.size
+        end = base + len(codes)
+        if self.use_numpy:
+            stop = int(np.searchsorted(pads, end, side='left'))
+            positions = pads[self._next_pad:stop] - base
+            self._next_pad = stop
+            values = np.frombuffer(codes.encode('latin-1'), dtype=np.uint8).astype(np.intp)
+            kinds = np.bincount(self._pad_kinds[values[positions - 1] * size + values[positions]], minlength=3)
+            primary, secondary, unknown = (int(count) for count in kinds)
+        else:
+            kinds = [0, 0, 0]
+            table = self._pad_kinds
+            while self._next_pad < len(pads) and pads[self._next_pad] < end:
+                position = pads[self._next_pad] - base
+                self._next_pad += 1
+                kinds[table[ord(codes[position - 1]) * size + ord(codes[position])]] += 1
+            primary, secondary, unknown = kinds
+        padding = self.padding
+        padding.primary += primary
+        padding.secondary += secondary
+        padding.unknown += unknown
+
+    def finish(self):
+        """Dokončí text: započítá případné liché poslední písmeno a přenese čítače do stats."""
+        stats = self.stats
+        if self._carry:
+            stats.letters[ord(self._carry)] += 1
+            self._carry = ''
+        if self.use_numpy:
+            _add_arrays(stats.letters, self._letters.tolist())
+            _add_arrays(stats.digraphs, self._digraphs.tolist())
+            _add_arrays(stats.distances, self._distances.tolist())
+        if self.padding is not None:
+            self.padding.texts += 1
+            self.padding.pairs += self.consumed // 2
+        stats.texts += 1
+        return stats
+
+
+def analyze_text(ciphertext, lang='EN', compiled=None, metadata=None, label=None, use_numpy=None):
+    """Statistiky jednoho šifrového textu v paměti (metadata a klíč jen pro výplně)."""
+    _, alphabet, _, _, _ = resolve_language(lang)
+    stats = CorpusStats(alphabet)
+    metadata = EncryptionMetadata.coerce(metadata)
+    counter = DigraphCounter(stats, compiled, metadata.padding_positions if metadata else None, label,
+                             use_numpy)
+    counter.feed(ciphertext)
+    return counter.finish()
+
+
+def is_container(path):
+    """Začíná soubor hlavičkou kontejneru? Nečitelný soubor se hlásí až při zpracování."""
+    try:
+        with open(path, 'rb') as handle:
+            return handle.read(len(CONTAINER_MAGIC)) == CONTAINER_MAGIC
+    except OSError:
+        return False
+
+
+def _analyze_file(path, lang, key, label, use_numpy, chunk_size=STREAM_CHUNK_SIZE):
+    """Prostý soubor se šifrovým textem; metadata se hledají v <soubor>.meta."""
+    _, alphabet, _, _, _ = resolve_language(lang)
+    stats = CorpusStats(alphabet)
+    compiled = pads = None
+    metadata_path = path + METADATA_SUFFIX
+    if key is not None and os.path.exists(metadata_path):
+        compiled = get_compiled_key(key, lang)
+        with open(metadata_path, 'rb') as handle:
+            pads = EncryptionMetadata.from_bytes(handle.read()).padding_positions
+    counter = DigraphCounter(stats, compiled, pads, label, use_numpy)
+    with open(path, 'rb') as handle:
+        for chunk in iter_text_chunks(handle, chunk_size):
+            counter.feed(chunk)
+    return counter.finish()
+
+
+def _analyze_block(path, number, lang, key, label, use_numpy):
+    """Jeden blok kontejneru (bloky jsou nezávislé texty)."""
+    with ContainerReader(path) as reader:
+        _, alphabet, _, _, _ = resolve_language(lang)
+        if reader.alphabet != alphabet:
+            raise ValueError(f"Kontejner má abecedu jazyka {reader.lang}, analýza běží pro {lang}")
+        ciphertext, metadata = reader.read_block(number)
+        compiled = reader.compile_key(key) if key is not None else None
+    pads = EncryptionMetadata.from_bytes(metadata).padding_positions if compiled is not None else None
+    counter = DigraphCounter(CorpusStats(alphabet), compiled, pads, label, use_numpy)
+    counter.feed(ciphertext)
+    return counter.finish()
+
+
+def _run_task(task):
+    """Zpracuje jeden soubor nebo blok; chyba se zaznamená do výsledku, nepřeruší analýzu."""
+    kind, path, number, lang, key, label, use_numpy = task
+    where = f"{path}#{number}" if kind == 'block' else path
+    try:
+        if kind == 'error':
+            # Kontejner se nepodařilo otevřít už při rozdělování na bloky (number je popis chyby)
+            error = number
+        elif kind == 'block':
+            return _analyze_block(path, number, lang, key, label, use_numpy)
+        else:
+            return _analyze_file(path, lang, key, label, use_numpy)
+    except (OSError, ValueError, UnicodeError) as exc:
+        error = f"{type(exc).__name__}: {exc}"
+    stats = CorpusStats(resolve_language(lang)[1])
+    stats.errors.append((where, error))
+    return stats
+
+
+def _expand_jobs(jobs, lang, use_numpy):
+    """Úlohy -> úkoly pro procesy; kontejner se rozdělí na jednotlivé bloky."""
+    for job in jobs:
+        job = AnalysisJob(*job) if not isinstance(job, AnalysisJob) else job
+        path = os.fspath(job.path)
+        if is_container(path):
+            try:
+                with ContainerReader(path) as reader:
+                    count = len(reader)
+            except (OSError, ValueError) as error:
+                # Poškozený nebo rozepsaný kontejner se jen zaznamená, analýza pokračuje
+                yield ('error', path, f"{type(error).__name__}: {error}", lang, job.key, job.label, use_numpy)
+                continue
+            for number in range(count):
+                yield ('block', path, number, lang, job.key, job.label, use_numpy)
+        else:
+            yield ('file', path, None, lang, job.key, job.label, use_numpy)
+
+
+def corpus_jobs(paths, key=None, label=None):
+    """Úlohy pro soubory a adresáře (rekurzivně; soubory metadat se přeskočí)."""
+    for path in map(Path, paths):
+        if path.is_dir():
+            files = sorted(item for item in path.rglob('*') if item.is_file())
+        else:
+            files = [path]
+        for item in files:
+            if not item.name.endswith(METADATA_SUFFIX):
+                yield AnalysisJob(str(item), key, label)
+
+
+def analyze_corpus(jobs, lang='EN', workers=None, chunksize=1, use_numpy=None):
+    """
+    Projde všechny úlohy (AnalysisJob nebo n-tice cesta[, klíč, popisek])
+    a vrátí sečtené CorpusStats. workers=1 běží v aktuálním procesu.
+    """
+    _, alphabet, _, _, _ = resolve_language(lang)
+    total = CorpusStats(alphabet)
+    tasks = _expand_jobs(jobs, lang, use_numpy)
+    if workers == 1:
+        for task in tasks:
+            total.merge(_run_task(task))
+        return total
+    # Rozpracováno je nejvýše 2 * workers dávek, takže se seznam úloh (např.
+    # bloků velkých kontejnerů) nepředává procesům celý najednou
+    window = 2 * (workers or os.cpu_count() or 1)
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        while True:
+            chunk = list(islice(tasks, max(chunksize, 1)))
+            if chunk:
+                pending.append(executor.submit(_run_chunk, chunk))
+            if pending and (len(pending) >= window or not chunk):
+                total.merge(pending.popleft().result())
+            elif not chunk:
+                return total
+
+
+def _run_chunk(tasks):
+    """Zpracuje dávku úkolů v jednom procesu a vrátí jejich součet."""
+    total = _run_task(tasks[0])
+    for task in tasks[1:]:
+        total.merge(_run_task(task))
+    return total
+
+
+def _read_jobs(path):
+    """Načte úlohy ze souboru JSON Lines ({"path": ..., "key": ..., "label": ...})."""
+    with open(path, encoding='utf-8') as handle:
+        for line in handle:
+            if line.strip():
+                record = json.loads(line)
+                yield AnalysisJob(record['path'], record.get('key'), record.get('label'))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m playfair_analysis',
+                                     description="Statistiky korpusu šifrových textů Playfair")
+    parser.add_argument('paths', nargs='*', help="soubory, kontejnery nebo adresáře")
+    parser.add_argument('--lang', default='EN', choices=sorted(LANGUAGES))
+    parser.add_argument('--key', help="klíč pro statistiku výplní (potřebuje metadata)")
+    parser.add_argument('--label', help="popisek klíče ve výstupu (výchozí otisk tabulky)")
+    parser.add_argument('--jobs', help="soubor JSON Lines s úlohami (cesta, klíč, popisek)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="počet procesů")
+    parser.add_argument('--chunksize', type=int, default=1, help="počet úloh předaných procesu najednou")
+    parser.add_argument('--top', type=int, default=10, help="počet vypsaných bigramů a vzdáleností")
+    parser.add_argument('--json', help="zapsat celé statistiky jako JSON")
+    args = parser.parse_args(argv)
+
+    if args.jobs:
+        jobs = _read_jobs(args.jobs)
+    elif args.paths:
+        jobs = corpus_jobs(args.paths, args.key, args.label)
+    else:
+        parser.error("zadejte soubory, adresáře nebo --jobs")
+
+    try:
+        stats = analyze_corpus(jobs, args.lang, args.workers, args.chunksize)
+        if args.json:
+            with open(args.json, 'w', encoding='utf-8') as handle:
+                json.dump(stats.as_dict(args.top), handle, ensure_ascii=False, indent=2)
+    except (OSError, ValueError) as error:
+        print(f"Chyba: {error}", file=sys.stderr)
+        return 1
+
+    print(stats.format_report(args.top))
+    return 1 if stats.errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
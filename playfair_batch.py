@@ -0,0 +1,173 @@
+# Dávkové šifrování mnoha dokumentů přes více procesů
+# License: MIT License
+#
+# Spuštění: python -m playfair_batch encrypt --key KLIC --input-dir DATA --output-dir VYSTUP
+
+import argparse
+import json
+import os
+import sys
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from playfair_core import LANGUAGES, decrypt_message, encrypt_message, get_compiled_key
+
+# Přípony výstupních souborů v adresářovém režimu
+CIPHER_SUFFIX = '.pf'
+METADATA_SUFFIX = '.meta'
+
+# Jedna úloha: klíč, jazyk, text (u dešifrování volitelně i metadata)
+BatchJob = namedtuple('BatchJob', 'key lang text metadata', defaults=(None,))
+
+# Výsledek úlohy; pořadí výsledků odpovídá pořadí úloh
+BatchResult = namedtuple('BatchResult', 'index ok output metadata error')
+
+
+def _describe_error(error):
+    """Krátký popis výjimky pro hlášení chyby jedné úlohy."""
+    return f"{type(error).__name__}: {error}"
+
+
+def process_job(mode, job, index=0):
+    """
+    Zpracuje jednu úlohu v aktuálním procesu (tabulky se berou z cache procesu).
+
+    Chyba se nevyhazuje, ale vrací se v BatchResult.error.
+    """
+    try:
+        job = BatchJob(*job)
+        compiled = get_compiled_key(job.key, job.lang)
+        if mode == 'encrypt':
+            ciphertext, metadata = encrypt_message(compiled, job.text)
+            return BatchResult(index, True, ciphertext, metadata.to_bytes(), None)
+        plaintext = decrypt_message(compiled, job.text, job.metadata)
+        return BatchResult(index, True, plaintext, None, None)
+    except Exception as error:
+        return BatchResult(index, False, None, None, _describe_error(error))
+
+
+def _run_job(task):
+    """Zpracuje jednu úlohu v pracovním procesu."""
+    index, mode, job = task
+    return process_job(mode, job, index)
+
+
+def _run_file_job(task):
+    """Zašifruje nebo dešifruje jeden soubor; čtení i zápis probíhají v pracovním procesu."""
+    index, mode, source, target, key, lang = task
+    try:
+        compiled = get_compiled_key(key, lang)
+        text = Path(source).read_text(encoding='utf-8')
+        if mode == 'encrypt':
+            ciphertext, metadata = encrypt_message(compiled, text)
+            Path(target).write_text(ciphertext, encoding='utf-8')
+            Path(target + METADATA_SUFFIX).write_bytes(metadata.to_bytes())
+        else:
+            metadata_path = Path(source + METADATA_SUFFIX)
+            metadata = metadata_path.read_bytes() if metadata_path.exists() else None
+            Path(target).write_text(decrypt_message(compiled, text, metadata), encoding='utf-8')
+        return BatchResult(index, True, target, None, None)
+    except Exception as error:
+        return BatchResult(index, False, target, None, _describe_error(error))
+
+
+def _map(function, tasks, workers, chunksize):
+    """Rozdělí úlohy mezi procesy (workers=1 běží v aktuálním procesu) a zachová pořadí."""
+    if workers == 1:
+        return [function(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(function, tasks, chunksize=chunksize))
+
+
+def run_batch(jobs, mode='encrypt', workers=None, chunksize=1):
+    """
+    Zpracuje seznam úloh (klíč, jazyk, text[, metadata]) paralelně.
+
+    Vrací seznam BatchResult ve stejném pořadí jako úlohy; chyba jedné
+    úlohy se zaznamená do jejího výsledku a ostatní úlohy neovlivní.
+    """
+    if mode not in ('encrypt', 'decrypt'):
+        raise ValueError(f"Neznámý režim: {mode}")
+    tasks = [(index, mode, tuple(job)) for index, job in enumerate(jobs)]
+    return _map(_run_job, tasks, workers, chunksize)
+
+
+def _output_name(path, mode):
+    """Název výstupního souboru pro daný vstup."""
+    if mode == 'encrypt':
+        return path.name + CIPHER_SUFFIX
+    if path.name.endswith(CIPHER_SUFFIX):
+        return path.name[:-len(CIPHER_SUFFIX)]
+    return path.name + '.dec'
+
+
+def run_directory(input_dir, output_dir, key, lang='EN', mode='encrypt', pattern=None,
+                  workers=None, chunksize=1):
+    """
+    Zašifruje (nebo dešifruje) všechny soubory v adresáři.
+
+    Při šifrování vznikne ke každému souboru <název>.pf a metadata
+    <název>.pf.meta; při dešifrování se metadata načtou, pokud existují.
+    """
+    if pattern is None:
+        pattern = '*' + CIPHER_SUFFIX if mode == 'decrypt' else '*'
+    input_dir = Path(input_dir)
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    sources = sorted(path for path in input_dir.glob(pattern)
+                     if path.is_file() and not path.name.endswith(METADATA_SUFFIX))
+    tasks = [(index, mode, str(source), str(output_dir / _output_name(source, mode)), key, lang)
+             for index, source in enumerate(sources)]
+    return _map(_run_file_job, tasks, workers, chunksize)
+
+
+def _read_jobs(path):
+    """Načte úlohy ze souboru JSON Lines ({"key": ..., "lang": ..., "text": ...})."""
+    with open(path, encoding='utf-8') as handle:
+        for line in handle:
+            if line.strip():
+                record = json.loads(line)
+                metadata = record.get('metadata')
+                yield BatchJob(record['key'], record.get('lang', 'EN'), record['text'],
+                               bytes.fromhex(metadata) if metadata else None)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m playfair_batch',
+                                     description="Dávkové šifrování Playfair přes více procesů")
+    parser.add_argument('mode', choices=['encrypt', 'decrypt'])
+    parser.add_argument('--key', help="klíč pro adresářový režim")
+    parser.add_argument('--lang', default='EN', choices=sorted(LANGUAGES))
+    parser.add_argument('--input-dir', help="adresář se vstupními soubory")
+    parser.add_argument('--output-dir', help="adresář pro výstupní soubory")
+    parser.add_argument('--pattern', help="maska vstupních souborů (výchozí * / *.pf)")
+    parser.add_argument('--jobs', help="soubor JSON Lines s úlohami (výsledky jdou na stdout)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="počet procesů")
+    parser.add_argument('--chunksize', type=int, default=1, help="počet úloh předaných procesu najednou")
+    args = parser.parse_args(argv)
+
+    if args.jobs:
+        results = run_batch(list(_read_jobs(args.jobs)), args.mode, args.workers, args.chunksize)
+        for result in results:
+            record = {'index': result.index, 'ok': result.ok, 'output': result.output,
+                      'error': result.error}
+            if result.metadata is not None:
+                record['metadata'] = result.metadata.hex()
+            print(json.dumps(record, ensure_ascii=False))
+    elif args.input_dir and args.output_dir and args.key is not None:
+        results = run_directory(args.input_dir, args.output_dir, args.key, args.lang, args.mode,
+                                args.pattern, args.workers, args.chunksize)
+    else:
+        parser.error("zadejte --jobs, nebo --key s --input-dir a --output-dir")
+
+    failed = [result for result in results if not result.ok]
+    for result in failed:
+        print(f"Úloha {result.index} selhala: {result.error}", file=sys.stderr)
+    print(f"Hotovo: {len(results) - len(failed)} úspěšně, {len(failed)} chyb", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,207 @@
+# Vektorizovaný (NumPy) backend pro hromadné šifrování Playfair
+# License: MIT License
+
+try:
+    import numpy as np
+except ImportError:  # NumPy je volitelná závislost
+    np = None
+
+from collections.abc import Sequence
+from time import perf_counter
+
+import playfair_core
+from playfair_core import PlayfairCipher, format_groups, iter_pairs, prepare_digraphs
+from playfair_metadata import EncryptionMetadata
+
+HAS_NUMPY = np is not None
+
+
+def _pair_value(pair):
+    """Dvojice ASCII znaků jako uint16 v nativním pořadí bajtů (jako np.frombuffer)."""
+    return int(np.frombuffer(pair.encode('ascii'), dtype=np.uint16)[0])
+
+
+class DigraphView(Sequence):
+    """
+    Bigramy připraveného textu bez vytváření seznamu.
+
+    Chová se jako výsledek iter_pairs (indexování, řezy, iterace, len),
+    ale jednotlivé bigramy vznikají až při přístupu.
+    """
+
+    __slots__ = ('text',)
+
+    def __init__(self, text):
+        self.text = text
+
+    def __len__(self):
+        return len(self.text) // 2
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("index bigramu mimo rozsah")
+        return self.text[2 * index:2 * index + 2]
+
+    def __eq__(self, other):
+        if isinstance(other, DigraphView):
+            return self.text == other.text
+        return list(self) == other
+
+    def __repr__(self):
+        return f"DigraphView({self.text!r})"
+
+
+class BulkEngine:
+    """
+    Hromadný převod bigramů nad zkompilovanou tabulkou.
+
+    S NumPy se připravený text předá jako buffer bajtů, přečte se po
+    dvojicích jako uint16 a celý převod proběhne jedinou operací
+    fancy-indexing nad tabulkou všech 65536 dvojic bajtů. Bez NumPy se
+    použijí slovníkové mapy z CompiledKey.
+    """
+
+    def __init__(self, compiled, use_numpy=None):
+        if use_numpy is None:
+            use_numpy = HAS_NUMPY
+        if use_numpy and not HAS_NUMPY:
+            raise ImportError("NumPy není nainstalováno")
+
+        self.compiled = compiled
+        # Vektorový převod pracuje s bajty, tabulka tedy musí být čistě ASCII
+        self.use_numpy = use_numpy and compiled.letters.isascii()
+
+        if self.use_numpy:
+            self._encrypt_table = self._pair_table(compiled.encrypt_map)
+            self._decrypt_table = self._pair_table(compiled.decrypt_map)
+
+    @staticmethod
+    def _pair_table(mapping):
+        """Převede slovníkovou mapu bigramů na pole uint16 indexované dvojicí bajtů."""
+        table = np.zeros(65536, dtype=np.uint16)
+        for pair, result in mapping.items():
+            table[_pair_value(pair)] = _pair_value(result)
+        return table
+
+    def _transform(self, data, table, mapping):
+        """
+        Převede text sudé délky po bigramech pomocí dané tabulky.
+
+        S NumPy přijímá str i objekt s bufferem (bytes, bytearray, pole)
+        a vrací pole uint8; bez NumPy str a vrací str.
+        """
+        if not self.use_numpy:
+            return ''.join(map(mapping.__getitem__, iter_pairs(data)))
+        if isinstance(data, str):
+            data = data.encode('ascii')
+        return table[np.frombuffer(data, dtype=np.uint16)].view(np.uint8)
+
+    @staticmethod
+    def _text(result):
+        return result if isinstance(result, str) else result.tobytes().decode('ascii')
+
+    def encrypt_buffer(self, prepared):
+        """Zašifruje připravený text (sudé délky); s NumPy vrací pole uint8 bez dekódování."""
+        return self._transform(prepared, self._encrypt_table if self.use_numpy else None,
+                               self.compiled.encrypt_map)
+
+    def encrypt(self, prepared):
+        """Zašifruje připravený text (sudé délky) a vrátí souvislý šifrový text."""
+        return self._text(self.encrypt_buffer(prepared))
+
+    def decrypt(self, text):
+        """Dešifruje text sudé délky a vrátí souvislý otevřený text."""
+        return self._text(self._transform(text, self._decrypt_table if self.use_numpy else None,
+                                          self.compiled.decrypt_map))
+
+    def format_groups(self, text, size=5):
+        """Rozdělí text (str nebo pole uint8 z encrypt_buffer) do skupin po `size` znacích."""
+        if isinstance(text, str):
+            if not self.use_numpy or not text.isascii():
+                return format_groups(text, size)
+            text = np.frombuffer(text.encode('ascii'), dtype=np.uint8)
+        length = len(text)
+        if length == 0:
+            return ''
+        groups = -(-length // size)
+        padded = np.full(groups * size, 32, dtype=np.uint8)
+        padded[:length] = text
+        grid = np.full((groups, size + 1), 32, dtype=np.uint8)
+        grid[:, :size] = padded.reshape(groups, size)
+        return grid.reshape(-1)[:length + groups - 1].tobytes().decode('ascii')
+
+
+class BulkPlayfairCipher(PlayfairCipher):
+    """
+    PlayfairCipher s hromadným backendem pro velké vstupy.
+
+    Výsledky jsou shodné s čistě pythonovou cestou; bez NumPy se
+    automaticky použije slovníková varianta. Bigramy se vracejí jako
+    DigraphView místo seznamu.
+    """
+
+    def __init__(self, use_numpy=None, key_cache=None):
+        super().__init__(key_cache)
+        self.use_numpy = use_numpy
+        self.bulk = None
+
+    def generate_table(self, key):
+        table = super().generate_table(key)
+        self.bulk = BulkEngine(self.compiled, self.use_numpy)
+        return table
+
+    def _require_bulk(self):
+        """Vrátí hromadný engine, nebo vyhodí chybu, pokud ještě neexistuje."""
+        self._require_compiled()
+        return self.bulk
+
+    def encrypt(self, plaintext):
+        """Šifruje otevřený text hromadným převodem všech bigramů najednou."""
+        bulk = self._require_bulk()
+        stats = playfair_core._stats
+
+        filtered_text, spaces_pos = self.filter_text(plaintext)
+        start = perf_counter() if stats is not None else 0.0
+        prepared, padding_positions = prepare_digraphs(filtered_text, self.padding_char,
+                                                       self.secondary_padding_char)
+        prepared_at = perf_counter() if stats is not None else 0.0
+
+        self.last_encryption_metadata = EncryptionMetadata(spaces_pos, padding_positions)
+
+        ciphertext = bulk.encrypt_buffer(prepared)
+        encrypted = perf_counter() if stats is not None else 0.0
+        formatted = bulk.format_groups(ciphertext)
+
+        if stats is not None:
+            formatted_at = perf_counter()
+            stats.record('prepare_text', prepared_at - start, len(filtered_text), len(prepared))
+            stats.record('encrypt_pairs', encrypted - prepared_at, len(prepared), len(ciphertext))
+            stats.record('format_groups', formatted_at - encrypted, len(ciphertext), len(formatted))
+            stats.count('encrypt_calls')
+            stats.count('padding_chars', len(padding_positions))
+
+        return formatted, DigraphView(prepared), filtered_text, spaces_pos
+
+    def decrypt(self, ciphertext, spaces_pos=None, padding_positions=None, metadata=None):
+        """Dešifruje šifrovaný text hromadným převodem všech bigramů najednou."""
+        bulk = self._require_bulk()
+        stats = playfair_core._stats
+
+        spaces_pos, padding_positions = self._resolve_metadata(spaces_pos, padding_positions, metadata)
+
+        filtered_cipher, _ = self.filter_text(ciphertext)
+        start = perf_counter() if stats is not None else 0.0
+        usable = len(filtered_cipher) - len(filtered_cipher) % 2
+        plaintext = bulk.decrypt(filtered_cipher[:usable])
+        if stats is not None:
+            stats.record('decrypt_pairs', perf_counter() - start, usable, len(plaintext))
+            stats.count('decrypt_calls')
+
+        if spaces_pos is not None and padding_positions is not None:
+            plaintext = self.restore_spaces_and_special(plaintext, spaces_pos, padding_positions)
+
+        return plaintext
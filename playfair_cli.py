@@ -0,0 +1,109 @@
+# Příkazová řádka pro šifrování Playfair (bez GUI)
+# License: MIT License
+#
+# Spuštění: echo "utok na cenka" | python -m playfair_cli encrypt --key KLIC
+#           python -m playfair_cli decrypt --key KLIC -i zprava.pf -o zprava.txt --metadata zprava.pf.meta
+#
+# Modul záměrně neimportuje tkinter ani playfair_gui, aby start zůstal rychlý.
+
+import argparse
+import sys
+from contextlib import ExitStack
+
+from playfair_core import (LANGUAGES, STREAM_CHUNK_SIZE, StreamDecryptor, StreamEncryptor, decrypt_message,
+                           get_compiled_key, iter_text_chunks)
+
+# Velikost bufferu pro čtení a zápis souborů
+IO_BUFFER_SIZE = 1024 * 1024
+
+
+def _open_input(stack, path):
+    """Binární vstup ze souboru, nebo ze stdin pro '-' / None."""
+    if path in (None, '-'):
+        return sys.stdin.buffer
+    return stack.enter_context(open(path, 'rb', buffering=IO_BUFFER_SIZE))
+
+
+def _open_output(stack, path):
+    """Binární výstup do souboru, nebo na stdout pro '-' / None."""
+    if path in (None, '-'):
+        return sys.stdout.buffer
+    return stack.enter_context(open(path, 'wb', buffering=IO_BUFFER_SIZE))
+
+
+def encrypt_file(compiled, source, target, chunk_size=STREAM_CHUNK_SIZE, encoding='utf-8',
+                 collect_metadata=False):
+    """
+    Zašifruje binární proud source do binárního proudu target po blocích.
+
+    Vrací EncryptionMetadata, pokud collect_metadata, jinak None.
+    """
+    encryptor = StreamEncryptor(compiled, collect_metadata=collect_metadata)
+    for chunk in iter_text_chunks(source, chunk_size, encoding):
+        output = encryptor.feed(chunk)
+        if output:
+            target.write(output.encode(encoding))
+    target.write(encryptor.finish().encode(encoding))
+    return encryptor.metadata() if collect_metadata else None
+
+
+def decrypt_file(compiled, source, target, metadata=None, chunk_size=STREAM_CHUNK_SIZE, encoding='utf-8'):
+    """
+    Dešifruje binární proud source do binárního proudu target.
+
+    Bez metadat se dešifruje po blocích; s metadaty se kvůli obnově mezer
+    načte celý šifrový text najednou.
+    """
+    if metadata is not None:
+        ciphertext = ''.join(iter_text_chunks(source, chunk_size, encoding))
+        target.write(decrypt_message(compiled, ciphertext, metadata).encode(encoding))
+        return
+    decryptor = StreamDecryptor(compiled)
+    for chunk in iter_text_chunks(source, chunk_size, encoding):
+        output = decryptor.feed(chunk)
+        if output:
+            target.write(output.encode(encoding))
+    target.write(decryptor.finish().encode(encoding))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m playfair_cli',
+                                     description="Šifrování Playfair z příkazové řádky")
+    parser.add_argument('mode', choices=['encrypt', 'decrypt'])
+    parser.add_argument('--key', required=True, help="kódové slovo")
+    parser.add_argument('--lang', default='EN', choices=sorted(LANGUAGES))
+    parser.add_argument('-i', '--input', help="vstupní soubor (výchozí stdin)")
+    parser.add_argument('-o', '--output', help="výstupní soubor (výchozí stdout)")
+    parser.add_argument('-m', '--metadata',
+                        help="soubor s metadaty (pozice mezer a výplní); encrypt jej zapíše, decrypt načte")
+    parser.add_argument('--encoding', default='utf-8', help="kódování vstupu a výstupu")
+    parser.add_argument('--chunk-size', type=int, default=STREAM_CHUNK_SIZE,
+                        help="velikost čtených bloků ve znacích/bajtech")
+    args = parser.parse_args(argv)
+
+    try:
+        compiled = get_compiled_key(args.key, args.lang)
+        with ExitStack() as stack:
+            source = _open_input(stack, args.input)
+            target = _open_output(stack, args.output)
+            if args.mode == 'encrypt':
+                metadata = encrypt_file(compiled, source, target, args.chunk_size, args.encoding,
+                                        collect_metadata=args.metadata is not None)
+                if metadata is not None:
+                    with open(args.metadata, 'wb') as handle:
+                        handle.write(metadata.to_bytes())
+            else:
+                metadata = None
+                if args.metadata is not None:
+                    with open(args.metadata, 'rb') as handle:
+                        metadata = handle.read()
+                decrypt_file(compiled, source, target, metadata, args.chunk_size, args.encoding)
+            target.flush()
+    except (OSError, ValueError, UnicodeError) as error:
+        print(f"Chyba: {error}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
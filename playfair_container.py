@@ -0,0 +1,416 @@
+# Samopopisný binární kontejner: šifrový text + metadata v nezávislých blocích
+# License: MIT License
+#
+# Spuštění: python -m playfair_container pack --key KLIC --lang CZ -i zprava.txt -o zprava.pfc
+#           python -m playfair_container unpack --key KLIC -i zprava.pfc [--block 3] [--workers 4]
+#           python -m playfair_container info -i zprava.pfc
+#
+# Rozložení souboru:
+#     hlavička   MAGIC, verze, jazyk, abeceda, výplňové znaky, sůl a otisk tabulky
+#     bloky      (délka šifr. textu, délka metadat, crc32) + šifrový text UTF-8 + metadata
+#     index      pro každý blok (pozice, délka šifr. textu, délka metadat, počet znaků vstupu)
+#     patička    (pozice indexu, počet bloků, crc32 indexu, FOOTER_MAGIC) na konci souboru
+#
+# Každý blok je zašifrovaný samostatně (vlastní výplně i metadata), takže
+# blok N lze přečíst a dešifrovat bez čtení předchozích bloků a všechny
+# bloky lze dešifrovat paralelně. Čtenář začíná patičkou a indexem.
+
+import argparse
+import hashlib
+import os
+import struct
+import sys
+import zlib
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+
+from playfair_core import (LANGUAGES, STREAM_CHUNK_SIZE, decrypt_message, encrypt_message, get_compiled_key,
+                           iter_text_chunks, register_language)
+from playfair_metadata import decode_varint, encode_varint
+
+# Identifikace formátu
+CONTAINER_MAGIC = b'PFC1'
+FOOTER_MAGIC = b'PFCE'
+CONTAINER_VERSION = 1
+
+# Výchozí velikost bloku ve znacích vstupního textu
+DEFAULT_BLOCK_SIZE = 1024 * 1024
+
+# Délka soli a otisku tabulky v bajtech
+SALT_SIZE = 16
+FINGERPRINT_SIZE = 16
+
+# Rámec bloku: délka šifrového textu, délka metadat, crc32 obou částí
+_BLOCK = struct.Struct('>III')
+
+# Položka indexu: pozice bloku, délka šifrového textu, délka metadat, počet znaků vstupu
+_INDEX_ENTRY = struct.Struct('>QIII')
+
+# Patička: pozice indexu, počet bloků, crc32 indexu, FOOTER_MAGIC
+_FOOTER = struct.Struct('>QII4s')
+
+# Popis jednoho bloku z indexu (offset ukazuje na rámec bloku)
+BlockInfo = namedtuple('BlockInfo', 'offset cipher_size metadata_size chars')
+
+
+def key_fingerprint(compiled, salt):
+    """
+    Otisk tabulky klíče (včetně abecedy a výplní) pro ověření klíče při čtení.
+
+    Sůl je pro každý kontejner jiná, takže dva kontejnery se stejným klíčem
+    nejdou podle otisku spárovat.
+    """
+    identity = '\0'.join((compiled.letters, compiled.alphabet, compiled.replace_char or '',
+                          compiled.padding_char, compiled.secondary_padding_char))
+    return hashlib.blake2b(identity.encode('utf-8'), digest_size=FINGERPRINT_SIZE, salt=salt).digest()
+
+
+def _encode_string(value, out):
+    data = value.encode('utf-8')
+    encode_varint(len(data), out)
+    out += data
+
+
+def _decode_string(data, offset):
+    size, offset = decode_varint(data, offset)
+    if offset + size > len(data):
+        raise ValueError("Poškozená hlavička kontejneru")
+    return data[offset:offset + size].decode('utf-8'), offset + size
+
+
+def _encode_header(compiled, block_size, salt):
+    body = bytearray()
+    for value in (compiled.lang or '', compiled.alphabet, compiled.replace_char or '',
+                  compiled.padding_char, compiled.secondary_padding_char):
+        _encode_string(value, body)
+    encode_varint(block_size, body)
+    body += salt + key_fingerprint(compiled, salt)
+    return CONTAINER_MAGIC + bytes([CONTAINER_VERSION]) + struct.pack('>I', len(body)) + bytes(body)
+
+
+class ContainerWriter:
+    """
+    Zapisuje kontejner do binárního proudu (soubor, roura, BytesIO).
+
+    Text se předává metodou write() po libovolných kusech a dělí se na bloky
+    po block_size znacích; index a patička se zapíšou při close(). Proud
+    nemusí podporovat seek, pozice se počítají ze zapsaných bajtů.
+    """
+
+    def __init__(self, target, compiled, block_size=DEFAULT_BLOCK_SIZE):
+        if block_size <= 0:
+            raise ValueError("Velikost bloku musí být kladná")
+        self.target = target
+        self.compiled = compiled
+        self.block_size = block_size
+        self.blocks = []
+        self.closed = False
+        self._pending = []
+        self._pending_chars = 0
+        header = _encode_header(compiled, block_size, os.urandom(SALT_SIZE))
+        target.write(header)
+        self._offset = len(header)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+
+    def write(self, text):
+        """Přidá text; hotové bloky se hned zašifrují a zapíšou."""
+        if self.closed:
+            raise ValueError("Kontejner je už uzavřený")
+        self._pending.append(text)
+        self._pending_chars += len(text)
+        if self._pending_chars < self.block_size:
+            return
+        buffered = ''.join(self._pending)
+        start = 0
+        while len(buffered) - start >= self.block_size:
+            self._write_block(buffered[start:start + self.block_size])
+            start += self.block_size
+        rest = buffered[start:]
+        self._pending = [rest] if rest else []
+        self._pending_chars = len(rest)
+
+    def _write_block(self, text):
+        ciphertext, metadata = encrypt_message(self.compiled, text)
+        cipher_data = ciphertext.replace(' ', '').encode('utf-8')
+        metadata_data = metadata.to_bytes()
+        crc = zlib.crc32(metadata_data, zlib.crc32(cipher_data))
+        self.target.write(_BLOCK.pack(len(cipher_data), len(metadata_data), crc))
+        self.target.write(cipher_data)
+        self.target.write(metadata_data)
+        self.blocks.append(BlockInfo(self._offset, len(cipher_data), len(metadata_data), len(text)))
+        self._offset += _BLOCK.size + len(cipher_data) + len(metadata_data)
+
+    def close(self):
+        """Zapíše poslední neúplný blok, index a patičku; vrací seznam BlockInfo."""
+        if self.closed:
+            return self.blocks
+        if self._pending_chars:
+            self._write_block(''.join(self._pending))
+            self._pending = []
+            self._pending_chars = 0
+        index = b''.join(_INDEX_ENTRY.pack(*block) for block in self.blocks)
+        self.target.write(index)
+        self.target.write(_FOOTER.pack(self._offset, len(self.blocks), zlib.crc32(index), FOOTER_MAGIC))
+        self.closed = True
+        return self.blocks
+
+
+class ContainerReader:
+    """
+    Čte kontejner s náhodným přístupem k blokům.
+
+    source je cesta nebo binární soubor podporující seek. Hlavička, index
+    a patička se načtou při otevření, bloky až na vyžádání.
+    """
+
+    def __init__(self, source):
+        self._stack = ExitStack()
+        if isinstance(source, (str, os.PathLike)):
+            self.path = os.fspath(source)
+            self.handle = self._stack.enter_context(open(self.path, 'rb'))
+        else:
+            self.path = getattr(source, 'name', None)
+            self.handle = source
+        try:
+            self._read_header()
+            self._read_index()
+        except Exception:
+            self._stack.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        self._stack.close()
+
+    def __len__(self):
+        return len(self.blocks)
+
+    def _read_header(self):
+        handle = self.handle
+        handle.seek(0)
+        prefix = handle.read(len(CONTAINER_MAGIC) + 5)
+        if len(prefix) < len(CONTAINER_MAGIC) + 5 or prefix[:len(CONTAINER_MAGIC)] != CONTAINER_MAGIC:
+            raise ValueError("Neplatný formát kontejneru")
+        version = prefix[len(CONTAINER_MAGIC)]
+        if version != CONTAINER_VERSION:
+            raise ValueError(f"Nepodporovaná verze kontejneru: {version}")
+        size, = struct.unpack('>I', prefix[len(CONTAINER_MAGIC) + 1:])
+        body = handle.read(size)
+        if len(body) != size:
+            raise ValueError("Poškozená hlavička kontejneru")
+
+        offset = 0
+        fields = []
+        for _ in range(5):
+            value, offset = _decode_string(body, offset)
+            fields.append(value)
+        self.lang, self.alphabet, replace_char, self.padding_char, self.secondary_padding_char = fields
+        self.replace_char = replace_char or None
+        self.block_size, offset = decode_varint(body, offset)
+        if offset + SALT_SIZE + FINGERPRINT_SIZE != len(body):
+            raise ValueError("Poškozená hlavička kontejneru")
+        self.salt = body[offset:offset + SALT_SIZE]
+        self.fingerprint = body[offset + SALT_SIZE:]
+
+    def _read_index(self):
+        handle = self.handle
+        end = handle.seek(0, os.SEEK_END)
+        if end < _FOOTER.size:
+            raise ValueError("Kontejner nemá patičku (neúplný zápis?)")
+        handle.seek(end - _FOOTER.size)
+        index_offset, count, index_crc, magic = _FOOTER.unpack(handle.read(_FOOTER.size))
+        if magic != FOOTER_MAGIC:
+            raise ValueError("Kontejner nemá patičku (neúplný zápis?)")
+        if index_offset + count * _INDEX_ENTRY.size != end - _FOOTER.size:
+            raise ValueError("Poškozený index kontejneru")
+        handle.seek(index_offset)
+        index = handle.read(count * _INDEX_ENTRY.size)
+        if zlib.crc32(index) != index_crc:
+            raise ValueError("Poškozený index kontejneru")
+        self.blocks = [BlockInfo(*entry) for entry in _INDEX_ENTRY.iter_unpack(index)]
+
+    @property
+    def chars(self):
+        """Počet znaků vstupního textu ve všech blocích."""
+        return sum(block.chars for block in self.blocks)
+
+    def compile_key(self, key):
+        """Zkompiluje klíč pro jazyk a výplně z hlavičky a ověří ho otiskem."""
+        if not self.lang:
+            raise ValueError("Kontejner neuvádí jazyk; použijte check_key se zkompilovaným klíčem")
+        if self.lang not in LANGUAGES:
+            # Vlastní abeceda z jiného procesu; hlavička nese vše potřebné
+            register_language(self.lang, self.alphabet, self.replace_char, self.padding_char,
+                              self.secondary_padding_char)
+        compiled = get_compiled_key(key, self.lang, self.padding_char, self.secondary_padding_char)
+        self.check_key(compiled)
+        return compiled
+
+    def check_key(self, compiled):
+        """Vyhodí ValueError, pokud zkompilovaný klíč neodpovídá kontejneru."""
+        if key_fingerprint(compiled, self.salt) != self.fingerprint:
+            raise ValueError("Klíč neodpovídá kontejneru")
+
+    def read_block(self, number):
+        """Surový blok: (šifrový text, serializovaná metadata)."""
+        return read_block(self.handle, self.blocks[number])
+
+    def decrypt_block(self, compiled, number):
+        """Dešifruje jeden blok včetně obnovy mezer."""
+        ciphertext, metadata = self.read_block(number)
+        return decrypt_message(compiled, ciphertext, metadata)
+
+    def iter_decrypt(self, compiled, workers=1):
+        """
+        Dešifrované bloky v pořadí.
+
+        S workers != 1 se bloky dešifrují ve více procesech; každý proces si
+        kontejner otevře sám a čte jen svoje bloky (vyžaduje cestu k souboru).
+        """
+        self.check_key(compiled)
+        if workers == 1:
+            for number in range(len(self.blocks)):
+                yield self.decrypt_block(compiled, number)
+            return
+        if self.path is None:
+            raise ValueError("Paralelní dešifrování vyžaduje kontejner otevřený ze souboru")
+        window = 2 * (workers or os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(self.path, compiled)) as executor:
+            pending = []
+            for block in self.blocks:
+                pending.append(executor.submit(_decrypt_task, block))
+                if len(pending) >= window:
+                    yield pending.pop(0).result()
+            for future in pending:
+                yield future.result()
+
+    def decrypt_all(self, compiled, workers=1):
+        """Dešifruje celý kontejner do jednoho řetězce."""
+        return ''.join(self.iter_decrypt(compiled, workers))
+
+
+def read_block(handle, block):
+    """Přečte a ověří blok popsaný BlockInfo z binárního souboru."""
+    handle.seek(block.offset)
+    frame = handle.read(_BLOCK.size + block.cipher_size + block.metadata_size)
+    if len(frame) != _BLOCK.size + block.cipher_size + block.metadata_size:
+        raise ValueError("Neúplný blok kontejneru")
+    cipher_size, metadata_size, crc = _BLOCK.unpack_from(frame)
+    if (cipher_size, metadata_size) != (block.cipher_size, block.metadata_size):
+        raise ValueError("Blok neodpovídá indexu kontejneru")
+    payload = memoryview(frame)[_BLOCK.size:]
+    if zlib.crc32(payload) != crc:
+        raise ValueError("Poškozený blok kontejneru (crc32)")
+    ciphertext = bytes(payload[:cipher_size]).decode('utf-8')
+    return ciphertext, bytes(payload[cipher_size:])
+
+
+# Stav pracovního procesu (nastaví _init_worker)
+_worker_handle = None
+_worker_compiled = None
+
+
+def _init_worker(path, compiled):
+    global _worker_handle, _worker_compiled
+    _worker_handle = open(path, 'rb')
+    _worker_compiled = compiled
+
+
+def _decrypt_task(block):
+    ciphertext, metadata = read_block(_worker_handle, block)
+    return decrypt_message(_worker_compiled, ciphertext, metadata)
+
+
+def encrypt_file(compiled, source, target, block_size=DEFAULT_BLOCK_SIZE, chunk_size=STREAM_CHUNK_SIZE,
+                 encoding='utf-8'):
+    """Zašifruje binární proud source do kontejneru v target; vrací seznam BlockInfo."""
+    writer = ContainerWriter(target, compiled, block_size)
+    for chunk in iter_text_chunks(source, chunk_size, encoding):
+        writer.write(chunk)
+    return writer.close()
+
+
+def decrypt_file(reader, compiled, target, workers=1, encoding='utf-8'):
+    """Dešifruje všechny bloky kontejneru do binárního proudu target."""
+    for text in reader.iter_decrypt(compiled, workers):
+        target.write(text.encode(encoding))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m playfair_container',
+                                     description="Kontejner se šifrovým textem a metadaty")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    pack = commands.add_parser('pack', help="zašifrovat text do kontejneru")
+    pack.add_argument('--key', required=True, help="kódové slovo")
+    pack.add_argument('--lang', default='EN', choices=sorted(LANGUAGES))
+    pack.add_argument('-i', '--input', help="vstupní soubor (výchozí stdin)")
+    pack.add_argument('-o', '--output', required=True, help="výstupní kontejner")
+    pack.add_argument('--encoding', default='utf-8', help="kódování vstupu")
+    pack.add_argument('--block-size', type=int, default=DEFAULT_BLOCK_SIZE, help="velikost bloku ve znacích")
+
+    unpack = commands.add_parser('unpack', help="dešifrovat kontejner")
+    unpack.add_argument('--key', required=True, help="kódové slovo")
+    unpack.add_argument('-i', '--input', required=True, help="vstupní kontejner")
+    unpack.add_argument('-o', '--output', help="výstupní soubor (výchozí stdout)")
+    unpack.add_argument('--encoding', default='utf-8', help="kódování výstupu")
+    unpack.add_argument('--block', type=int, help="dešifrovat jen blok s tímto číslem")
+    unpack.add_argument('--workers', type=int, default=1, help="počet procesů (0 = podle CPU)")
+
+    info = commands.add_parser('info', help="vypsat hlavičku a index kontejneru")
+    info.add_argument('-i', '--input', required=True, help="vstupní kontejner")
+    args = parser.parse_args(argv)
+
+    try:
+        with ExitStack() as stack:
+            if args.command == 'pack':
+                compiled = get_compiled_key(args.key, args.lang)
+                source = sys.stdin.buffer
+                if args.input not in (None, '-'):
+                    source = stack.enter_context(open(args.input, 'rb'))
+                target = stack.enter_context(open(args.output, 'wb'))
+                encrypt_file(compiled, source, target, args.block_size, encoding=args.encoding)
+                return 0
+
+            reader = stack.enter_context(ContainerReader(args.input))
+            if args.command == 'info':
+                print(f"jazyk: {reader.lang}, abeceda: {reader.alphabet}, "
+                      f"výplně: {reader.padding_char}/{reader.secondary_padding_char}")
+                print(f"bloků: {len(reader)}, velikost bloku: {reader.block_size}, znaků: {reader.chars}")
+                for number, block in enumerate(reader.blocks):
+                    print(f"{number:>6} offset={block.offset} šifra={block.cipher_size} "
+                          f"metadata={block.metadata_size} znaků={block.chars}")
+                return 0
+
+            compiled = reader.compile_key(args.key)
+            target = sys.stdout.buffer
+            if args.output not in (None, '-'):
+                target = stack.enter_context(open(args.output, 'wb'))
+            if args.block is not None:
+                if not 0 <= args.block < len(reader):
+                    raise ValueError(f"Kontejner má bloky 0 až {len(reader) - 1}")
+                target.write(reader.decrypt_block(compiled, args.block).encode(args.encoding))
+            else:
+                decrypt_file(reader, compiled, target, args.workers or None, args.encoding)
+            target.flush()
+    except (OSError, ValueError, UnicodeError) as error:
+        print(f"Chyba: {error}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,985 @@
+# Jádro šifry Playfair bez GUI
+# Made by Samuel Kouřil (updated)
+# License: MIT License
+#
+# Modul je záměrně lehký na import (pracovní procesy, příkazová řádka):
+# nenačítá tkinter, regulární výrazy kompiluje až při prvním použití
+# a všechny tabulky jazyků jsou konstanty modulu. main.py ho re-exportuje.
+
+import codecs
+import math
+from _thread import allocate_lock
+from time import perf_counter
+
+from playfair_metadata import EncryptionMetadata
+
+# Diakritická mapa pro české znaky (odstranění diakritiky)
+DIACRITIC_MAP = {
+    'Á': 'A', 'á': 'A', 'Č': 'C', 'č': 'C', 'Ď': 'D', 'ď': 'D',
+    'É': 'E', 'é': 'E', 'Ě': 'E', 'ě': 'E', 'Í': 'I', 'í': 'I',
+    'Ň': 'N', 'ň': 'N', 'Ó': 'O', 'ó': 'O', 'Ř': 'R', 'ř': 'R',
+    'Š': 'S', 'š': 'S', 'Ť': 'T', 'ť': 'T', 'Ú': 'U', 'ú': 'U',
+    'Ů': 'U', 'ů': 'U', 'Ý': 'Y', 'ý': 'Y', 'Ž': 'Z', 'ž': 'Z',
+}
+
+# Abecedy (25 znaků)
+ALPHABET_EN = "ABCDEFGHIKLMNOPQRSTUVWXYZ"  # bez J
+ALPHABET_CZ = "ABCDEFGHIJKLMNOPQRSTUVXYZ"  # bez W
+
+# Alfanumerická abeceda pro mřížku 6x6 (číslice se zachovají, nic se nenahrazuje)
+ALPHABET_EN36 = "ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
+
+# Jazyk -> (abeceda, nahrazovaný znak, výplňový znak, sekundární výplňový znak); J -> I (EN), W -> V (CZ)
+LANGUAGES = {
+    'EN': (ALPHABET_EN, 'J', 'X', 'Q'),
+    'CZ': (ALPHABET_CZ, 'W', 'X', 'Q'),
+    'EN36': (ALPHABET_EN36, None, 'X', 'Q'),
+}
+
+# Náhrada za vypuštěný znak abecedy
+REPLACEMENTS = {'J': 'I', 'W': 'V'}
+
+# Rozměr šifrovací tabulky pro 25znakové abecedy (obecně viz grid_shape)
+TABLE_SIZE = 5
+
+# Výplňové znaky do bigramů
+PADDING_CHAR = 'X'
+SECONDARY_PADDING_CHAR = 'Q'
+
+
+class _LazyPattern:
+    """Regulární výraz zkompilovaný až při prvním použití (import re stojí víc než celé jádro)."""
+
+    def __init__(self, pattern):
+        self.pattern = pattern
+        self._compiled = None
+
+    def __getattr__(self, name):
+        if self._compiled is None:
+            import re
+            self._compiled = re.compile(self.pattern)
+        return getattr(self._compiled, name)
+
+
+# Najde každý index k, pro který platí text[k] == text[k + 1] (překryvně);
+# (?s) = DOTALL, aby se zdvojení poznalo i u znaku '\n' ve vlastní abecedě
+_DOUBLE_LETTER = _LazyPattern(r'(?s)(.)(?=\1)')
+
+# Výchozí velikost bloku pro čtení ze souborů při proudovém zpracování
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Výchozí počet zkompilovaných tabulek ve sdílené cache
+DEFAULT_KEY_CACHE_SIZE = 1024
+
+# Aktivní sběr statistik (viz playfair_stats); None = instrumentace vypnutá
+_stats = None
+
+
+def set_stats(stats):
+    """Nastaví objekt pro sběr statistik (None instrumentaci vypne); vrací předchozí."""
+    global _stats
+    previous, _stats = _stats, stats
+    return previous
+
+
+def resolve_language(lang='EN'):
+    """
+    Vrátí (kód jazyka, abeceda, nahrazovaný znak, výplňový znak, sekundární
+    výplňový znak); neznámý jazyk se bere jako EN.
+    """
+    code = lang.upper()
+    if code not in LANGUAGES:
+        code = 'EN'
+    return (code,) + LANGUAGES[code]
+
+
+def grid_shape(length):
+    """
+    Rozměr mřížky (řádky, sloupce) pro abecedu dané délky.
+
+    Volí se co nejčtvercovější rozklad s řádky <= sloupci (25 -> 5x5,
+    36 -> 6x6, 30 -> 5x6); mřížka musí mít aspoň 2 řádky.
+    """
+    rows = math.isqrt(length)
+    while rows > 1 and length % rows:
+        rows -= 1
+    if rows < 2:
+        raise ValueError(f"Abecedu o {length} znacích nelze rozložit do mřížky")
+    return rows, length // rows
+
+
+def register_language(code, alphabet, replace_char=None, padding_char=None, secondary_padding_char=None):
+    """
+    Přidá vlastní abecedu pod kódem jazyka (např. Unicode znaky nebo číslice).
+
+    Znaky abecedy musí být jedinečné a ve tvaru po filtrování (velká
+    písmena, číslice, ...); mřížka se určí funkcí grid_shape. Výplňové
+    znaky jsou výchozí pro všechny tabulky jazyka (bez zadání X a Q) a
+    musí být v abecedě. Vrací kód.
+    """
+    code = code.upper()
+    if len(set(alphabet)) != len(alphabet):
+        raise ValueError("Znaky abecedy se nesmí opakovat")
+    if any(char != char.upper() or char == ' ' for char in alphabet):
+        raise ValueError("Abeceda smí obsahovat jen velká písmena a další znaky bez mezer")
+    if replace_char is not None and replace_char not in REPLACEMENTS:
+        raise ValueError(f"Nahrazovaný znak musí být jeden z {sorted(REPLACEMENTS)}")
+    padding_char = padding_char or PADDING_CHAR
+    secondary_padding_char = secondary_padding_char or SECONDARY_PADDING_CHAR
+    if padding_char not in alphabet or secondary_padding_char not in alphabet:
+        raise ValueError(f"Výplňové znaky {padding_char}/{secondary_padding_char} nejsou v abecedě, "
+                         "zadejte padding_char a secondary_padding_char")
+    if padding_char == secondary_padding_char:
+        raise ValueError("Výplňové znaky se musí lišit")
+    grid_shape(len(alphabet))
+    LANGUAGES[code] = (alphabet, replace_char, padding_char, secondary_padding_char)
+    return code
+
+
+def _filter_char(char, alphabet, replace_char, replacement):
+    """Výsledek filtrování jednoho znaku (prázdný řetězec = znak se vymaže)."""
+    # 1. Mezery se vypouštějí (jejich pozice sbírá filter_text zvlášť)
+    if char == ' ':
+        return ''
+
+    # 2. Vypuštění speciálních znaků (kromě znaků abecedy, např. číslic v EN36)
+    if not char.isalpha() and char not in alphabet:
+        return ''
+
+    # 3. Odstranění diakritiky
+    if char in DIACRITIC_MAP:
+        char = DIACRITIC_MAP[char]
+
+    # 4. Normalizace a substituce J/W
+    char = char.upper()
+
+    if char == replace_char:
+        # J se nahrazuje I (EN), W se nahrazuje V (CZ)
+        char = replacement
+
+    # 5. Zůstanou jen platné znaky abecedy
+    return char if char in alphabet else ''
+
+
+class _FilterTable(dict):
+    """
+    Překladová tabulka pro str.translate podle pravidel filter_text.
+
+    ASCII a česká diakritika jsou předvyplněné, ostatní znaky se doplní
+    líně při prvním výskytu (__missing__), takže celý text projde jediným
+    voláním translate na úrovni C.
+    """
+
+    def __init__(self, alphabet, replace_char):
+        super().__init__()
+        self.alphabet = alphabet
+        self.replace_char = replace_char
+        self.replacement = REPLACEMENTS.get(replace_char, replace_char)
+        for code in range(128):
+            self[code]
+        for char in DIACRITIC_MAP:
+            self[ord(char)]
+
+    def __missing__(self, code):
+        value = _filter_char(chr(code), self.alphabet, self.replace_char, self.replacement) or None
+        self[code] = value
+        return value
+
+
+# Překladové tabulky podle (abeceda, nahrazovaný znak)
+_FILTER_TABLES = {}
+
+_SPACE = _LazyPattern(' ')
+
+
+def _filter_table(alphabet, replace_char):
+    """Vrátí (a případně sestaví) překladovou tabulku pro danou abecedu."""
+    table = _FILTER_TABLES.get((alphabet, replace_char))
+    if table is None:
+        table = _FILTER_TABLES.setdefault((alphabet, replace_char), _FilterTable(alphabet, replace_char))
+    return table
+
+
+def filter_text(text, alphabet=ALPHABET_EN, replace_char='J'):
+    """
+    Filtruje vstupní text: odstraní diakritiku, převede na velká písmena.
+    Mezery se ukládají pro obnovu, SPECIÁLNÍ ZNAKY JSOU KOMPLETNĚ VYMAZÁNY.
+    """
+    # Pozice mezer (ty se stále ukládají pro obnovu)
+    spaces_positions = [match.start() for match in _SPACE.finditer(text)]
+
+    # Diakritika, velká písmena, J/W a mazání ostatních znaků jedním průchodem
+    return text.translate(_filter_table(alphabet, replace_char)), spaces_positions
+
+
+def restore_spaces(decrypted_text, spaces_positions, padding_positions):
+    """
+    Obnoví mezery na původní pozice a odstraní výplňové znaky.
+    Speciální znaky se NEobnovují.
+    """
+    stats = _stats
+    if stats is not None:
+        start = perf_counter()
+        result = _restore_spaces(decrypted_text, spaces_positions, padding_positions)
+        stats.record('restore_spaces_and_special', perf_counter() - start, len(decrypted_text), len(result))
+        return result
+    return _restore_spaces(decrypted_text, spaces_positions, padding_positions)
+
+
+def _restore_spaces(decrypted_text, spaces_positions, padding_positions):
+    decrypted = decrypted_text.upper()
+
+    # Odstranění výplňových znaků jedním průchodem (pozice se berou jako množina)
+    pieces = []
+    previous = 0
+    for pos in sorted(set(padding_positions)):
+        if 0 <= pos < len(decrypted):
+            pieces.append(decrypted[previous:pos])
+            previous = pos + 1
+    pieces.append(decrypted[previous:])
+    decrypted = ''.join(pieces)
+
+    # Převedení výsledku na malá písmena (Σ se po znacích, aby se nepoužilo koncové ς)
+    if 'Σ' in decrypted:
+        decrypted = ''.join(map(str.lower, decrypted))
+    else:
+        decrypted = decrypted.lower()
+
+    # Výpočet původní délky (pouze znaky + mezery)
+    original_length = len(decrypted) + len(spaces_positions)
+
+    # Slévání setříděných pozic mezer s úseky dešifrovaného textu
+    result = []
+    decrypted_index = 0
+    previous = 0
+    for pos in sorted(set(spaces_positions)):
+        if pos < 0:
+            continue
+        if pos >= original_length:
+            break
+        gap = pos - previous
+        result.append(decrypted[decrypted_index:decrypted_index + gap])
+        decrypted_index += gap
+        result.append(' ') # Vloží mezeru
+        previous = pos + 1
+    result.append(decrypted[decrypted_index:decrypted_index + original_length - previous])
+
+    return ''.join(result)
+
+
+def table_letters(key, alphabet=ALPHABET_EN, replace_char='J'):
+    """Znaky tabulky pro klíč po řádcích: unikátní znaky klíče, pak zbytek abecedy."""
+    # filter_text se volá pro klíč, speciální znaky jsou ignorovány
+    key_filtered, _ = filter_text(key, alphabet, replace_char)
+    return ''.join(dict.fromkeys(key_filtered + alphabet))
+
+
+def build_table(key, alphabet=ALPHABET_EN, replace_char='J'):
+    """
+    Sestaví šifrovací tabulku z klíče (5x5, u jiných abeced podle grid_shape).
+    Nejdřív jdou unikátní znaky klíče, pak zbytek abecedy.
+    """
+    letters = table_letters(key, alphabet, replace_char)
+    _, cols = grid_shape(len(letters))
+    return tuple(tuple(letters[row:row + cols]) for row in range(0, len(letters), cols))
+
+
+def split_digraphs(text, padding_char=PADDING_CHAR, secondary_padding_char=SECONDARY_PADDING_CHAR):
+    """
+    Rozdělí text na bigramy se stejnými pravidly jako PlayfairCipher.prepare_text.
+
+    Místo procházení znak po znaku se hledají jen zdvojená písmena a text
+    mezi nimi se kopíruje celý. Poslední nespárovaný znak se nedoplňuje,
+    ale vrací se zvlášť, aby mohl navázat na další blok textu.
+    Vrací (připravený text sudé délky, pozice výplní, zbývající znak).
+    """
+    parts = []
+    padding_positions = []
+    pos = 0
+
+    for match in _DOUBLE_LETTER.finditer(text):
+        k = match.start()
+        # Zdvojení se řeší jen tehdy, když začíná nový bigram
+        if (k - pos) % 2:
+            continue
+        char = text[k]
+        parts.append(text[pos:k + 1])
+        parts.append(padding_char if char != padding_char else secondary_padding_char)
+        padding_positions.append(k + 1)
+        pos = k + 1
+
+    rest = text[pos:]
+    if len(rest) % 2:
+        parts.append(rest[:-1])
+        return ''.join(parts), padding_positions, rest[-1]
+    parts.append(rest)
+    return ''.join(parts), padding_positions, ''
+
+
+def prepare_digraphs(text, padding_char=PADDING_CHAR, secondary_padding_char=SECONDARY_PADDING_CHAR):
+    """
+    Připraví text pro šifrování: rozdělení na bigramy a vložení výplní.
+
+    Vrací připravený text (sudé délky) jako jeden řetězec a seznam pozic
+    výplní včetně doplnění lichého posledního znaku.
+    """
+    prepared, padding_positions, rest = split_digraphs(text, padding_char, secondary_padding_char)
+    if rest:
+        # Lichý počet znaků (doplnění na konec)
+        padding = padding_char if rest != padding_char else secondary_padding_char
+        prepared += rest + padding
+        padding_positions.append(len(text))
+    return prepared, padding_positions
+
+
+def iter_pairs(text):
+    """Rozdělí text sudé délky na seznam bigramů."""
+    return [text[i:i+2] for i in range(0, len(text), 2)]
+
+
+def format_groups(text, size=5):
+    """Formátování výstupu do skupin po `size` znacích."""
+    return ' '.join([text[i:i+size] for i in range(0, len(text), size)])
+
+
+def iter_text_chunks(source, chunk_size=STREAM_CHUNK_SIZE, encoding='utf-8'):
+    """
+    Sjednotí vstup pro proudové zpracování na posloupnost textových bloků.
+
+    Přijímá iterovatelnou posloupnost řetězců (nebo bajtů) i souborový objekt
+    otevřený textově či binárně. Bajty se dekódují průběžně, takže vícebajtový
+    znak rozdělený mezi dva bloky se neporuší.
+    """
+    if hasattr(source, 'read'):
+        source = iter(lambda reader=source: reader.read(chunk_size), source.read(0))
+
+    decoder = None
+    for chunk in source:
+        if isinstance(chunk, (bytes, bytearray, memoryview)):
+            if decoder is None:
+                decoder = codecs.getincrementaldecoder(encoding)()
+            chunk = decoder.decode(chunk)
+        if chunk:
+            yield chunk
+
+    if decoder is not None:
+        tail = decoder.decode(b'', final=True)
+        if tail:
+            yield tail
+
+
+class CompiledKey:
+    """
+    Zkompilovaná šifrovací tabulka pro jeden klíč a jazyk.
+
+    Obsahuje index znak -> (řádek, sloupec) a kompletní mapy všech bigramů
+    (25x25 u mřížky 5x5, 36x36 u 6x6) pro šifrování i dešifrování, takže se
+    každý pár převede jediným vyhledáním ve slovníku. Mřížka může být
+    i obdélníková (rows x cols). Objekt je neměnný a hashovatelný,
+    takže ho lze bez zámků sdílet mezi vlákny a používat jako klíč cache.
+    """
+
+    __slots__ = ('table', 'size', 'rows', 'cols', 'lang', 'alphabet', 'replace_char', 'padding_char',
+                 'secondary_padding_char', 'positions', 'encrypt_map', 'decrypt_map', '_identity')
+
+    def __init__(self, table, alphabet=ALPHABET_EN, replace_char='J', padding_char=PADDING_CHAR,
+                 secondary_padding_char=SECONDARY_PADDING_CHAR, lang=None):
+        table = tuple(tuple(row) for row in table)
+        rows = len(table)
+        cols = len(table[0]) if table else 0
+        if any(len(row) != cols for row in table):
+            raise ValueError("Všechny řádky tabulky musí mít stejnou délku")
+        if padding_char not in alphabet or secondary_padding_char not in alphabet:
+            raise ValueError("Výplňové znaky musí být v abecedě")
+        fields = {
+            'table': table,
+            'size': rows,
+            'rows': rows,
+            'cols': cols,
+            'lang': lang,
+            'alphabet': alphabet,
+            'replace_char': replace_char,
+            'padding_char': padding_char,
+            'secondary_padding_char': secondary_padding_char,
+            '_identity': (''.join(''.join(row) for row in table), alphabet, replace_char,
+                          padding_char, secondary_padding_char),
+        }
+
+        # Index pozic znaků v tabulce
+        positions = {}
+        for row, chars in enumerate(table):
+            for col, char in enumerate(chars):
+                positions[char] = (row, col)
+        fields['positions'] = positions
+
+        # Předpočítané mapy všech 625 bigramů
+        encrypt_map = {}
+        decrypt_map = {}
+        for char1, (row1, col1) in positions.items():
+            for char2, (row2, col2) in positions.items():
+                pair = char1 + char2
+                encrypt_map[pair] = self._transform(table, rows, cols, row1, col1, row2, col2, 1)
+                decrypt_map[pair] = self._transform(table, rows, cols, row1, col1, row2, col2, -1)
+        fields['encrypt_map'] = encrypt_map
+        fields['decrypt_map'] = decrypt_map
+
+        for name, value in fields.items():
+            object.__setattr__(self, name, value)
+
+    @staticmethod
+    def _transform(table, rows, cols, row1, col1, row2, col2, shift):
+        """Aplikuje pravidla Playfair na jeden bigram (shift 1 = šifrování, -1 = dešifrování)."""
+        # Pravidlo 1: Stejný řádek (posun doprava / doleva)
+        if row1 == row2:
+            return table[row1][(col1 + shift) % cols] + table[row2][(col2 + shift) % cols]
+        # Pravidlo 2: Stejný sloupec (posun dolů / nahoru)
+        if col1 == col2:
+            return table[(row1 + shift) % rows][col1] + table[(row2 + shift) % rows][col2]
+        # Pravidlo 3: Obdélník (záměna sloupců)
+        return table[row1][col2] + table[row2][col1]
+
+    def __setattr__(self, name, value):
+        raise AttributeError("CompiledKey je neměnný")
+
+    def __delattr__(self, name):
+        raise AttributeError("CompiledKey je neměnný")
+
+    def __eq__(self, other):
+        if not isinstance(other, CompiledKey):
+            return NotImplemented
+        return self._identity == other._identity
+
+    def __hash__(self):
+        return hash(self._identity)
+
+    def __repr__(self):
+        return f"CompiledKey({self.letters!r}, lang={self.lang!r})"
+
+    def __reduce__(self):
+        # Mapy se po přenesení do jiného procesu znovu sestaví
+        return (CompiledKey, (self.table, self.alphabet, self.replace_char, self.padding_char,
+                              self.secondary_padding_char, self.lang))
+
+    @property
+    def letters(self):
+        """Znaky tabulky po řádcích jako jeden řetězec."""
+        return self._identity[0]
+
+    def filter_text(self, text):
+        """Filtruje text podle abecedy tohoto klíče (viz filter_text)."""
+        return filter_text(text, self.alphabet, self.replace_char)
+
+    def padding_for(self, char):
+        """Výplňový znak pro daný znak (X, pro samotné X sekundární Q)."""
+        return self.padding_char if char != self.padding_char else self.secondary_padding_char
+
+    def encrypt_pairs(self, pairs):
+        """Zašifruje posloupnost bigramů a vrátí souvislý šifrový text."""
+        return ''.join(map(self.encrypt_map.__getitem__, pairs))
+
+    def decrypt_pairs(self, pairs):
+        """Dešifruje posloupnost bigramů a vrátí souvislý otevřený text."""
+        return ''.join(map(self.decrypt_map.__getitem__, pairs))
+
+
+def compile_key(key, lang='EN', padding_char=None, secondary_padding_char=None):
+    """
+    Sestaví neměnnou zkompilovanou tabulku pro klíč a jazyk.
+
+    Nezadané výplňové znaky se vezmou z nastavení jazyka.
+    """
+    code, alphabet, replace_char, default_padding, default_secondary = resolve_language(lang)
+    padding_char = padding_char or default_padding
+    secondary_padding_char = secondary_padding_char or default_secondary
+    table = build_table(key, alphabet, replace_char)
+    return CompiledKey(table, alphabet, replace_char, padding_char, secondary_padding_char, code)
+
+
+class KeyCache:
+    """
+    Omezená LRU cache zkompilovaných tabulek.
+
+    Klíčem je (normalizovaný klíč, jazyk, výplňové znaky); normalizovaný klíč
+    je posloupnost unikátních znaků po filter_text, takže např. "Playfair"
+    a "PLAYFAIR!!" sdílejí jednu položku. Po překročení velikosti se zahodí
+    nejdéle nepoužitá tabulka. Cache je bezpečná pro souběžné použití.
+    """
+
+    def __init__(self, maxsize=DEFAULT_KEY_CACHE_SIZE):
+        if maxsize < 1:
+            raise ValueError("Velikost cache musí být alespoň 1")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = {}     # pořadí vložení = pořadí použití (poslední je nejnovější)
+        self._lock = allocate_lock()
+
+    @staticmethod
+    def normalize(key, lang='EN'):
+        """Vrátí (normalizovaný klíč, kód jazyka) určující výslednou tabulku."""
+        code, alphabet, replace_char, _, _ = resolve_language(lang)
+        key_filtered, _ = filter_text(key, alphabet, replace_char)
+        return ''.join(dict.fromkeys(key_filtered)), code
+
+    def get(self, key, lang='EN', padding_char=None, secondary_padding_char=None):
+        """Vrátí zkompilovanou tabulku z cache, případně ji sestaví a uloží (výplně viz compile_key)."""
+        normalized, code = self.normalize(key, lang)
+        _, _, _, default_padding, default_secondary = resolve_language(code)
+        padding_char = padding_char or default_padding
+        secondary_padding_char = secondary_padding_char or default_secondary
+        cache_key = (normalized, code, padding_char, secondary_padding_char)
+
+        with self._lock:
+            compiled = self._entries.get(cache_key)
+            if compiled is not None:
+                self._entries[cache_key] = self._entries.pop(cache_key)
+                self.hits += 1
+                if _stats is not None:
+                    _stats.count('key_cache_hits')
+                return compiled
+            self.misses += 1
+            if _stats is not None:
+                _stats.count('key_cache_misses')
+
+        # Sestavení probíhá mimo zámek; souběžné sestavení stejného klíče je neškodné
+        compiled = compile_key(normalized, code, padding_char, secondary_padding_char)
+
+        with self._lock:
+            self._entries.pop(cache_key, None)
+            self._entries[cache_key] = compiled
+            self._evict()
+        return compiled
+
+    def _evict(self):
+        """Zahodí nejdéle nepoužité položky nad limit (volá se pod zámkem)."""
+        while len(self._entries) > self.maxsize:
+            del self._entries[next(iter(self._entries))]
+            self.evictions += 1
+
+    def resize(self, maxsize):
+        """Změní maximální velikost cache (případně hned zahodí přebytečné položky)."""
+        if maxsize < 1:
+            raise ValueError("Velikost cache musí být alespoň 1")
+        with self._lock:
+            self.maxsize = maxsize
+            self._evict()
+
+    def clear(self):
+        """Vyprázdní cache a vynuluje počítadla."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        """Vrátí počítadla cache jako slovník."""
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+
+# Sdílená cache pro celý proces
+DEFAULT_KEY_CACHE = KeyCache()
+
+
+def get_compiled_key(key, lang='EN', padding_char=None, secondary_padding_char=None):
+    """Vrátí zkompilovanou tabulku pro klíč a jazyk ze sdílené cache."""
+    return DEFAULT_KEY_CACHE.get(key, lang, padding_char, secondary_padding_char)
+
+
+def encrypt_parts(compiled, plaintext):
+    """
+    Zašifruje text a vrátí všechny mezivýsledky.
+
+    Vrací (formátovaný šifrový text, bigramy, filtrovaný text, pozice mezer,
+    pozice výplní). Funkce nemá žádný sdílený stav.
+    """
+    stats = _stats
+    if stats is not None:
+        return _encrypt_parts_timed(stats, compiled, plaintext)
+    filtered_text, spaces_pos = compiled.filter_text(plaintext)
+    prepared, padding_positions = prepare_digraphs(filtered_text, compiled.padding_char,
+                                                   compiled.secondary_padding_char)
+    pairs = iter_pairs(prepared)
+    # Každý bigram se převede jedním vyhledáním v předpočítané mapě
+    ciphertext = compiled.encrypt_pairs(pairs)
+    return format_groups(ciphertext), pairs, filtered_text, spaces_pos, padding_positions
+
+
+def _encrypt_parts_timed(stats, compiled, plaintext):
+    """encrypt_parts se záznamem času a velikostí jednotlivých fází do stats."""
+    start = perf_counter()
+    filtered_text, spaces_pos = compiled.filter_text(plaintext)
+    filtered = perf_counter()
+    prepared, padding_positions = prepare_digraphs(filtered_text, compiled.padding_char,
+                                                   compiled.secondary_padding_char)
+    prepared_at = perf_counter()
+    pairs = iter_pairs(prepared)
+    ciphertext = compiled.encrypt_pairs(pairs)
+    encrypted = perf_counter()
+    formatted = format_groups(ciphertext)
+    formatted_at = perf_counter()
+
+    stats.record('filter_text', filtered - start, len(plaintext), len(filtered_text))
+    stats.record('prepare_text', prepared_at - filtered, len(filtered_text), len(prepared))
+    stats.record('encrypt_pairs', encrypted - prepared_at, len(prepared), len(ciphertext))
+    stats.record('format_groups', formatted_at - encrypted, len(ciphertext), len(formatted))
+    stats.count('encrypt_calls')
+    stats.count('padding_chars', len(padding_positions))
+    return formatted, pairs, filtered_text, spaces_pos, padding_positions
+
+
+def encrypt_message(compiled, plaintext):
+    """
+    Zašifruje text zkompilovaným klíčem.
+
+    Vrací (formátovaný šifrový text, EncryptionMetadata); nic se neukládá,
+    takže funkci lze volat souběžně z libovolného počtu vláken.
+    """
+    formatted, _, _, spaces_pos, padding_positions = encrypt_parts(compiled, plaintext)
+    return formatted, EncryptionMetadata(spaces_pos, padding_positions)
+
+
+def decrypt_raw(compiled, ciphertext):
+    """Dešifruje text bez obnovy mezer (velká písmena včetně výplní)."""
+    stats = _stats
+    if stats is not None:
+        return _decrypt_raw_timed(stats, compiled, ciphertext)
+    # Filtr textu (odstranění formátovacích mezer)
+    filtered_cipher, _ = compiled.filter_text(ciphertext)
+    # Neúplný poslední bigram se ignoruje
+    usable = len(filtered_cipher) - len(filtered_cipher) % 2
+    return compiled.decrypt_pairs(iter_pairs(filtered_cipher[:usable]))
+
+
+def _decrypt_raw_timed(stats, compiled, ciphertext):
+    """decrypt_raw se záznamem času a velikostí jednotlivých fází do stats."""
+    start = perf_counter()
+    filtered_cipher, _ = compiled.filter_text(ciphertext)
+    filtered = perf_counter()
+    usable = len(filtered_cipher) - len(filtered_cipher) % 2
+    plaintext = compiled.decrypt_pairs(iter_pairs(filtered_cipher[:usable]))
+    decrypted = perf_counter()
+
+    stats.record('filter_text', filtered - start, len(ciphertext), len(filtered_cipher))
+    stats.record('decrypt_pairs', decrypted - filtered, usable, len(plaintext))
+    stats.count('decrypt_calls')
+    return plaintext
+
+
+def decrypt_message(compiled, ciphertext, metadata=None):
+    """
+    Dešifruje text zkompilovaným klíčem.
+
+    Metadata (EncryptionMetadata nebo jejich serializovaná podoba) se
+    předávají explicitně; bez nich se mezery neobnovují.
+    """
+    plaintext = decrypt_raw(compiled, ciphertext)
+    metadata = EncryptionMetadata.coerce(metadata)
+    if metadata is not None:
+        plaintext = restore_spaces(plaintext, metadata.spaces, metadata.padding_positions)
+    return plaintext
+
+
+class StreamEncryptor:
+    """
+    Proudové šifrování po blocích s konstantní pamětí.
+
+    Mezi bloky si pamatuje jen nespárovaný znak a počet již vydaných znaků
+    šifrového textu (kvůli skupinám po 5). Spojení výstupů feed() a finish()
+    je shodné s prvním prvkem výsledku PlayfairCipher.encrypt.
+    S collect_metadata=True se navíc sbírají pozice mezer a výplní
+    (paměť pak roste s jejich počtem), viz metadata().
+    """
+
+    def __init__(self, compiled, collect_metadata=False):
+        self.compiled = compiled
+        self.pending = ''
+        self.emitted = 0
+        self.collect_metadata = collect_metadata
+        self.spaces = []
+        self.padding_positions = []
+        self.consumed = 0   # Počet přečtených znaků vstupu
+        self.filtered = 0   # Počet znaků po filtrování
+
+    def _format(self, ciphertext):
+        """Naformátuje další úsek šifrového textu tak, aby navazoval na předchozí skupiny."""
+        head = -self.emitted % 5
+        groups = ' '.join([ciphertext[i:i+5] for i in range(head, len(ciphertext), 5)])
+        if groups and self.emitted + head > 0:
+            groups = ' ' + groups
+        self.emitted += len(ciphertext)
+        return ciphertext[:head] + groups
+
+    def feed(self, chunk):
+        """Zpracuje další blok otevřeného textu a vrátí hotovou část šifrového textu."""
+        stats = _stats
+        if stats is not None:
+            start = perf_counter()
+            output = self._feed(chunk)
+            stats.record('stream_encrypt', perf_counter() - start, len(chunk), len(output))
+            return output
+        return self._feed(chunk)
+
+    def _feed(self, chunk):
+        compiled = self.compiled
+        filtered, spaces = compiled.filter_text(chunk)
+        # Index začátku spojeného textu (nespárovaný znak + nový blok) ve filtrovaném textu
+        base = self.filtered - len(self.pending)
+        prepared, padding_positions, self.pending = split_digraphs(self.pending + filtered, compiled.padding_char,
+                                                                   compiled.secondary_padding_char)
+        if self.collect_metadata:
+            self.spaces.extend(position + self.consumed for position in spaces)
+            self.padding_positions.extend(position + base for position in padding_positions)
+        self.consumed += len(chunk)
+        self.filtered += len(filtered)
+        if not prepared:
+            return ''
+        return self._format(compiled.encrypt_pairs(iter_pairs(prepared)))
+
+    def finish(self):
+        """Doplní případný lichý poslední znak a vrátí zbytek šifrového textu."""
+        if not self.pending:
+            return ''
+        char = self.pending
+        self.pending = ''
+        if self.collect_metadata:
+            self.padding_positions.append(self.filtered)
+        return self._format(self.compiled.encrypt_pairs([char + self.compiled.padding_for(char)]))
+
+    def metadata(self):
+        """Vrátí nasbíraná metadata (jen s collect_metadata=True, po finish())."""
+        if not self.collect_metadata:
+            raise ValueError("Metadata se nesbírají, použijte collect_metadata=True")
+        return EncryptionMetadata(self.spaces, self.padding_positions)
+
+
+class StreamDecryptor:
+    """
+    Proudové dešifrování po blocích s konstantní pamětí.
+
+    Výsledek odpovídá PlayfairCipher.decrypt bez metadat: mezery se
+    neobnovují a výplňové znaky zůstávají v textu.
+    """
+
+    def __init__(self, compiled):
+        self.compiled = compiled
+        self.pending = ''
+
+    def feed(self, chunk):
+        """Zpracuje další blok šifrového textu a vrátí hotovou část otevřeného textu."""
+        stats = _stats
+        if stats is not None:
+            start = perf_counter()
+            output = self._feed(chunk)
+            stats.record('stream_decrypt', perf_counter() - start, len(chunk), len(output))
+            return output
+        return self._feed(chunk)
+
+    def _feed(self, chunk):
+        filtered, _ = self.compiled.filter_text(chunk)
+        filtered = self.pending + filtered
+        usable = len(filtered) - len(filtered) % 2
+        self.pending = filtered[usable:]
+        return self.compiled.decrypt_pairs(iter_pairs(filtered[:usable]))
+
+    def finish(self):
+        """Ukončí dešifrování; neúplný poslední bigram se stejně jako v decrypt ignoruje."""
+        self.pending = ''
+        return ''
+
+
+def encrypt_stream(compiled, source, chunk_size=STREAM_CHUNK_SIZE, encoding='utf-8'):
+    """
+    Šifruje text po blocích (generátor).
+
+    Vstupem je iterovatelná posloupnost textových bloků nebo souborový
+    objekt. Spojením vydaných bloků vznikne stejný text jako z encrypt().
+    Metadata se neukládají, aby paměť zůstala omezená.
+    """
+    encryptor = StreamEncryptor(compiled)
+    for chunk in iter_text_chunks(source, chunk_size, encoding):
+        output = encryptor.feed(chunk)
+        if output:
+            yield output
+    output = encryptor.finish()
+    if output:
+        yield output
+
+
+def decrypt_stream(compiled, source, chunk_size=STREAM_CHUNK_SIZE, encoding='utf-8'):
+    """
+    Dešifruje text po blocích (generátor).
+
+    Odpovídá decrypt() bez metadat: vrací velká písmena bez obnovených
+    mezer a s ponechanými výplněmi.
+    """
+    decryptor = StreamDecryptor(compiled)
+    for chunk in iter_text_chunks(source, chunk_size, encoding):
+        output = decryptor.feed(chunk)
+        if output:
+            yield output
+
+
+class PlayfairCipher:
+    """
+    Objektové rozhraní šifry se stavem (jazyk, tabulka, poslední metadata).
+
+    Je to jen tenká obálka nad CompiledKey a funkcemi encrypt_message /
+    decrypt_message. Instance sama není určena ke sdílení mezi vlákny;
+    pro souběžné použití sdílejte CompiledKey.
+    """
+
+    def __init__(self, key_cache=None):
+        # Inicializace matice 5x5 pro šifrovací tabulku
+        self.table = [['' for _ in range(TABLE_SIZE)] for _ in range(TABLE_SIZE)]
+
+        # Diakritická mapa a abecedy (sdílené konstanty modulu)
+        self.DIACRITIC_MAP = DIACRITIC_MAP
+        self.ALPHABET_EN = ALPHABET_EN
+        self.ALPHABET_CZ = ALPHABET_CZ
+
+        # Aktuální nastavení
+        self.lang = 'EN'
+        self.current_alphabet = self.ALPHABET_EN
+        self.replace_char = 'J'                               # Znak, který se nahrazuje (J -> I, W -> V)
+        self.padding_char = PADDING_CHAR                      # Primární výplňový znak do bigramů
+        self.secondary_padding_char = SECONDARY_PADDING_CHAR  # Sekundární výplňový znak
+
+        # Globální úložiště pro metadata (pouze mezery a výplně)
+        self.last_encryption_metadata = None
+
+        # Zkompilovaná tabulka (index pozic + mapy bigramů), vzniká v generate_table
+        self.compiled = None
+
+        # Cache zkompilovaných tabulek (výchozí je sdílená pro celý proces)
+        self.key_cache = key_cache if key_cache is not None else DEFAULT_KEY_CACHE
+
+    def set_language(self, lang='EN'):
+        """Nastaví jazyk šifry (EN, CZ, EN36 nebo vlastní z register_language), nahrazovaný a výplňové znaky."""
+        (self.lang, self.current_alphabet, self.replace_char,
+         self.padding_char, self.secondary_padding_char) = resolve_language(lang)
+
+    def filter_text(self, text):
+        """
+        Filtruje vstupní text: odstraní diakritiku, převede na velká písmena.
+        Mezery se ukládají pro obnovu, SPECIÁLNÍ ZNAKY JSOU KOMPLETNĚ VYMAZÁNY.
+        """
+        stats = _stats
+        if stats is not None:
+            start = perf_counter()
+            filtered, spaces = filter_text(text, self.current_alphabet, self.replace_char)
+            stats.record('filter_text', perf_counter() - start, len(text), len(filtered))
+            return filtered, spaces
+        return filter_text(text, self.current_alphabet, self.replace_char)
+
+    def restore_spaces_and_special(self, decrypted_text, spaces_positions, padding_positions):
+        """
+        Obnoví mezery na původní pozice a odstraní výplňové znaky.
+        Speciální znaky se NEobnovují.
+        """
+        return restore_spaces(decrypted_text, spaces_positions, padding_positions)
+
+    def generate_table(self, key):
+        """
+        Generuje šifrovací tabulku z klíče (5x5, u EN36 6x6).
+        Zkompilovaná tabulka (CompiledKey) se bere z cache, opakovaný klíč
+        se tedy znovu nesestavuje.
+        """
+        self.compiled = self.key_cache.get(key, self.lang, self.padding_char, self.secondary_padding_char)
+
+        if len(self.table) != self.compiled.rows or len(self.table[0]) != self.compiled.cols:
+            # Jiný rozměr mřížky (např. 6x6 pro EN36): tabulka se vytvoří znovu
+            self.table = [list(row) for row in self.compiled.table]
+        else:
+            for row, chars in enumerate(self.compiled.table):
+                self.table[row][:] = chars
+
+        return self.table
+
+    def prepare_text(self, text):
+        """Připraví text pro šifrování: rozdělení na bigramy a vložení výplní."""
+        stats = _stats
+        start = perf_counter() if stats is not None else 0.0
+        prepared, padding_positions = prepare_digraphs(text, self.padding_char, self.secondary_padding_char)
+        pairs = iter_pairs(prepared)
+        if stats is not None:
+            stats.record('prepare_text', perf_counter() - start, len(text), len(prepared))
+            stats.count('padding_chars', len(padding_positions))
+        return pairs, padding_positions
+
+    def find_position(self, char):
+        """Najde pozici znaku v tabulce (řádek, sloupec)"""
+        if self.compiled is None:
+            return None
+        return self.compiled.positions.get(char)
+
+    def _require_compiled(self):
+        """Vrátí zkompilovanou tabulku, nebo vyhodí chybu, pokud ještě neexistuje."""
+        if self.compiled is None:
+            raise ValueError("Šifrovací tabulka není vygenerována, nejprve zavolejte generate_table")
+        return self.compiled
+
+    def encrypt(self, plaintext):
+        """Šifruje otevřený text pomocí Playfair šifry."""
+        formatted, pairs, filtered_text, spaces_pos, padding_positions = encrypt_parts(
+            self._require_compiled(), plaintext)
+
+        # Uložíme pouze pozice mezer a výplní (kompaktně)
+        self.last_encryption_metadata = EncryptionMetadata(spaces_pos, padding_positions)
+
+        # Vracíme bez special_data
+        return formatted, pairs, filtered_text, spaces_pos
+
+    def _resolve_metadata(self, spaces_pos, padding_positions, metadata):
+        """
+        Určí pozice mezer a výplní pro dešifrování.
+
+        Metadata lze předat jako EncryptionMetadata, jejich serializovanou
+        podobu (i místo spaces_pos), nebo jako dva seznamy pozic. Bez nich se
+        použijí metadata posledního šifrování.
+        """
+        if isinstance(spaces_pos, (EncryptionMetadata, bytes, bytearray, memoryview)):
+            metadata, spaces_pos = spaces_pos, None
+        if metadata is not None:
+            metadata = EncryptionMetadata.coerce(metadata)
+            return metadata.spaces, metadata.padding_positions
+        if spaces_pos is None and self.last_encryption_metadata:
+            return (self.last_encryption_metadata.get('spaces'),
+                    self.last_encryption_metadata.get('padding_positions'))
+        return spaces_pos, padding_positions
+
+    def decrypt(self, ciphertext, spaces_pos=None, padding_positions=None, metadata=None):
+        """Dešifruje šifrovaný text pomocí Playfair šifry."""
+        compiled = self._require_compiled()
+
+        # Načtení metadat pro obnovu (pokud nejsou předána)
+        spaces_pos, padding_positions = self._resolve_metadata(spaces_pos, padding_positions, metadata)
+
+        plaintext = decrypt_raw(compiled, ciphertext)
+
+        # Obnovení mezer
+        if spaces_pos is not None and padding_positions is not None:
+            plaintext = restore_spaces(plaintext, spaces_pos, padding_positions)
+
+        return plaintext
+
+    def encrypt_stream(self, source, chunk_size=STREAM_CHUNK_SIZE, encoding='utf-8'):
+        """Šifruje text po blocích (generátor), viz modulová funkce encrypt_stream."""
+        return encrypt_stream(self._require_compiled(), source, chunk_size, encoding)
+
+    def decrypt_stream(self, source, chunk_size=STREAM_CHUNK_SIZE, encoding='utf-8'):
+        """Dešifruje text po blocích (generátor), viz modulová funkce decrypt_stream."""
+        return decrypt_stream(self._require_compiled(), source, chunk_size, encoding)
+
+    def get_table(self):
+        """Vrátí aktuální šifrovací tabulku"""
+        return self.table
@@ -1,9 +1,200 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
+import os
+import queue
 import random
+import threading
+
+from playfair_core import LANGUAGES, StreamDecryptor, StreamEncryptor, iter_pairs, restore_spaces, split_digraphs
+
+# Velikost bloku, po kterém pracovní vlákno hlásí průběh a kontroluje zrušení
+WORKER_CHUNK_SIZE = 64 * 1024
+
+# Jak často GUI kontroluje frontu zpráv od pracovního vlákna [ms]
+WORKER_POLL_INTERVAL = 50
+
+# Výstupy do této délky se vypisují animovaně (psací stroj), delší najednou po blocích
+TYPEWRITER_LIMIT = 2000
+
+# Velikost bloku vkládaného do Text widgetu při hromadném výpisu
+RENDER_BLOCK_SIZE = 64 * 1024
+
+# Nejvýše tolik znaků výstupu se vloží do widgetu; celý výstup lze uložit do souboru
+DISPLAY_LIMIT = 1024 * 1024
+
+# Délka náhledů textu v systémovém logu
+DETAILS_PREVIEW = 500
+
+
+# Intervaly opakovaných animací [ms]
+HEADER_INTERVAL = 2000
+STATUS_INTERVAL = 3000
+CELL_INTERVAL = 500
+
+# Barvy, kterými cyklují buňky tabulky (poslední je klidová barva buňky)
+CELL_COLORS = ['#00ff88', '#ff0088', '#0088ff', '#2a2a2a']
+
+# PLAYFAIR_ANIMATIONS=0 vypne všechny animace (kiosek, slabý stroj)
+ANIMATIONS_ENV = 'PLAYFAIR_ANIMATIONS'
+
+
+def animations_default():
+    """Výchozí zapnutí animací podle proměnné prostředí PLAYFAIR_ANIMATIONS."""
+    return os.environ.get(ANIMATIONS_ENV, '1').strip().lower() not in ('0', 'false', 'no', 'off')
+
+
+def preview(text, limit=DETAILS_PREVIEW, total=None):
+    """Zkrátí text pro zobrazení v logu a připojí informaci o zbývající délce."""
+    total = len(text) if total is None else total
+    if total <= limit:
+        return text
+    return f"{text[:limit]}… (+{total - limit} znaků)"
+
+
+class CipherWorker(threading.Thread):
+    """Šifruje/dešifruje mimo hlavní smyčku Tk a posílá průběh a výsledek do fronty."""
+
+    def __init__(self, mode, compiled, text, spaces_pos=None, padding_positions=None,
+                 chunk_size=WORKER_CHUNK_SIZE):
+        super().__init__(daemon=True)
+        self.mode = mode
+        self.compiled = compiled
+        self.text = text
+        self.spaces_pos = spaces_pos
+        self.padding_positions = padding_positions
+        self.chunk_size = chunk_size
+        self.events = queue.Queue()
+        self.cancelled = threading.Event()
+
+    def cancel(self):
+        """Požádá o zrušení; vlákno skončí po dokončení aktuálního bloku."""
+        self.cancelled.set()
+
+    def _process(self, processor):
+        """Prožene text procesorem po blocích; vrací výstup, nebo None při zrušení."""
+        output = []
+        length = len(self.text)
+        for start in range(0, length, self.chunk_size):
+            if self.cancelled.is_set():
+                return None
+            output.append(processor.feed(self.text[start:start + self.chunk_size]))
+            self.events.put(('progress', min(start + self.chunk_size, length) / length))
+        output.append(processor.finish())
+        return ''.join(output)
+
+    def run(self):
+        try:
+            if self.mode == 'encrypt':
+                encryptor = StreamEncryptor(self.compiled, collect_metadata=True)
+                ciphertext = self._process(encryptor)
+                if ciphertext is None:
+                    self.events.put(('cancelled', None))
+                    return
+                # Pro log stačí náhled ze začátku textu, celý filtrovaný text se nedrží
+                filtered, _ = self.compiled.filter_text(self.text[:DETAILS_PREVIEW * 4])
+                prepared, _, _ = split_digraphs(filtered, self.compiled.padding_char,
+                                                self.compiled.secondary_padding_char)
+                result = {
+                    'ciphertext': ciphertext,
+                    'metadata': encryptor.metadata(),
+                    'filtered_preview': filtered[:DETAILS_PREVIEW],
+                    'filtered_length': encryptor.filtered,
+                    'pairs_preview': iter_pairs(prepared)[:DETAILS_PREVIEW // 3],
+                    'pair_count': encryptor.emitted // 2,
+                }
+            else:
+                plaintext = self._process(StreamDecryptor(self.compiled))
+                if plaintext is None:
+                    self.events.put(('cancelled', None))
+                    return
+                if self.spaces_pos is not None and self.padding_positions is not None:
+                    plaintext = restore_spaces(plaintext, self.spaces_pos, self.padding_positions)
+                result = {'plaintext': plaintext}
+            self.events.put(('done', result))
+        except Exception as e:
+            self.events.put(('error', e))
+
+
+class AnimationScheduler:
+    """
+    Jediné místo, které plánuje opakované animace přes root.after.
+
+    Každá animace má jméno a nejvýše jeden naplánovaný after; nové
+    naplánování téhož jména zruší předchozí, takže smyčky se nemnoží.
+    Po vypnutí se všechny čekající after zruší a nové se neplánují;
+    jednorázové animace (once) se při vypnutí rovnou dokončí.
+    """
+
+    def __init__(self, root, enabled=True):
+        self.root = root
+        self.enabled = enabled
+        self.jobs = {}
+        self.callbacks = {}
+
+    def every(self, name, interval, callback, delay=None):
+        """Spouští callback každých interval ms (poprvé po delay ms)."""
+        self.cancel(name)
+        self.callbacks[name] = (interval, callback)
+        if self.enabled:
+            self._schedule(name, interval if delay is None else delay)
+
+    def once(self, name, delay, callback):
+        """Spustí callback jednou po delay ms (při vypnutých animacích hned)."""
+        self.cancel(name)
+        if not self.enabled:
+            callback()
+            return
+        self.callbacks[name] = (None, callback)
+        self._schedule(name, delay)
+
+    def _schedule(self, name, delay):
+        self.jobs[name] = self.root.after(delay, self._fire, name)
+
+    def _fire(self, name):
+        self.jobs.pop(name, None)
+        if not self.enabled or name not in self.callbacks:
+            return
+        interval, callback = self.callbacks[name]
+        if interval is None:
+            del self.callbacks[name]
+        callback()
+        # Callback mohl animaci mezitím zrušit nebo přeplánovat
+        if self.enabled and name in self.callbacks and name not in self.jobs:
+            self._schedule(name, interval)
+
+    def cancel(self, name):
+        """Zruší animaci daného jména."""
+        self.callbacks.pop(name, None)
+        job = self.jobs.pop(name, None)
+        if job is not None:
+            self.root.after_cancel(job)
+
+    def set_enabled(self, enabled):
+        """Zapne nebo vypne všechny animace; registrace zůstanou pro opětovné zapnutí."""
+        self.enabled = enabled
+        for name in list(self.jobs):
+            self.root.after_cancel(self.jobs.pop(name))
+        for name, (interval, callback) in list(self.callbacks.items()):
+            if interval is None:
+                # Rozběhnutou jednorázovou animaci rovnou dokončíme
+                del self.callbacks[name]
+                callback()
+            elif enabled:
+                self._schedule(name, interval)
+
+    def stop(self):
+        """Zruší všechny animace (např. při zavírání okna)."""
+        for name in list(self.callbacks):
+            self.cancel(name)
+
+    @property
+    def pending(self):
+        """Počet aktuálně naplánovaných after."""
+        return len(self.jobs)
+
 
 class PlayfairGUI:
-    def __init__(self, root, cipher):
+    def __init__(self, root, cipher, animations=None):
         self.root = root
         self.cipher = cipher
         self.root.title("🚀 CYBER PLAYFAIR ENCRYPTOR 9000 🚀")
@@ -23,9 +214,24 @@ class PlayfairGUI:
             'error': '#ff4444'
         }
         
+        # Běžící pracovní vlákno (šifrování/dešifrování)
+        self.worker = None
+        
+        # Vykreslování výstupu (id naplánovaného after a celý poslední výstup)
+        self.render_job = None
+        self.last_output = ''
+        
+        # Animace běží přes jeden plánovač; buňky tabulky se vytvoří jednou a pak jen přepisují
+        if animations is None:
+            animations = animations_default()
+        self.animations = AnimationScheduler(root, animations)
+        self.animations_var = tk.BooleanVar(value=animations)
+        self.table_cells = []
+
         self.setup_styles()
         self.setup_gui()
         self.start_animations()
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
         
     def setup_styles(self):
         """Vytvoří moderní styly pro widgety"""
@@ -105,7 +311,7 @@ class PlayfairGUI:
         lang_frame.pack(fill=tk.X, pady=5)
         ttk.Label(lang_frame, text="JAZYK SYSTEMU:", style='Normal.TLabel').pack(side=tk.LEFT)
         self.lang_var = tk.StringVar(value="EN")
-        lang_combo = ttk.Combobox(lang_frame, textvariable=self.lang_var, values=["EN", "CZ"], 
+        lang_combo = ttk.Combobox(lang_frame, textvariable=self.lang_var, values=sorted(LANGUAGES), 
                                  state="readonly", width=8, style='Cyber.TCombobox')
         lang_combo.pack(side=tk.RIGHT, padx=(10, 0))
         lang_combo.bind('<<ComboboxSelected>>', self.on_language_change)
@@ -123,6 +329,9 @@ class PlayfairGUI:
         ttk.Button(config_frame, text="🔄 GENEROVAT ŠIFROVACÍ TABULKU", 
                   command=self.generate_table, style='Cyber.TButton').pack(fill=tk.X, pady=10)
         
+        ttk.Checkbutton(config_frame, text="ANIMACE", variable=self.animations_var,
+                        command=self.toggle_animations).pack(anchor=tk.W)
+        
         # Sekce textového vstupu
         input_frame = ttk.LabelFrame(parent, text="📥 VSTUPNÍ TEXT", style='Subtitle.TLabel', padding="10")
         input_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 15))
@@ -137,17 +346,30 @@ class PlayfairGUI:
         button_frame = ttk.Frame(parent, style='Card.TFrame')
         button_frame.pack(fill=tk.X, pady=(0, 15))
         
-        ttk.Button(button_frame, text="🚀 ŠIFROVAT", command=self.encrypt_text, 
-                  style='Cyber.TButton').pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 5))
-        ttk.Button(button_frame, text="🔓 DEŠIFROVAT", command=self.decrypt_text,
-                  style='Cyber.TButton').pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        self.encrypt_button = ttk.Button(button_frame, text="🚀 ŠIFROVAT", command=self.encrypt_text,
+                                         style='Cyber.TButton')
+        self.encrypt_button.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 5))
+        self.decrypt_button = ttk.Button(button_frame, text="🔓 DEŠIFROVAT", command=self.decrypt_text,
+                                         style='Cyber.TButton')
+        self.decrypt_button.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
         ttk.Button(button_frame, text="🧹 VYČISTIT", command=self.clear_text,
                   style='Cyber.TButton').pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(5, 0))
         
+        # Průběh zpracování a zrušení
+        progress_frame = ttk.Frame(parent, style='Card.TFrame')
+        progress_frame.pack(fill=tk.X)
+        self.progress_var = tk.DoubleVar(value=0.0)
+        ttk.Progressbar(progress_frame, variable=self.progress_var, maximum=1.0,
+                        mode='determinate').pack(side=tk.LEFT, fill=tk.X, expand=True)
+        self.cancel_button = ttk.Button(progress_frame, text="⛔ ZRUŠIT", command=self.cancel_work,
+                                        style='Cyber.TButton', state=tk.DISABLED)
+        self.cancel_button.pack(side=tk.LEFT, padx=(5, 0))
+        
     def setup_outputs(self, parent):
         """Nastaví výstupní prvky"""
         # Šifrovací tabulka
-        table_frame = ttk.LabelFrame(parent, text="🔢 ŠIFROVACÍ TABULKA 5x5", style='Subtitle.TLabel', padding="10")
+        self.table_frame = table_frame = ttk.LabelFrame(parent, text="🔢 ŠIFROVACÍ TABULKA 5x5",
+                                                        style='Subtitle.TLabel', padding="10")
         table_frame.pack(fill=tk.X, pady=(0, 15))
         
         self.table_container = ttk.Frame(table_frame, style='Card.TFrame')
@@ -161,6 +383,8 @@ class PlayfairGUI:
                                   insertbackground=self.colors['accent'], font=('Consolas', 10, 'bold'),
                                   relief='flat', borderwidth=2)
         self.output_text.pack(fill=tk.BOTH, expand=True)
+        ttk.Button(output_frame, text="💾 ULOŽIT VÝSTUP", command=self.save_output,
+                  style='Cyber.TButton').pack(fill=tk.X, pady=(5, 0))
         
         # Detaily
         details_frame = ttk.LabelFrame(parent, text="📊 SYSTEM LOG", style='Subtitle.TLabel', padding="10")
@@ -186,8 +410,16 @@ class PlayfairGUI:
     
     def start_animations(self):
         """Spustí animace pro futuristický vzhled"""
-        self.animate_header()
-        self.animate_status()
+        self.animations.every('header', HEADER_INTERVAL, self.animate_header, delay=0)
+        self.animations.every('status', STATUS_INTERVAL, self.animate_status, delay=0)
+        
+    def toggle_animations(self):
+        """Zapne/vypne animace podle přepínače"""
+        enabled = self.animations_var.get()
+        self.animations.set_enabled(enabled)
+        if not enabled:
+            for cell in self.table_cells:
+                cell.configure(bg=CELL_COLORS[-1])
         
     def animate_header(self):
         """Animace headeru"""
@@ -196,7 +428,6 @@ class PlayfairGUI:
         for widget in self.header_frame.winfo_children():
             if isinstance(widget, ttk.Label):
                 widget.configure(foreground=current_color)
-        self.root.after(2000, self.animate_header)
     
     def animate_status(self):
         """Animace status baru"""
@@ -208,7 +439,6 @@ class PlayfairGUI:
         ]
         current_msg = random.choice(status_messages)
         self.status_var.set(current_msg)
-        self.root.after(3000, self.animate_status)
     
     def on_language_change(self, event=None):
         """Handle language change"""
@@ -226,25 +456,32 @@ class PlayfairGUI:
             self.cipher.set_language(self.lang_var.get())
             self.cipher.generate_table(key)
             table = self.cipher.get_table()
+            rows, cols = len(table), len(table[0])
             
-            # Clear previous table
-            for widget in self.table_container.winfo_children():
-                widget.destroy()
+            # Buňky se vytvoří jen poprvé (nebo při změně rozměru mřížky), dál se jen přepíše jejich text
+            if len(self.table_cells) != rows * cols:
+                for cell in self.table_cells:
+                    cell.destroy()
+                self.table_cells = []
+                self.table_frame.configure(text=f"🔢 ŠIFROVACÍ TABULKA {rows}x{cols}")
+                for i in range(rows):
+                    for j in range(cols):
+                        cell = tk.Label(self.table_container, width=4, height=2,
+                                      bg=CELL_COLORS[-1], fg=self.colors['accent'], font=('Consolas', 12, 'bold'),
+                                      relief='raised', borderwidth=2)
+                        cell.grid(row=i, column=j, padx=2, pady=2, sticky='nsew')
+                        self.table_cells.append(cell)
             
-            # Create animated table
-            for i in range(5):
-                for j in range(5):
-                    cell = tk.Label(self.table_container, text=table[i][j], width=4, height=2,
-                                  bg='#2a2a2a', fg=self.colors['accent'], font=('Consolas', 12, 'bold'),
-                                  relief='raised', borderwidth=2)
-                    cell.grid(row=i, column=j, padx=2, pady=2, sticky='nsew')
-                    # Animace při vytvoření
-                    self.animate_cell(cell, i*100 + j*50)
+            for cell, letter in zip(self.table_cells, (letter for row in table for letter in row)):
+                cell.configure(text=letter, bg=CELL_COLORS[-1])
+            
+            # Jedna animace pro všechny buňky; nové generování tu předchozí nahradí
+            self.animations.every('cells', CELL_INTERVAL, self.animate_cells)
             
             self.update_details(f"🔐 ŠIFROVACÍ TABULKA VYGENEROVÁNA\n"
                               f"🗝️  Klíč: {key}\n"
                               f"🌐 Jazyk: {self.lang_var.get()}\n"
-                              f"📊 Velikost: 5x5\n"
+                              f"📊 Velikost: {rows}x{cols}\n"
                               f"✅ Systém připraven")
             
             self.update_status("🟢 Šifrovací tabulka úspěšně vygenerována")
@@ -253,19 +490,70 @@ class PlayfairGUI:
             self.update_status("🔴 Chyba při generování tabulky")
             messagebox.showerror("SYSTEM ERROR", f"CHYBA: {str(e)}")
     
-    def animate_cell(self, cell, delay):
-        """Animace buňky tabulky"""
-        def animate():
-            colors = ['#00ff88', '#ff0088', '#0088ff', '#2a2a2a']
+    def animate_cells(self):
+        """Animace buněk tabulky - posune barvu všech buněk o jeden krok"""
+        for cell in self.table_cells:
             current_bg = cell.cget('bg')
-            next_index = (colors.index(current_bg) + 1) % len(colors) if current_bg in colors else 0
-            cell.configure(bg=colors[next_index])
-            self.root.after(500, animate)
-        
-        self.root.after(delay, animate)
+            next_index = (CELL_COLORS.index(current_bg) + 1) % len(CELL_COLORS) if current_bg in CELL_COLORS else 0
+            cell.configure(bg=CELL_COLORS[next_index])
     
+    def _ensure_table(self):
+        """Vrátí zkompilovanou tabulku; pokud ještě neexistuje, vygeneruje ji z aktuálního klíče."""
+        if self.cipher.compiled is None:
+            self.generate_table()
+        return self.cipher.compiled
+
+    def start_worker(self, worker, on_done):
+        """Spustí pracovní vlákno a začne sledovat jeho frontu zpráv"""
+        self.worker = worker
+        self.progress_var.set(0.0)
+        self.encrypt_button.configure(state=tk.DISABLED)
+        self.decrypt_button.configure(state=tk.DISABLED)
+        self.cancel_button.configure(state=tk.NORMAL)
+        worker.start()
+        self.root.after(WORKER_POLL_INTERVAL, self.poll_worker, worker, on_done)
+
+    def finish_worker(self):
+        """Vrátí ovládací prvky do klidového stavu"""
+        self.worker = None
+        self.encrypt_button.configure(state=tk.NORMAL)
+        self.decrypt_button.configure(state=tk.NORMAL)
+        self.cancel_button.configure(state=tk.DISABLED)
+
+    def poll_worker(self, worker, on_done):
+        """Zpracuje zprávy od pracovního vlákna (volá se přes root.after)"""
+        try:
+            while True:
+                kind, payload = worker.events.get_nowait()
+                if kind == 'progress':
+                    self.progress_var.set(payload)
+                    continue
+                self.finish_worker()
+                if kind == 'done':
+                    self.progress_var.set(1.0)
+                    on_done(payload)
+                elif kind == 'cancelled':
+                    self.progress_var.set(0.0)
+                    self.update_status("🟠 Operace zrušena")
+                else:
+                    self.update_status("🔴 Chyba při zpracování")
+                    messagebox.showerror("SYSTEM ERROR", f"CHYBA: {str(payload)}")
+                return
+        except queue.Empty:
+            pass
+        self.root.after(WORKER_POLL_INTERVAL, self.poll_worker, worker, on_done)
+
+    def cancel_work(self):
+        """Zruší běžící šifrování/dešifrování"""
+        if self.worker is not None:
+            self.worker.cancel()
+            self.update_status("🟠 Ruším operaci...")
+
     def encrypt_text(self):
-        """Encrypt the input text with style"""
+        """Encrypt the input text with style (in a background thread)"""
+        if self.worker is not None:
+            self.update_status("🟠 Zpracování již probíhá")
+            return
         try:
             plaintext = self.input_text.get("1.0", tk.END).strip()
             if not plaintext:
@@ -273,31 +561,46 @@ class PlayfairGUI:
                 messagebox.showwarning("INPUT REQUIRED", "ZADEJTE TEXT PRO ŠIFROVÁNÍ")
                 return
             
-            self.update_status("🟣 Probíhá šifrování...")
-            self.root.update()
-            
-            ciphertext, bigramy, filtered, spaces, special = self.cipher.encrypt(plaintext)
-            
-            # Animovaný výstup
-            self.output_text.delete("1.0", tk.END)
-            self.typewriter_effect(self.output_text, ciphertext, 50)
-            
-            details = f"🚀 ŠIFROVÁNÍ ÚSPĚŠNÉ\n"
-            details += f"📥 Původní text: {plaintext}\n"
-            details += f"🔧 Filtrovaný text: {filtered}\n"
-            details += f"🎯 Bigramy: {' '.join(bigramy)}\n"
-            details += f"📤 Šifrovaný text: {ciphertext}\n"
-            details += f"🔒 Šifrovací síla: EXCELLENT"
+            compiled = self._ensure_table()
+            if compiled is None:
+                return
             
-            self.update_details(details)
-            self.update_status("🟢 Šifrování dokončeno")
+            self.update_status("🟣 Probíhá šifrování...")
+            self.start_worker(CipherWorker('encrypt', compiled, plaintext),
+                              lambda result: self.show_encryption(plaintext, result))
             
         except Exception as e:
             self.update_status("🔴 Chyba při šifrování")
             messagebox.showerror("ENCRYPTION ERROR", f"CHYBA ŠIFROVÁNÍ: {str(e)}")
     
+    def show_encryption(self, plaintext, result):
+        """Zobrazí výsledek šifrování z pracovního vlákna"""
+        ciphertext = result['ciphertext']
+        # Metadata si šifra pamatuje pro následné dešifrování
+        self.cipher.last_encryption_metadata = result['metadata']
+        
+        # Výstup (krátký animovaně, dlouhý po blocích)
+        self.show_output(ciphertext, 50)
+        
+        pairs = ' '.join(result['pairs_preview'])
+        if result['pair_count'] > len(result['pairs_preview']):
+            pairs += f" … (celkem {result['pair_count']} bigramů)"
+        
+        details = f"🚀 ŠIFROVÁNÍ ÚSPĚŠNÉ\n"
+        details += f"📥 Původní text: {preview(plaintext)}\n"
+        details += f"🔧 Filtrovaný text: {preview(result['filtered_preview'], total=result['filtered_length'])}\n"
+        details += f"🎯 Bigramy: {pairs}\n"
+        details += f"📤 Šifrovaný text: {preview(ciphertext)}\n"
+        details += f"🔒 Šifrovací síla: EXCELLENT"
+        
+        self.update_details(details)
+        self.update_status("🟢 Šifrování dokončeno")
+    
     def decrypt_text(self):
-        """Decrypt the input text with style"""
+        """Decrypt the input text with style (in a background thread)"""
+        if self.worker is not None:
+            self.update_status("🟠 Zpracování již probíhá")
+            return
         try:
             ciphertext = self.input_text.get("1.0", tk.END).strip()
             if not ciphertext:
@@ -305,47 +608,116 @@ class PlayfairGUI:
                 messagebox.showwarning("INPUT REQUIRED", "ZADEJTE TEXT PRO DEŠIFROVÁNÍ")
                 return
             
-            self.update_status("🟣 Probíhá dešifrování...")
-            self.root.update()
-            
-            plaintext = self.cipher.decrypt(ciphertext)
-            
-            # Animovaný výstup
-            self.output_text.delete("1.0", tk.END)
-            self.typewriter_effect(self.output_text, plaintext, 30)
+            compiled = self._ensure_table()
+            if compiled is None:
+                return
             
-            details = f"🔓 DEŠIFROVÁNÍ ÚSPĚŠNÉ\n"
-            details += f"📤 Šifrovaný text: {ciphertext}\n"
-            details += f"📥 Dešifrovaný text: {plaintext}\n"
-            details += f"✅ Integrita: VERIFIED\n"
-            details += f"🔒 Zabezpečení: MAXIMUM"
+            # Metadata posledního šifrování (bez nich se mezery neobnovují)
+            metadata = self.cipher.last_encryption_metadata
+            spaces_pos = metadata.get('spaces') if metadata else None
+            padding_positions = metadata.get('padding_positions') if metadata else None
             
-            self.update_details(details)
-            self.update_status("🟢 Dešifrování dokončeno")
+            self.update_status("🟣 Probíhá dešifrování...")
+            self.start_worker(CipherWorker('decrypt', compiled, ciphertext, spaces_pos, padding_positions),
+                              lambda result: self.show_decryption(ciphertext, result))
             
         except Exception as e:
             self.update_status("🔴 Chyba při dešifrování")
             messagebox.showerror("DECRYPTION ERROR", f"CHYBA DEŠIFROVÁNÍ: {str(e)}")
     
+    def show_decryption(self, ciphertext, result):
+        """Zobrazí výsledek dešifrování z pracovního vlákna"""
+        plaintext = result['plaintext']
+        
+        # Výstup (krátký animovaně, dlouhý po blocích)
+        self.show_output(plaintext, 30)
+        
+        details = f"🔓 DEŠIFROVÁNÍ ÚSPĚŠNÉ\n"
+        details += f"📤 Šifrovaný text: {preview(ciphertext)}\n"
+        details += f"📥 Dešifrovaný text: {preview(plaintext)}\n"
+        details += f"✅ Integrita: VERIFIED\n"
+        details += f"🔒 Zabezpečení: MAXIMUM"
+        
+        self.update_details(details)
+        self.update_status("🟢 Dešifrování dokončeno")
+    
+    def cancel_render(self):
+        """Zastaví probíhající vykreslování výstupu"""
+        if self.render_job is not None:
+            self.root.after_cancel(self.render_job)
+            self.render_job = None
+    
+    def show_output(self, text, delay):
+        """Vypíše výstup: krátký efektem psacího stroje, dlouhý po velkých blocích"""
+        self.cancel_render()
+        self.last_output = text
+        self.output_text.delete("1.0", tk.END)
+        if len(text) <= TYPEWRITER_LIMIT and self.animations.enabled:
+            self.typewriter_effect(self.output_text, text, delay)
+            return
+        
+        shown = text[:DISPLAY_LIMIT]
+        if len(text) > DISPLAY_LIMIT:
+            shown += f"\n\n… zobrazeno {DISPLAY_LIMIT} z {len(text)} znaků, celý výstup uložíte tlačítkem ULOŽIT"
+        self.render_blocks(self.output_text, shown)
+    
+    def render_blocks(self, text_widget, text, start=0):
+        """Vkládá text po blocích RENDER_BLOCK_SIZE, mezi bloky se obslouží události Tk"""
+        text_widget.insert(tk.END, text[start:start + RENDER_BLOCK_SIZE])
+        start += RENDER_BLOCK_SIZE
+        if start < len(text):
+            self.render_job = self.root.after(1, self.render_blocks, text_widget, text, start)
+        else:
+            self.render_job = None
+    
     def typewriter_effect(self, text_widget, text, delay):
         """Efekt psacího stroje pro text"""
         def type_char(i=0):
             if i < len(text):
                 text_widget.insert(tk.END, text[i])
                 text_widget.see(tk.END)
-                text_widget.after(delay, lambda: type_char(i+1))
+                self.render_job = text_widget.after(delay, lambda: type_char(i+1))
+            else:
+                self.render_job = None
         
         type_char()
     
+    def save_output(self):
+        """Uloží celý poslední výstup do souboru"""
+        if not self.last_output:
+            self.update_status("🟠 Není co uložit")
+            return
+        path = filedialog.asksaveasfilename(defaultextension=".txt",
+                                            filetypes=[("Text", "*.txt"), ("Vše", "*.*")])
+        if not path:
+            return
+        try:
+            with open(path, 'w', encoding='utf-8') as handle:
+                handle.write(self.last_output)
+            self.update_status(f"🟢 Výstup uložen: {path}")
+        except OSError as e:
+            self.update_status("🔴 Chyba při ukládání")
+            messagebox.showerror("SAVE ERROR", f"CHYBA UKLÁDÁNÍ: {str(e)}")
+    
+    def close(self):
+        """Zavře okno: zastaví animace a vykreslování a zruší běžící výpočet"""
+        self.animations.stop()
+        self.cancel_render()
+        if self.worker is not None:
+            self.worker.cancel()
+        self.root.destroy()
+
     def clear_text(self):
         """Clear all text fields with animation"""
+        self.cancel_render()
+        self.last_output = ''
         self.input_text.delete("1.0", tk.END)
         self.output_text.delete("1.0", tk.END)
         self.details_text.delete("1.0", tk.END)
         
         # Animace mazání
         self.output_text.insert("1.0", "🗑️ TEXT CLEARED")
-        self.root.after(1000, lambda: self.output_text.delete("1.0", tk.END))
+        self.animations.once('clear', 1000, lambda: self.output_text.delete("1.0", tk.END))
         
         self.update_status("🟡 Všechna pole vyčištěna")
         self.update_details("🧹 SYSTÉM VYČIŠTĚN\n✅ PŘIPRAVEN PRO NOVÉ ÚKOLY")
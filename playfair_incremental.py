@@ -0,0 +1,242 @@
+# Přešifrování upravených dokumentů bez šifrování celého textu znovu
+# License: MIT License
+#
+# Použití:
+#     document = EncryptedDocument(compiled, ciphertext, metadata)
+#     document.apply_edit(offset=120, deleted=5, inserted="novy text")
+#     ciphertext, metadata = document.ciphertext, document.metadata()
+#
+# Výsledek je vždy shodný s encrypt_message nad upraveným textem. Znovu se
+# šifrují jen bigramy od posledního začátku páru před úpravou až po místo,
+# kde se rozdělení na páry (ovlivněné výplněmi zdvojených písmen) znovu
+# shoduje s původním; zbytek šifrového textu se jen přesune.
+
+from bisect import bisect_left, bisect_right
+
+from playfair_core import decrypt_message, encrypt_message, format_groups, iter_pairs
+from playfair_metadata import EncryptionMetadata
+
+# Počet znaků původního textu za úpravou, které se dešifrují najednou při hledání shody párů
+RESYNC_WINDOW = 256
+
+
+class _GapPositions:
+    """
+    Setříděné pozice (mezer nebo výplní) uložené jako mezerový buffer.
+
+    Pozice před místem poslední úpravy jsou v `head` absolutně, pozice za
+    ním v `tail` jako vzdálenost od konce textu (pozpátku, takže tail[-1]
+    je nejbližší pozice za mezerou). Posun všech pozic za úpravou je pak
+    zadarmo a úpravy blízko sebe stojí jen přesun několika prvků.
+    """
+
+    __slots__ = ('head', 'tail', 'end')
+
+    def __init__(self, positions, end):
+        self.head = list(positions)
+        self.tail = []
+        self.end = end
+
+    def __len__(self):
+        return len(self.head) + len(self.tail)
+
+    def __getitem__(self, index):
+        if index < len(self.head):
+            return self.head[index]
+        return self.end - self.tail[len(self.tail) - 1 - (index - len(self.head))]
+
+    def count_below(self, position):
+        """Počet pozic menších než position."""
+        tail = self.tail
+        return bisect_left(self.head, position) + len(tail) - bisect_right(tail, self.end - position)
+
+    def count_upto(self, position):
+        """Počet pozic menších nebo rovných position."""
+        tail = self.tail
+        return bisect_right(self.head, position) + len(tail) - bisect_left(tail, self.end - position)
+
+    def _move_gap(self, index):
+        """Přesune mezeru tak, aby head obsahoval právě prvních `index` pozic."""
+        head, tail, end = self.head, self.tail, self.end
+        if index > len(head):
+            moved = tail[len(tail) - (index - len(head)):]
+            del tail[len(tail) - len(moved):]
+            head.extend(end - value for value in reversed(moved))
+        elif index < len(head):
+            tail.extend(end - value for value in reversed(head[index:]))
+            del head[index:]
+
+    def replace(self, start, stop, positions, delta):
+        """Nahradí pozice s pořadím start..stop-1 novými a konec textu posune o delta."""
+        self._move_gap(stop)
+        self.head[start:] = positions
+        self.end += delta
+
+    def truncate(self, start, positions, end):
+        """Zahodí pozice od pořadí start, přidá nové a nastaví nový konec textu."""
+        self._move_gap(start)
+        self.tail.clear()
+        self.head.extend(positions)
+        self.end = end
+
+    def to_list(self):
+        return self.head + [self.end - value for value in reversed(self.tail)]
+
+
+class EncryptedDocument:
+    """
+    Šifrový text a metadata jednoho dokumentu připravené na postupné úpravy.
+
+    Souřadnice úprav jsou v původním otevřeném textu (stejné jako pozice
+    mezer v metadatech). Převod na pozice ve filtrovaném textu počítá jen
+    s mezerami, takže je přesný pro text, ze kterého filtr před místem
+    úpravy nic nevypustil, například pro text vrácený decrypt_message.
+    Vkládaný text může obsahovat cokoli, filtruje se běžným filter_text.
+    """
+
+    def __init__(self, compiled, ciphertext, metadata):
+        metadata = EncryptionMetadata.coerce(metadata)
+        if metadata is None:
+            raise ValueError("Přešifrování vyžaduje metadata (pozice mezer a výplní)")
+        self.compiled = compiled
+        # Šifrový text bez formátovacích mezer; znak i odpovídá znaku i připraveného textu
+        self.cipher = ciphertext.replace(' ', '')
+        if len(self.cipher) % 2 or len(metadata.padding_positions) > len(self.cipher):
+            raise ValueError("Šifrový text neodpovídá metadatům")
+        filtered_length = len(self.cipher) - len(metadata.padding_positions)
+        self.padding_positions = _GapPositions(metadata.padding_positions, filtered_length)
+        self.spaces = _GapPositions(metadata.spaces, filtered_length + len(metadata.spaces))
+
+    @classmethod
+    def encrypt(cls, compiled, plaintext):
+        """Zašifruje celý text a vrátí dokument připravený na úpravy."""
+        return cls(compiled, *encrypt_message(compiled, plaintext))
+
+    @property
+    def ciphertext(self):
+        """Šifrový text formátovaný do skupin po 5 (jako encrypt_message)."""
+        return format_groups(self.cipher)
+
+    @property
+    def filtered_length(self):
+        """Počet znaků filtrovaného textu (bez výplní)."""
+        return len(self.cipher) - len(self.padding_positions)
+
+    def __len__(self):
+        """Délka dokumentu v souřadnicích úprav (znaky + mezery)."""
+        return self.filtered_length + len(self.spaces)
+
+    def metadata(self):
+        """Aktuální metadata jako EncryptionMetadata."""
+        return EncryptionMetadata(self.spaces.to_list(), self.padding_positions.to_list())
+
+    def _prepared_index(self, index):
+        """Pozice znaku filtrovaného textu v připraveném textu (za ním vložené výplně)."""
+        return index + self.padding_positions.count_upto(index)
+
+    def _starts_pair(self, index):
+        """Začíná znakem filtrovaného textu s indexem `index` nový bigram?"""
+        return self._prepared_index(index) % 2 == 0
+
+    def _filtered_range(self, start, stop):
+        """Znaky filtrovaného textu start..stop-1 (dešifrují se jen páry, které je obsahují)."""
+        if start >= stop:
+            return ''
+        first = self._prepared_index(start)
+        last = self._prepared_index(stop - 1)
+        low = first - first % 2
+        high = last + 1 + (last + 1) % 2
+        plain = self.compiled.decrypt_pairs(iter_pairs(self.cipher[low:high]))
+        # Výplně uvnitř úseku (výplň k leží v připraveném textu na pozici padding_positions[k] + k)
+        pads = self.padding_positions
+        skip = {pads[k] + k - low for k in range(pads.count_upto(start), pads.count_upto(stop - 1))}
+        return ''.join(char for i, char in enumerate(plain[first - low:last - low + 1], first - low)
+                       if i not in skip)
+
+    def apply_edit(self, offset, deleted=0, inserted=''):
+        """
+        Nahradí `deleted` znaků od pozice `offset` textem `inserted`.
+
+        Vrací počet znovu zašifrovaných bigramů; ten závisí na velikosti
+        úpravy a na vzdálenosti, po které se rozdělení na páry srovná,
+        ne na délce dokumentu.
+        """
+        if offset < 0 or deleted < 0 or offset + deleted > len(self):
+            raise ValueError(f"Úprava mimo dokument (délka {len(self)})")
+        compiled = self.compiled
+        pads = self.padding_positions
+        spaces = self.spaces
+        old_length = self.filtered_length
+
+        # Úprava ve filtrovaném textu: F[start:end] se nahradí vloženým textem po filtrování
+        first_space = spaces.count_below(offset)
+        last_space = spaces.count_below(offset + deleted)
+        start = offset - first_space
+        end = offset + deleted - last_space
+        fresh, fresh_spaces = compiled.filter_text(inserted)
+
+        # Páry začínající před `resume` nezávisí na upravených znacích (rozhoduje i znak za párem)
+        resume = 0
+        if start >= 2:
+            resume = start - 1 if self._starts_pair(start - 1) else start - 2
+        shift = start + len(fresh) - end           # posun indexů původního textu za úpravou
+        new_length = old_length + shift
+
+        window = self._filtered_range(resume, start) + fresh
+        fetched = end                              # další znak původního textu k dočtení
+        pairs = []
+        new_pads = []
+        index = resume
+        resync = None
+        while index < new_length:
+            # Shoda s původním rozdělením: zbytek šifrového textu platí beze změny
+            if index >= start + len(fresh) and self._starts_pair(index - shift):
+                resync = index - shift
+                break
+            while index + 2 > resume + len(window) and fetched < old_length:
+                window += self._filtered_range(fetched, min(fetched + RESYNC_WINDOW, old_length))
+                fetched = min(fetched + RESYNC_WINDOW, old_length)
+            char = window[index - resume]
+            if index + 1 == new_length:
+                # Lichý poslední znak
+                pairs.append(char + compiled.padding_for(char))
+                new_pads.append(new_length)
+                index += 1
+            elif window[index + 1 - resume] == char:
+                pairs.append(char + compiled.padding_for(char))
+                new_pads.append(index + 1)
+                index += 1
+            else:
+                pairs.append(window[index - resume:index + 2 - resume])
+                index += 2
+
+        # Složení šifrového textu: nezměněný začátek, nové páry, přesunutý konec
+        head = self._prepared_index(resume)
+        kept_pads = pads.count_upto(resume)
+        if resync is None:
+            self.cipher = self.cipher[:head] + compiled.encrypt_pairs(pairs)
+            pads.truncate(kept_pads, new_pads, new_length)
+        else:
+            tail = self._prepared_index(resync)
+            self.cipher = self.cipher[:head] + compiled.encrypt_pairs(pairs) + self.cipher[tail:]
+            pads.replace(kept_pads, pads.count_upto(resync), new_pads, shift)
+
+        # Mezery za úpravou se posunou o rozdíl délek v souřadnicích dokumentu
+        spaces.replace(first_space, last_space, [position + offset for position in fresh_spaces],
+                       len(inserted) - deleted)
+        return len(pairs)
+
+    def decrypt(self):
+        """Dešifrovaný dokument (jako decrypt_message se stejnými metadaty)."""
+        return decrypt_message(self.compiled, self.cipher, self.metadata())
+
+
+def reencrypt(compiled, ciphertext, metadata, offset, deleted=0, inserted=''):
+    """
+    Jednorázová úprava: vrací (šifrový text, EncryptionMetadata) upraveného dokumentu.
+
+    Pro více úprav po sobě je levnější držet EncryptedDocument.
+    """
+    document = EncryptedDocument(compiled, ciphertext, metadata)
+    document.apply_edit(offset, deleted, inserted)
+    return document.ciphertext, document.metadata()
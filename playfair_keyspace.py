@@ -0,0 +1,236 @@
+# Analýza prostoru klíčů: které klíče dávají stejnou šifrovací tabulku
+# License: MIT License
+#
+# Spuštění: python -m playfair_keyspace slovnik.txt --compromised uniklé.txt --output skupiny.jsonl
+#
+# Slovník se čte proudově po dávkách, tabulky se počítají ve více procesech
+# a dvojice (tabulka, klíč) se rozdělují podle hashe tabulky do dočasných
+# souborů. Každý soubor se pak seskupí samostatně a jeho skupiny se hned
+# předají dál (na výstup), takže v paměti je vždy jen jedna dávka, několik
+# částí indexu a nejvýše `top` nejvýznamnějších skupin pro souhrn.
+
+import argparse
+import heapq
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+import zlib
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from playfair_core import LANGUAGES, resolve_language, table_letters
+
+# Počet klíčů v jedné dávce předávané pracovnímu procesu
+DEFAULT_BATCH_SIZE = 20000
+
+# Počet dočasných souborů indexu; větší číslo = menší paměť při seskupování
+DEFAULT_PARTITIONS = 64
+
+# Počet nejvýznamnějších skupin držených v souhrnu (ostatní jen projdou přes on_group)
+DEFAULT_TOP = 100
+
+# Skupina klíčů se stejnou tabulkou; compromised jsou známé prozrazené klíče se stejnou tabulkou
+CollisionGroup = namedtuple('CollisionGroup', 'square keys compromised')
+
+# Souhrn analýzy; groups je jen `top` nejvýznamnějších skupin, počty jsou za všechny
+KeyspaceReport = namedtuple('KeyspaceReport', 'keys squares groups group_count leaked_count')
+
+# Escapování klíčů v řádcích 'tabulka<TAB>klíč' dočasného indexu
+_ESCAPE = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+_UNESCAPE = {'t': '\t', 'n': '\n', 'r': '\r'}
+_ESCAPED = re.compile(r'\\(.)', re.DOTALL)
+
+
+def partition_of(square, partitions):
+    """Číslo části indexu pro tabulku (stabilní napříč procesy, na rozdíl od hash())."""
+    return zlib.crc32(square.encode('utf-8')) % partitions
+
+
+def _escape_key(key):
+    """Klíč bez tabulátorů a konců řádků (zpětné lomítko uvozuje náhradu)."""
+    return key.translate(_ESCAPE)
+
+
+def _unescape_key(text):
+    if '\\' not in text:
+        return text
+    return _ESCAPED.sub(lambda match: _UNESCAPE.get(match[1], match[1]), text)
+
+
+def _rank(group):
+    """Pořadí skupin: nejdřív shody s prozrazenými klíči, pak větší skupiny."""
+    return not group.compromised, -len(group.keys), group.square
+
+
+def _squares_batch(task):
+    """Spočítá tabulky jedné dávky klíčů a rozdělí řádky 'tabulka<TAB>klíč' podle částí."""
+    keys, lang, partitions = task
+    _, alphabet, replace_char, _, _ = resolve_language(lang)
+    parts = {}
+    for key in keys:
+        square = table_letters(key, alphabet, replace_char)
+        parts.setdefault(partition_of(square, partitions), []).append(f"{square}\t{_escape_key(key)}\n")
+    return {part: ''.join(lines) for part, lines in parts.items()}
+
+
+def _group_partition(task):
+    """Seskupí jednu část indexu; vrací (počet tabulek, seznam CollisionGroup)."""
+    path, compromised, min_group = task
+    index = {}
+    with open(path, encoding='utf-8', newline='\n') as handle:
+        for line in handle:
+            square, key = line.rstrip('\n').split('\t', 1)
+            # Vnořený slovník odstraní opakované klíče a zachová pořadí výskytu
+            index.setdefault(square, {})[_unescape_key(key)] = None
+    groups = []
+    for square, keys in index.items():
+        leaked = compromised.get(square, ())
+        if len(keys) >= min_group or leaked:
+            groups.append(CollisionGroup(square, list(keys), list(leaked)))
+    return len(index), groups
+
+
+def _bounded_map(executor, function, tasks, window):
+    """Jako executor.map, ale najednou rozpracuje nejvýše `window` úloh (omezená paměť)."""
+    pending = []
+    for task in tasks:
+        pending.append(executor.submit(function, task))
+        if len(pending) >= window:
+            yield pending.pop(0).result()
+    for future in pending:
+        yield future.result()
+
+
+def _batches(keys, batch_size):
+    """Rozdělí proud klíčů na dávky; prázdné řádky a koncové znaky řádku se vynechají."""
+    keys = (key.rstrip('\r\n') for key in keys)
+    keys = (key for key in keys if key.strip())
+    while True:
+        batch = list(islice(keys, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def compromised_squares(keys, lang='EN'):
+    """Tabulky prozrazených klíčů: {tabulka: [klíče]}."""
+    _, alphabet, replace_char, _, _ = resolve_language(lang)
+    squares = {}
+    for key in keys:
+        key = key.rstrip('\r\n')
+        if key.strip():
+            squares.setdefault(table_letters(key, alphabet, replace_char), []).append(key)
+    return squares
+
+
+def analyze_keys(keys, lang='EN', compromised=(), workers=None, partitions=DEFAULT_PARTITIONS,
+                 batch_size=DEFAULT_BATCH_SIZE, min_group=2, tmpdir=None, on_group=None, top=DEFAULT_TOP):
+    """
+    Najde klíče, které vedou na stejnou tabulku.
+
+    keys je libovolná (i velmi dlouhá) posloupnost klíčů, např. otevřený
+    soubor se slovníkem. Hlášené jsou skupiny, které mají aspoň min_group
+    různých klíčů nebo sdílejí tabulku s prozrazeným klíčem. Každá skupina
+    se hned po seskupení své části indexu předá funkci on_group (v pořadí
+    částí); KeyspaceReport drží jen `top` nejvýznamnějších skupin (top=None
+    nebo 0 = žádné), takže paměť neroste s počtem kolizí.
+    """
+    compromised = compromised_squares(compromised, lang)
+    window = 2 * (workers or os.cpu_count() or 1)
+    workdir = tempfile.mkdtemp(prefix='playfair-keyspace-', dir=tmpdir)
+    try:
+        paths = [os.path.join(workdir, f"part-{part:04d}.tsv") for part in range(partitions)]
+        files = [open(path, 'w', encoding='utf-8') for path in paths]
+        count = 0
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                tasks = ((batch, lang, partitions) for batch in _batches(keys, batch_size))
+                for parts in _bounded_map(executor, _squares_batch, tasks, window):
+                    for part, lines in parts.items():
+                        files[part].write(lines)
+                        count += lines.count('\n')
+        finally:
+            for handle in files:
+                handle.close()
+
+        totals = {'squares': 0, 'groups': 0, 'leaked': 0}
+
+        def stream_groups(executor):
+            tasks = ((path, {square: keys for square, keys in compromised.items()
+                             if partition_of(square, partitions) == part}, min_group)
+                     for part, path in enumerate(paths))
+            for part_squares, part_groups in _bounded_map(executor, _group_partition, tasks, window):
+                totals['squares'] += part_squares
+                for group in part_groups:
+                    totals['groups'] += 1
+                    totals['leaked'] += bool(group.compromised)
+                    if on_group is not None:
+                        on_group(group)
+                    yield group
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            groups = stream_groups(executor)
+            if top:
+                # nsmallest prochází skupiny proudově a drží jen `top` nejlepších
+                groups = heapq.nsmallest(top, groups, key=_rank)
+            else:
+                for _ in groups:
+                    pass
+                groups = []
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return KeyspaceReport(count, totals['squares'], groups, totals['groups'], totals['leaked'])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m playfair_keyspace',
+                                     description="Hledání klíčů se stejnou šifrovací tabulkou")
+    parser.add_argument('wordlist', help="soubor s klíči, jeden na řádek ('-' = stdin)")
+    parser.add_argument('--lang', default='EN', choices=sorted(LANGUAGES))
+    parser.add_argument('--compromised', help="soubor s prozrazenými klíči, jeden na řádek")
+    parser.add_argument('--min-group', type=int, default=2, help="nejmenší hlášená skupina klíčů")
+    parser.add_argument('--workers', type=int, help="počet procesů")
+    parser.add_argument('--partitions', type=int, default=DEFAULT_PARTITIONS, help="počet částí indexu")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument('--tmpdir', help="adresář pro dočasné soubory indexu")
+    parser.add_argument('--output', help="zapsat skupiny jako JSON Lines (výchozí stdout)")
+    args = parser.parse_args(argv)
+
+    out = None
+    try:
+        compromised = []
+        if args.compromised:
+            with open(args.compromised, encoding='utf-8') as handle:
+                compromised = handle.readlines()
+        out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+
+        def write_group(group):
+            out.write(json.dumps(group._asdict(), ensure_ascii=False) + '\n')
+
+        # Skupiny se zapisují průběžně, souhrn je jen počítá
+        options = dict(workers=args.workers, partitions=args.partitions, batch_size=args.batch_size,
+                       min_group=args.min_group, tmpdir=args.tmpdir, on_group=write_group, top=0)
+        if args.wordlist == '-':
+            report = analyze_keys(sys.stdin, args.lang, compromised, **options)
+        else:
+            with open(args.wordlist, encoding='utf-8', errors='replace') as handle:
+                report = analyze_keys(handle, args.lang, compromised, **options)
+    except OSError as error:
+        print(f"Chyba: {error}", file=sys.stderr)
+        return 1
+    finally:
+        if args.output and out is not None:
+            out.close()
+
+    print(f"Klíčů: {report.keys}, různých tabulek: {report.squares}, "
+          f"skupin: {report.group_count}, shod s prozrazenými: {report.leaked_count}", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,181 @@
+# Kompaktní a serializovatelná metadata šifrování Playfair
+# License: MIT License
+
+import zlib
+from array import array
+from itertools import accumulate, chain
+from operator import sub
+
+# Hlavička binárního formátu metadat
+METADATA_MAGIC = b'PFM1'
+
+# Příznaky ve formátu
+FLAG_ZLIB = 0x01
+
+
+def _typecode_for(values):
+    """Zvolí nejmenší pole celých čísel bez znaménka (min. 4 bajty), do kterého se hodnoty vejdou."""
+    if values and max(values) > 0xFFFFFFFF:
+        return 'Q'
+    return 'I' if array('I').itemsize == 4 else 'L'
+
+
+def _sorted_positions(values):
+    """Převede pozice na setříděné pole; restore_spaces_and_special je stejně bere jako množinu."""
+    values = list(values)
+    if any(b < a for a, b in zip(values, values[1:])):
+        values.sort()
+    if values and values[0] < 0:
+        raise ValueError("Pozice v metadatech nesmí být záporné")
+    return array(_typecode_for(values), values)
+
+
+def encode_varint(value, out):
+    """Zapíše nezáporné celé číslo jako varint (7 bitů na bajt) do bytearray."""
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def decode_varint(data, offset):
+    """Přečte varint z bajtů od dané pozice; vrací (hodnota, nová pozice)."""
+    value = 0
+    shift = 0
+    while True:
+        if offset >= len(data):
+            raise ValueError("Neúplný varint v metadatech")
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+def encode_deltas(positions):
+    """Zakóduje setříděné pozice jako rozdíly po sobě jdoucích hodnot ve varintech."""
+    deltas = list(map(sub, positions, chain((0,), positions)))
+    if not deltas or max(deltas) < 0x80:
+        # Rychlá cesta: každý rozdíl se vejde do jednoho bajtu
+        return bytes(deltas)
+    out = bytearray()
+    for delta in deltas:
+        encode_varint(delta, out)
+    return bytes(out)
+
+
+def decode_deltas(data, count):
+    """Dekóduje `count` pozic zakódovaných funkcí encode_deltas."""
+    if len(data) == count:
+        # Rychlá cesta: samé jednobajtové varinty
+        if not data.isascii():
+            raise ValueError("Poškozená metadata")
+        deltas = data
+    else:
+        deltas = []
+        offset = 0
+        for _ in range(count):
+            delta, offset = decode_varint(data, offset)
+            deltas.append(delta)
+        if offset != len(data):
+            raise ValueError("Poškozená metadata")
+    positions = list(accumulate(deltas))
+    return array(_typecode_for(positions), positions)
+
+
+class EncryptionMetadata:
+    """
+    Pozice mezer a výplní z jednoho šifrování.
+
+    V paměti jsou uloženy v poli array('I') (4 bajty na pozici místo
+    desítek bajtů u seznamu intů) a pomocí to_bytes()/from_bytes() se dají
+    uložit vedle šifrového textu jako delta-kódované varinty.
+    """
+
+    __slots__ = ('spaces', 'padding_positions')
+
+    def __init__(self, spaces=(), padding_positions=()):
+        self.spaces = _sorted_positions(spaces)
+        self.padding_positions = _sorted_positions(padding_positions)
+
+    # Kompatibilita se starším slovníkovým tvarem {'spaces': ..., 'padding_positions': ...}
+    def get(self, name, default=None):
+        if name in self.__slots__:
+            return getattr(self, name)
+        return default
+
+    def __getitem__(self, name):
+        if name not in self.__slots__:
+            raise KeyError(name)
+        return getattr(self, name)
+
+    def __eq__(self, other):
+        if not isinstance(other, EncryptionMetadata):
+            return NotImplemented
+        return (list(self.spaces) == list(other.spaces)
+                and list(self.padding_positions) == list(other.padding_positions))
+
+    def __repr__(self):
+        return (f"EncryptionMetadata(spaces={len(self.spaces)}, "
+                f"padding_positions={len(self.padding_positions)})")
+
+    @property
+    def nbytes(self):
+        """Velikost polí s pozicemi v paměti (v bajtech)."""
+        return (len(self.spaces) * self.spaces.itemsize
+                + len(self.padding_positions) * self.padding_positions.itemsize)
+
+    def to_bytes(self, compress=True):
+        """Serializuje metadata do bajtů (volitelně navíc komprimovaných zlibem)."""
+        spaces = encode_deltas(self.spaces)
+        padding = encode_deltas(self.padding_positions)
+
+        header = bytearray()
+        encode_varint(len(self.spaces), header)
+        encode_varint(len(spaces), header)
+        encode_varint(len(self.padding_positions), header)
+        encode_varint(len(padding), header)
+        payload = bytes(header) + spaces + padding
+
+        flags = 0
+        if compress:
+            payload = zlib.compress(payload, 1)
+            flags |= FLAG_ZLIB
+        return METADATA_MAGIC + bytes([flags]) + payload
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Načte metadata serializovaná metodou to_bytes()."""
+        data = bytes(data)
+        if data[:len(METADATA_MAGIC)] != METADATA_MAGIC or len(data) <= len(METADATA_MAGIC):
+            raise ValueError("Neplatný formát metadat")
+        flags = data[len(METADATA_MAGIC)]
+        payload = data[len(METADATA_MAGIC) + 1:]
+        if flags & FLAG_ZLIB:
+            payload = zlib.decompress(payload)
+
+        offset = 0
+        spaces_count, offset = decode_varint(payload, offset)
+        spaces_size, offset = decode_varint(payload, offset)
+        padding_count, offset = decode_varint(payload, offset)
+        padding_size, offset = decode_varint(payload, offset)
+        if offset + spaces_size + padding_size != len(payload):
+            raise ValueError("Poškozená metadata")
+
+        metadata = cls.__new__(cls)
+        metadata.spaces = decode_deltas(payload[offset:offset + spaces_size], spaces_count)
+        offset += spaces_size
+        metadata.padding_positions = decode_deltas(payload[offset:offset + padding_size], padding_count)
+        return metadata
+
+    @classmethod
+    def coerce(cls, value):
+        """Přijme EncryptionMetadata, jejich serializovanou podobu nebo starší slovník."""
+        if value is None or isinstance(value, cls):
+            return value
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return cls.from_bytes(value)
+        if isinstance(value, dict):
+            return cls(value.get('spaces', ()), value.get('padding_positions', ()))
+        raise TypeError(f"Nepodporovaný typ metadat: {type(value).__name__}")
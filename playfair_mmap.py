@@ -0,0 +1,382 @@
+# Šifrování velkých souborů v jednobajtovém kódování přímo nad bajty (mmap)
+# License: MIT License
+#
+# Spuštění: python -m playfair_mmap encrypt --key KLIC archiv.log archiv.log.pf
+#
+# Text se nedekóduje na str: filtr je jediné volání bytes.translate s tabulkou
+# 256 bajtů, bigramy se čtou přes memoryview.cast('H') a převádějí tabulkou
+# všech 65536 dvojic bajtů. Formátování do skupin po 5 se zapisuje rozšířeným
+# řezem do předem alokovaného bufferu. Výstup je shodný s encrypt_message.
+#
+# Výstupní soubor se nemapuje: jeho délka závisí na vypuštěných znacích
+# a vložených výplních, takže není známa před průchodem celým vstupem.
+# Předalokace na horní odhad (až 2,4násobek vstupu) a zkrácení na konci by
+# jen nahradily jednu kopii do page cache ve write() stejnou kopií do mapy.
+
+try:
+    import numpy as np
+except ImportError:  # NumPy je volitelná závislost
+    np = None
+
+import argparse
+import codecs
+import mmap
+import re
+import sys
+from array import array
+
+from playfair_core import LANGUAGES, REPLACEMENTS, _filter_char, decrypt_message, get_compiled_key
+from playfair_metadata import EncryptionMetadata
+
+HAS_NUMPY = np is not None
+
+# Velikost bloku čteného z mapovaného souboru
+MMAP_CHUNK_SIZE = 16 * 1024 * 1024
+
+# Kódování, ve kterých jeden bajt odpovídá jednomu znaku
+DEFAULT_ENCODING = 'latin-1'
+
+_DOUBLE_BYTE = re.compile(rb'(.)(?=\1)', re.DOTALL)
+_SPACE_BYTE = re.compile(rb' ')
+
+
+def _pair_value(pair):
+    """Dvojice ASCII znaků jako uint16 v nativním pořadí bajtů (jako memoryview.cast('H'))."""
+    return memoryview(pair.encode('ascii')).cast('H')[0]
+
+
+def _byte_chars(encoding):
+    """
+    Znak pro každý ze 256 bajtů; kódování, které není jednobajtové, se odmítne.
+
+    Každý bajt se dekóduje samostatným inkrementálním dekodérem: vícebajtové
+    kódování (UTF-8, UTF-16, ...) si začátek sekvence podrží a nevrátí nic.
+    Nedefinované bajty (např. 0x81 v cp1250) se převedou na U+FFFD a filtr
+    je vypustí.
+    """
+    try:
+        decoder = codecs.getincrementaldecoder(codecs.lookup(encoding).name)
+    except LookupError:
+        raise ValueError(f"Neznámé kódování: {encoding}") from None
+    chars = [decoder(errors='replace').decode(bytes([byte]), final=False) for byte in range(256)]
+    whole = bytes(range(256)).decode(encoding, errors='replace')
+    if any(len(char) != 1 for char in chars) or whole != ''.join(chars):
+        raise ValueError(f"Kódování {encoding} není jednobajtové")
+    return chars
+
+
+class ByteTables:
+    """
+    Převodní tabulky zkompilovaného klíče pro práci nad bajty.
+
+    filter/delete jsou argumenty bytes.translate (256 bajtů), encrypt/decrypt
+    jsou pole array('H') indexovaná dvojicí bajtů přečtenou jako uint16.
+    """
+
+    def __init__(self, compiled, encoding=DEFAULT_ENCODING):
+        if not compiled.letters.isascii():
+            raise ValueError("Bajtové šifrování vyžaduje abecedu v ASCII")
+        replacement = REPLACEMENTS.get(compiled.replace_char, compiled.replace_char)
+        filter_table = bytearray(range(256))
+        delete = bytearray()
+        for byte, char in enumerate(_byte_chars(encoding)):
+            result = _filter_char(char, compiled.alphabet, compiled.replace_char, replacement)
+            if len(result) > 1:
+                raise ValueError(f"Znak {char!r} se filtruje na více znaků, použijte playfair_core.encrypt_message")
+            if result:
+                filter_table[byte] = ord(result)
+            else:
+                delete.append(byte)
+
+        self.compiled = compiled
+        self.filter = bytes(filter_table)
+        self.delete = bytes(delete)
+        self.encrypt = self._pair_table(compiled.encrypt_map)
+        self.decrypt = self._pair_table(compiled.decrypt_map)
+        self.padding = {ord(char): ord(compiled.padding_for(char)) for char in compiled.letters}
+
+    @staticmethod
+    def _pair_table(mapping):
+        table = array('H', bytes(2 * 65536))
+        for pair, result in mapping.items():
+            table[_pair_value(pair)] = _pair_value(result)
+        return table
+
+    def filter_bytes(self, data):
+        """Filtr jako filter_text, ale nad bajty (pozice mezer se nevrací)."""
+        # bytes.translate pracuje jen nad bytes, pohled do mapy se zkopíruje až zde
+        if not isinstance(data, bytes):
+            data = bytes(data)
+        return data.translate(self.filter, self.delete)
+
+    def transform(self, prepared, table):
+        """Převede bajty sudé délky po dvojicích podle tabulky; vrací objekt s bufferem."""
+        if not len(prepared):
+            return b''
+        pairs = memoryview(prepared).cast('H')
+        if HAS_NUMPY:
+            return np.frombuffer(table, dtype=np.uint16)[np.frombuffer(pairs, dtype=np.uint16)]
+        return array('H', map(table.__getitem__, pairs))
+
+
+def split_digraph_bytes(data, padding):
+    """
+    Bajtová obdoba playfair_core.split_digraphs.
+
+    padding mapuje bajt znaku na jeho výplň. Vrací (připravené bajty sudé
+    délky, pozice výplní, zbývající nespárovaný bajt).
+    """
+    if HAS_NUMPY:
+        return _split_digraph_array(data, padding)
+    parts = []
+    padding_positions = []
+    pos = 0
+    for match in _DOUBLE_BYTE.finditer(data):
+        k = match.start()
+        # Zdvojení se řeší jen tehdy, když začíná nový bigram
+        if (k - pos) % 2:
+            continue
+        parts.append(data[pos:k + 1])
+        parts.append(bytes([padding[data[k]]]))
+        padding_positions.append(k + 1)
+        pos = k + 1
+
+    rest = data[pos:]
+    if len(rest) % 2:
+        parts.append(rest[:-1])
+        rest = rest[-1:]
+    else:
+        parts.append(rest)
+        rest = b''
+    prepared = parts[0] if len(parts) == 1 else b''.join(parts)
+    return prepared, padding_positions, rest
+
+
+def _split_digraph_array(data, padding):
+    """
+    Vektorová verze split_digraph_bytes.
+
+    Zdvojení na indexu k se řeší, když má k jinou paritu než předchozí
+    řešené zdvojení (první musí být sudé). Nevyřešené zdvojení má vždy
+    stejnou paritu jako poslední vyřešené, takže stačí porovnat paritu
+    každého zdvojení s paritou předchozího zdvojení v pořadí.
+    """
+    values = np.frombuffer(data, dtype=np.uint8)
+    doubles = np.flatnonzero(values[:-1] == values[1:])
+    parity = doubles & 1
+    accepted = doubles[parity != np.concatenate(([1], parity[:-1]))]
+
+    lookup = np.zeros(256, dtype=np.uint8)
+    lookup[list(padding)] = list(padding.values())
+    prepared = np.insert(values, accepted + 1, lookup[values[accepted]])
+
+    pos = int(accepted[-1]) + 1 if len(accepted) else 0
+    padding_positions = accepted + 1
+    if (len(values) - pos) % 2:
+        return prepared[:-1], padding_positions, bytes(data[-1:])
+    return prepared, padding_positions, b''
+
+
+class ByteGrouper:
+    """Formátuje proud šifrových bajtů do skupin po 5 oddělených mezerou."""
+
+    def __init__(self):
+        self.carry = b''
+        self.started = False
+
+    def _format(self, data, lead):
+        # Výstupní buffer se alokuje předem; rozšířené řezy zapíší každou
+        # pátou pozici najednou a mezery zůstanou z inicializace
+        count = len(data)
+        total = lead + count + (count - 1) // 5
+        if HAS_NUMPY:
+            source = np.frombuffer(data, dtype=np.uint8)
+            out = np.full(total, ord(' '), dtype=np.uint8)
+        else:
+            source = bytes(data)
+            out = bytearray(b' ') * total
+        for offset in range(5):
+            out[lead + offset::6] = source[offset::5]
+        return out
+
+    def feed(self, data):
+        """Přidá šifrové bajty; vrací hotové celé skupiny (buffer)."""
+        data = memoryview(data).cast('B')
+        if self.carry:
+            data = memoryview(self.carry + data)
+        whole = len(data) - len(data) % 5
+        self.carry = bytes(data[whole:])
+        if not whole:
+            return b''
+        # Skupiny navazující na předchozí výstup začínají oddělující mezerou
+        out = self._format(data[:whole], 1 if self.started else 0)
+        self.started = True
+        return out
+
+    def finish(self):
+        """Vrátí poslední neúplnou skupinu."""
+        if not self.carry:
+            return b''
+        out = (b' ' if self.started else b'') + self.carry
+        self.carry = b''
+        self.started = True
+        return out
+
+
+class ByteEncryptor:
+    """
+    Proudové šifrování bajtů se stejným výsledkem jako StreamEncryptor.
+
+    feed() přijímá bajty v jednobajtovém kódování a vrací objekty
+    s bufferem (bytes, bytearray nebo pole NumPy) připravené pro write().
+    """
+
+    def __init__(self, compiled, encoding=DEFAULT_ENCODING, collect_metadata=False):
+        self.tables = ByteTables(compiled, encoding)
+        self.grouper = ByteGrouper()
+        self.pending = b''
+        self.collect_metadata = collect_metadata
+        self.spaces = array('Q')
+        self.padding_positions = array('Q')
+        self.consumed = 0
+        self.filtered = 0
+
+    def feed(self, chunk):
+        tables = self.tables
+        if self.collect_metadata:
+            self.spaces.extend(match.start() + self.consumed for match in _SPACE_BYTE.finditer(chunk))
+        filtered = tables.filter_bytes(chunk)
+        base = self.filtered - len(self.pending)
+        prepared, padding_positions, self.pending = split_digraph_bytes(self.pending + filtered, tables.padding)
+        if self.collect_metadata:
+            self.padding_positions.extend(position + base for position in padding_positions)
+        self.consumed += len(chunk)
+        self.filtered += len(filtered)
+        return self.grouper.feed(tables.transform(prepared, tables.encrypt))
+
+    def finish(self):
+        outputs = []
+        if self.pending:
+            char = self.pending[0]
+            self.pending = b''
+            if self.collect_metadata:
+                self.padding_positions.append(self.filtered)
+            pair = bytes([char, self.tables.padding[char]])
+            outputs.append(self.grouper.feed(self.tables.transform(pair, self.tables.encrypt)))
+        outputs.append(self.grouper.finish())
+        return b''.join(bytes(output) for output in outputs)
+
+    def metadata(self):
+        if not self.collect_metadata:
+            raise ValueError("Metadata se nesbírají, použijte collect_metadata=True")
+        return EncryptionMetadata(self.spaces, self.padding_positions)
+
+
+def _iter_mapped(path, chunk_size):
+    """
+    Bloky souboru jako memoryview do mmap bez kopírování.
+
+    Pohled platí jen do dalšího kroku iterace, pak se uvolní (mapu jinak
+    nejde zavřít). Prázdný soubor mmap nepodporuje, nevrací se nic.
+    """
+    with open(path, 'rb') as handle:
+        try:
+            mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return
+        with mapped:
+            if hasattr(mapped, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+                mapped.madvise(mmap.MADV_SEQUENTIAL)
+            with memoryview(mapped) as view:
+                for offset in range(0, len(mapped), chunk_size):
+                    chunk = view[offset:offset + chunk_size]
+                    try:
+                        yield chunk
+                    finally:
+                        chunk.release()
+
+
+def encrypt_bytes(compiled, data, encoding=DEFAULT_ENCODING):
+    """Zašifruje bajty najednou; vrací formátovaný šifrový text jako bytes."""
+    encryptor = ByteEncryptor(compiled, encoding)
+    return bytes(encryptor.feed(data)) + encryptor.finish()
+
+
+def encrypt_file(compiled, source, target, encoding=DEFAULT_ENCODING, chunk_size=MMAP_CHUNK_SIZE,
+                 collect_metadata=False):
+    """
+    Zašifruje soubor source do souboru target po blocích přes mmap.
+
+    Vrací EncryptionMetadata (jen s collect_metadata=True, jinak None).
+    """
+    encryptor = ByteEncryptor(compiled, encoding, collect_metadata)
+    with open(target, 'wb') as out:
+        for chunk in _iter_mapped(source, chunk_size):
+            out.write(encryptor.feed(chunk))
+        out.write(encryptor.finish())
+    return encryptor.metadata() if collect_metadata else None
+
+
+def decrypt_file(compiled, source, target, chunk_size=MMAP_CHUNK_SIZE, metadata=None,
+                 encoding=DEFAULT_ENCODING):
+    """
+    Dešifruje soubor source do souboru target.
+
+    Bez metadat po blocích (jako decrypt_stream): velká písmena včetně
+    výplní. S metadaty (EncryptionMetadata nebo jejich serializovaná
+    podoba) se kvůli obnově mezer zpracuje celý šifrový text najednou
+    (jako playfair_cli) a výsledek se zapíše v kódování encoding.
+    """
+    if metadata is not None:
+        ciphertext = ''.join(bytes(chunk).decode('ascii') for chunk in _iter_mapped(source, chunk_size))
+        plaintext = decrypt_message(compiled, ciphertext, metadata)
+        with open(target, 'wb') as out:
+            out.write(plaintext.encode(encoding))
+        return
+    tables = ByteTables(compiled, 'ascii')
+    pending = b''
+    with open(target, 'wb') as out:
+        for chunk in _iter_mapped(source, chunk_size):
+            filtered = pending + tables.filter_bytes(chunk)
+            usable = len(filtered) - len(filtered) % 2
+            pending = filtered[usable:]
+            out.write(tables.transform(filtered[:usable], tables.decrypt))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m playfair_mmap',
+                                     description="Šifrování velkých souborů v jednobajtovém kódování")
+    parser.add_argument('mode', choices=['encrypt', 'decrypt'])
+    parser.add_argument('source')
+    parser.add_argument('target')
+    parser.add_argument('--key', required=True)
+    parser.add_argument('--lang', default='EN', choices=sorted(LANGUAGES))
+    parser.add_argument('--encoding', default=DEFAULT_ENCODING,
+                        help="jednobajtové kódování otevřeného textu (latin-1, cp1250, iso-8859-2, ...)")
+    parser.add_argument('-m', '--metadata',
+                        help="soubor s metadaty (pozice mezer a výplní); encrypt jej zapíše, decrypt načte")
+    parser.add_argument('--chunk-size', type=int, default=MMAP_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    try:
+        compiled = get_compiled_key(args.key, args.lang)
+        if args.mode == 'encrypt':
+            metadata = encrypt_file(compiled, args.source, args.target, args.encoding, args.chunk_size,
+                                    collect_metadata=args.metadata is not None)
+            if metadata is not None:
+                with open(args.metadata, 'wb') as handle:
+                    handle.write(metadata.to_bytes())
+        else:
+            metadata = None
+            if args.metadata is not None:
+                with open(args.metadata, 'rb') as handle:
+                    metadata = handle.read()
+            decrypt_file(compiled, args.source, args.target, args.chunk_size, metadata, args.encoding)
+    except (OSError, ValueError, LookupError) as error:
+        print(f"Chyba: {error}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,401 @@
+# Asynchronní šifrovací služba Playfair (TCP na localhostu) a zátěžový klient
+# License: MIT License
+#
+# Spuštění serveru:  python -m playfair_server serve --port 8765
+# Zátěžový test:     python -m playfair_server bench --port 8765 --requests 10000
+#
+# Protokol: každá zpráva je 4bajtová délka (big-endian) následovaná JSON v UTF-8.
+#   požadavek: {"id": 1, "op": "encrypt"|"decrypt", "key": "...", "lang": "EN",
+#               "text": "...", "metadata": "<hex>"}
+#   odpověď:   {"id": 1, "ok": true, "output": "...", "metadata": "<hex>", "error": null}
+# Na jednom spojení lze posílat další požadavky bez čekání na odpovědi (pipelining);
+# odpovědi přicházejí ve stejném pořadí jako požadavky.
+
+import argparse
+import asyncio
+import json
+import os
+import struct
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from playfair_core import LANGUAGES
+from playfair_batch import BatchJob, process_job
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+# Hlavička zprávy: délka těla
+FRAME_HEADER = struct.Struct('>I')
+
+# Největší přijatá zpráva; větší spojení ukončí
+MAX_FRAME_SIZE = 64 * 1024 * 1024
+
+# Texty do této délky se zpracují přímo ve smyčce událostí, delší v procesech
+INLINE_LIMIT = 4096
+
+# Nejvýše tolik rozpracovaných požadavků na jedno spojení; pak se přestane číst (backpressure)
+DEFAULT_PIPELINE = 32
+
+
+def encode_frame(message):
+    """Zakóduje zprávu (slovník) do rámce s délkou."""
+    body = json.dumps(message, ensure_ascii=False).encode('utf-8')
+    return FRAME_HEADER.pack(len(body)) + body
+
+
+async def read_frame(reader):
+    """Přečte jeden rámec a vrátí dekódovanou zprávu; na konci spojení vrací None."""
+    try:
+        header = await reader.readexactly(FRAME_HEADER.size)
+    except asyncio.IncompleteReadError as error:
+        if error.partial:
+            raise
+        return None
+    (size,) = FRAME_HEADER.unpack(header)
+    if size > MAX_FRAME_SIZE:
+        raise ValueError(f"Zpráva je příliš velká ({size} B)")
+    return json.loads(await reader.readexactly(size))
+
+
+def _error_response(request_id, error):
+    return {'id': request_id, 'ok': False, 'output': None, 'metadata': None, 'error': error}
+
+
+class CipherServer:
+    """
+    Asyncio server pro šifrování a dešifrování s klíčem a jazykem v každém požadavku.
+
+    Sdílený stav nemá: každý požadavek dostane tabulku z cache klíčů, takže
+    požadavky se navzájem neblokují. concurrency omezuje počet současně
+    zpracovávaných požadavků přes všechna spojení, pipeline počet
+    rozpracovaných požadavků jednoho spojení. Dlouhé texty jdou do executoru.
+    """
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, concurrency=None, workers=None,
+                 pipeline=DEFAULT_PIPELINE, inline_limit=INLINE_LIMIT, executor=None):
+        self.host = host
+        self.port = port
+        self.concurrency = concurrency or 4 * (os.cpu_count() or 1)
+        self.workers = workers
+        self.pipeline = pipeline
+        self.inline_limit = inline_limit
+        self.executor = executor
+        self.server = None
+        self.requests = 0
+        self._semaphore = None
+        self._connections = set()
+
+    async def start(self):
+        """Spustí naslouchání; vrací asyncio.Server."""
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self.server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self.server
+
+    async def close(self):
+        """Zastaví server a executor."""
+        if self.server is not None:
+            self.server.close()
+            # Otevřená spojení se zruší; každé si samo zruší rozpracované požadavky
+            connections = list(self._connections)
+            for task in connections:
+                task.cancel()
+            await asyncio.gather(*connections, return_exceptions=True)
+            await self.server.wait_closed()
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+    async def serve_forever(self):
+        await self.start()
+        try:
+            async with self.server:
+                await self.server.serve_forever()
+        finally:
+            await self.close()
+
+    async def process(self, request):
+        """Zpracuje jeden požadavek a vrátí odpověď."""
+        request_id = request.get('id') if isinstance(request, dict) else None
+        try:
+            mode = request['op']
+            if mode not in ('encrypt', 'decrypt'):
+                raise ValueError(f"Neznámá operace: {mode}")
+            if not isinstance(request['key'], str) or not isinstance(request['text'], str):
+                raise TypeError("key a text musí být řetězce")
+            metadata = request.get('metadata')
+            job = BatchJob(request['key'], request.get('lang', 'EN'), request['text'],
+                           bytes.fromhex(metadata) if metadata else None)
+        except (KeyError, TypeError, ValueError) as error:
+            return _error_response(request_id, f"Neplatný požadavek: {error}")
+
+        async with self._semaphore:
+            if len(job.text) <= self.inline_limit:
+                result = process_job(mode, job)
+            else:
+                loop = asyncio.get_running_loop()
+                result = await loop.run_in_executor(self.executor, process_job, mode, job)
+        self.requests += 1
+        return {
+            'id': request_id,
+            'ok': result.ok,
+            'output': result.output,
+            'metadata': result.metadata.hex() if result.metadata is not None else None,
+            'error': result.error,
+        }
+
+    async def _handle_connection(self, reader, writer):
+        # Fronta rozpracovaných požadavků v pořadí příchodu; plná fronta zastaví čtení
+        pending = asyncio.Queue(maxsize=self.pipeline)
+        sender = asyncio.create_task(self._send_responses(pending, writer))
+        connection = asyncio.current_task()
+        self._connections.add(connection)
+        try:
+            try:
+                while True:
+                    try:
+                        request = await read_frame(reader)
+                    except (ValueError, asyncio.IncompleteReadError) as error:
+                        await pending.put(_done(_error_response(None, str(error))))
+                        break
+                    if request is None:
+                        break
+                    await pending.put(asyncio.ensure_future(self.process(request)))
+            except ConnectionError:
+                pass
+            await pending.put(None)
+            await sender
+        except asyncio.CancelledError:
+            # Ukončení serveru: na frontu se už nečeká, rozpracované požadavky se zruší.
+            # Výjimka se dál nešíří, asyncio by zrušený handler spojení zalogovalo jako chybu.
+            _cancel_pending(pending, sender)
+            writer.close()
+            return
+        finally:
+            self._connections.discard(connection)
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+    @staticmethod
+    async def _send_responses(pending, writer):
+        """Odesílá odpovědi ve stejném pořadí, v jakém přišly požadavky."""
+        connected = True
+        while True:
+            task = await pending.get()
+            if task is None:
+                return
+            try:
+                response = await task
+            except Exception as error:
+                # Chyba zpracování nesmí ukončit odesílání; klient dostane chybovou odpověď
+                response = _error_response(None, f"{type(error).__name__}: {error}")
+            if not connected:
+                # Klient odpojen: frontu jen vyprázdníme, aby se čtení nezaseklo
+                continue
+            try:
+                writer.write(encode_frame(response))
+                # Pomalý klient zastaví odesílání a přes plnou frontu i čtení dalších požadavků
+                await writer.drain()
+            except ConnectionError:
+                connected = False
+
+
+def _cancel_pending(pending, sender):
+    """Zruší odesílání odpovědí i všechny požadavky čekající ve frontě."""
+    sender.cancel()
+    while not pending.empty():
+        task = pending.get_nowait()
+        if task is not None:
+            task.cancel()
+
+
+def _done(value):
+    """Hotový future s danou hodnotou (pro odpovědi bez zpracování)."""
+    future = asyncio.get_running_loop().create_future()
+    future.set_result(value)
+    return future
+
+
+class CipherClient:
+    """
+    Asynchronní klient; request() lze volat souběžně a požadavky se pipelinují.
+
+    Po chybě spojení selžou všechny čekající požadavky a každý další
+    request() hned vyhodí ConnectionError.
+    """
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.next_id = 0
+        self.error = None
+        self._waiters = deque()     # futures odpovědí v pořadí odeslaných požadavků
+        self._receiver = asyncio.create_task(self._receive())
+
+    @classmethod
+    async def connect(cls, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    def _fail(self, error):
+        """Zaznamená chybu spojení a předá ji všem čekajícím požadavkům."""
+        if self.error is None:
+            self.error = error
+        while self._waiters:
+            future = self._waiters.popleft()
+            if not future.done():
+                future.set_exception(ConnectionError(f"Spojení se serverem selhalo: {self.error}"))
+
+    async def _receive(self):
+        try:
+            while True:
+                response = await read_frame(self.reader)
+                if response is None:
+                    raise ConnectionError("Server ukončil spojení")
+                if not self._waiters:
+                    raise ValueError("Odpověď bez odeslaného požadavku")
+                future = self._waiters.popleft()
+                if not future.done():       # volající mohl čekání zrušit
+                    future.set_result(response)
+        except asyncio.CancelledError:
+            self._fail(ConnectionError("Klient byl uzavřen"))
+            raise
+        except Exception as error:
+            self._fail(error)
+
+    async def request(self, op, key, text, lang='EN', metadata=None):
+        """Odešle požadavek a počká na odpověď (slovník)."""
+        if self.error is not None:
+            raise ConnectionError(f"Spojení se serverem selhalo: {self.error}")
+        self.next_id += 1
+        message = {'id': self.next_id, 'op': op, 'key': key, 'lang': lang, 'text': text}
+        if metadata is not None:
+            message['metadata'] = bytes(metadata).hex()
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        try:
+            self.writer.write(encode_frame(message))
+            await self.writer.drain()
+        except ConnectionError as error:
+            self._fail(error)
+        return await future
+
+    async def close(self):
+        self._receiver.cancel()
+        self._fail(ConnectionError("Klient byl uzavřen"))
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+def percentile(sorted_values, fraction):
+    """Percentil ze setříděných hodnot (nejbližší vyšší pořadí)."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+async def run_load(host=DEFAULT_HOST, port=DEFAULT_PORT, requests=1000, connections=4, pipeline=8,
+                   size=100, op='encrypt', key='PLAYFAIR', lang='EN'):
+    """
+    Zátěžový test: `connections` spojení, na každém až `pipeline` souběžných požadavků.
+
+    Vrací slovník s počtem požadavků, chybami, p50/p99 latencí [s] a požadavky za sekundu.
+    """
+    text = ('attack at dawn ' * (size // 15 + 1))[:size]
+    latencies = []
+    errors = 0
+    remaining = requests
+
+    async def worker(client):
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            response = await client.request(op, key, text, lang)
+            latencies.append(time.perf_counter() - start)
+            if not response['ok']:
+                errors += 1
+
+    clients = [await CipherClient.connect(host, port) for _ in range(connections)]
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(*(worker(client) for client in clients for _ in range(pipeline)))
+    finally:
+        elapsed = time.perf_counter() - start
+        for client in clients:
+            await client.close()
+
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'seconds': elapsed,
+        'p50': percentile(latencies, 0.50),
+        'p99': percentile(latencies, 0.99),
+        'rps': len(latencies) / elapsed if elapsed else 0.0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m playfair_server',
+                                     description="Asynchronní šifrovací služba Playfair")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    serve = commands.add_parser('serve', help="spustit server")
+    serve.add_argument('--host', default=DEFAULT_HOST)
+    serve.add_argument('--port', type=int, default=DEFAULT_PORT)
+    serve.add_argument('--concurrency', type=int, help="max. současně zpracovávaných požadavků")
+    serve.add_argument('--workers', type=int, help="počet procesů pro dlouhé texty")
+    serve.add_argument('--pipeline', type=int, default=DEFAULT_PIPELINE,
+                       help="max. rozpracovaných požadavků na spojení")
+    serve.add_argument('--inline-limit', type=int, default=INLINE_LIMIT,
+                       help="delší texty se zpracují v procesech")
+
+    bench = commands.add_parser('bench', help="zátěžový test běžícího serveru")
+    bench.add_argument('--host', default=DEFAULT_HOST)
+    bench.add_argument('--port', type=int, default=DEFAULT_PORT)
+    bench.add_argument('--requests', type=int, default=1000)
+    bench.add_argument('--connections', type=int, default=4)
+    bench.add_argument('--pipeline', type=int, default=8, help="souběžných požadavků na spojení")
+    bench.add_argument('--size', type=int, default=100, help="délka textu požadavku")
+    bench.add_argument('--op', choices=['encrypt', 'decrypt'], default='encrypt')
+    bench.add_argument('--key', default='PLAYFAIR')
+    bench.add_argument('--lang', default='EN', choices=sorted(LANGUAGES))
+    args = parser.parse_args(argv)
+
+    if args.command == 'serve':
+        server = CipherServer(args.host, args.port, args.concurrency, args.workers, args.pipeline,
+                              args.inline_limit)
+        print(f"Naslouchám na {args.host}:{args.port}", file=sys.stderr)
+        try:
+            asyncio.run(server.serve_forever())
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    try:
+        report = asyncio.run(run_load(args.host, args.port, args.requests, args.connections,
+                                      args.pipeline, args.size, args.op, args.key, args.lang))
+    except OSError as error:
+        print(f"Chyba: {error}", file=sys.stderr)
+        return 1
+    print(f"Požadavků: {report['requests']} (chyb: {report['errors']}) za {report['seconds']:.2f} s")
+    print(f"p50: {report['p50'] * 1000:.2f} ms  p99: {report['p99'] * 1000:.2f} ms  "
+          f"{report['rps']:.0f} req/s")
+    return 1 if report['errors'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
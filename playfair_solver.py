@@ -0,0 +1,400 @@
+# Kryptoanalýza Playfair ze samotného šifrového textu (simulované žíhání + quadgramy)
+# License: MIT License
+#
+# Spuštění: python -m playfair_solver -i zprava.pf          (EN, přiložená tabulka en_quadgrams.txt)
+#           python -m playfair_solver --quadgrams vlastni.txt -i zprava.pf
+#           python -m playfair_solver --train korpus.txt --lang CZ --restarts 16 < zprava.pf
+#
+# Ověření na známém klíči: python -m benchmarks.solver_check
+#
+# Kandidátní tabulka se drží jako dvě pole celých čísel (buňka -> písmeno
+# a písmeno -> buňka) a mutace je mění na místě. Dešifrování kandidáta je
+# jen indexování do předpočítané tabulky pravidel nad dvojicemi buněk.
+
+try:
+    import numpy as np
+except ImportError:  # NumPy je volitelná závislost
+    np = None
+
+import argparse
+import math
+import os
+import random
+import sys
+from array import array
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from playfair_core import LANGUAGES, CompiledKey, decrypt_raw, filter_text, grid_shape, resolve_language
+
+HAS_NUMPY = np is not None
+
+# Výsledek luštění: skóre (součet log10 pravděpodobností), tabulka a otevřený text
+SolveResult = namedtuple('SolveResult', 'score key table plaintext')
+
+# Pravděpodobnosti mutací: záměna dvou buněk, jinak záměna řádků nebo sloupců
+SWAP_CELLS_RATE = 0.9
+SWAP_ROWS_RATE = 0.05
+
+# Výchozí plán žíhání: počet teplot a iterací na jednu teplotu (celkem 1M kandidátů na běh)
+DEFAULT_STEPS = 100
+DEFAULT_ITERATIONS = 10000
+
+# Přiložené tabulky quadgramů podle jazyka; pro ostatní je nutný --quadgrams nebo --train
+DEFAULT_QUADGRAMS = {
+    'EN': os.path.join(os.path.dirname(os.path.abspath(__file__)), 'en_quadgrams.txt'),
+}
+
+
+def cell_rules(rows=5, cols=5, shift=-1):
+    """
+    Pravidla Playfair nad indexy buněk: pro dvojici buněk c1 * (rows * cols) + c2
+    vrací pole cílových buněk (první a druhé písmeno). Nezávisí na klíči.
+    """
+    # Tabulka jednoprvkových n-tic: _transform je sčítá, takže vrací dvojici buněk
+    table = [[(row * cols + col,) for col in range(cols)] for row in range(rows)]
+    cells = rows * cols
+    first = array('H', bytes(2 * cells * cells))
+    second = array('H', bytes(2 * cells * cells))
+    for cell1 in range(cells):
+        row1, col1 = divmod(cell1, cols)
+        for cell2 in range(cells):
+            row2, col2 = divmod(cell2, cols)
+            target1, target2 = CompiledKey._transform(table, rows, cols, row1, col1, row2, col2, shift)
+            first[cell1 * cells + cell2] = target1
+            second[cell1 * cells + cell2] = target2
+    return first, second
+
+
+class QuadgramScorer:
+    """
+    Skóre textu jako součet log10 pravděpodobností jeho quadgramů.
+
+    Tabulka má n⁴ položek (n = délka abecedy) v poli array('d'); neviděné
+    quadgramy dostanou pevnou minimální hodnotu.
+    """
+
+    def __init__(self, alphabet, counts):
+        self.alphabet = alphabet
+        n = len(alphabet)
+        index = {char: i for i, char in enumerate(alphabet)}
+        total = sum(counts.values())
+        if not total:
+            raise ValueError("Žádné quadgramy pro trénink")
+        self.floor = math.log10(0.01 / total)
+        self.table = array('d', [self.floor]) * (n ** 4)
+        for gram, count in counts.items():
+            a, b, c, d = (index[char] for char in gram)
+            self.table[((a * n + b) * n + c) * n + d] = math.log10(count / total)
+
+    def __reduce__(self):
+        # Do pracovních procesů se přenáší jen hotové pole
+        return (_restore_scorer, (self.alphabet, self.floor, self.table))
+
+    @classmethod
+    def from_file(cls, path, lang='EN'):
+        """Načte soubor s řádky 'ABCD počet' (znaky mimo abecedu jazyka se převedou filtrem)."""
+        _, alphabet, replace_char, _, _ = resolve_language(lang)
+        counts = {}
+        with open(path, encoding='utf-8') as handle:
+            for line in handle:
+                parts = line.split()
+                if len(parts) != 2:
+                    continue
+                gram, _ = filter_text(parts[0], alphabet, replace_char)
+                if len(gram) == 4:
+                    counts[gram] = counts.get(gram, 0) + int(parts[1])
+        return cls(alphabet, counts)
+
+    @classmethod
+    def default(cls, lang='EN'):
+        """
+        Přiložená tabulka pro jazyk (EN: Newtonova Opticks, asi 19 000 quadgramů).
+
+        Na delší text z jiné oblasti stačí; pro krátké texty nebo jiný jazyk
+        je lepší tabulka z korpusu podobného otevřenému textu.
+        """
+        code = resolve_language(lang)[0]
+        if code not in DEFAULT_QUADGRAMS:
+            raise ValueError(f"Pro jazyk {code} není přiložená tabulka quadgramů, použijte --quadgrams nebo --train")
+        return cls.from_file(DEFAULT_QUADGRAMS[code], code)
+
+    @classmethod
+    def from_text(cls, text, lang='EN'):
+        """Natrénuje četnosti quadgramů z textu v daném jazyce."""
+        _, alphabet, replace_char, _, _ = resolve_language(lang)
+        filtered, _ = filter_text(text, alphabet, replace_char)
+        counts = {}
+        for i in range(len(filtered) - 3):
+            gram = filtered[i:i + 4]
+            counts[gram] = counts.get(gram, 0) + 1
+        return cls(alphabet, counts)
+
+    def score_text(self, text):
+        """Skóre textu (už filtrovaného na abecedu)."""
+        index = {char: i for i, char in enumerate(self.alphabet)}
+        return self.score_indices([index[char] for char in text if char in index])
+
+    def score_indices(self, values):
+        """Skóre posloupnosti indexů písmen."""
+        n = len(self.alphabet)
+        table = self.table
+        return sum([table[((a * n + b) * n + c) * n + d]
+                    for a, b, c, d in zip(values, values[1:], values[2:], values[3:])])
+
+
+def _restore_scorer(alphabet, floor, table):
+    scorer = QuadgramScorer.__new__(QuadgramScorer)
+    scorer.alphabet = alphabet
+    scorer.floor = floor
+    scorer.table = table
+    return scorer
+
+
+class Candidate:
+    """
+    Kandidátní tabulka jako pole square (buňka -> písmeno) a pos (písmeno -> buňka).
+
+    Mutace mění obě pole na místě a jsou samy sobě inverzí, takže
+    odmítnutý krok se vrátí stejným voláním.
+    """
+
+    __slots__ = ('square', 'pos', 'rows', 'cols')
+
+    def __init__(self, square, rows=5, cols=5):
+        self.rows = rows
+        self.cols = cols
+        self.square = list(square)
+        self.pos = [0] * len(self.square)
+        for cell, letter in enumerate(self.square):
+            self.pos[letter] = cell
+
+    def swap_cells(self, cell1, cell2):
+        square = self.square
+        letter1 = square[cell1]
+        letter2 = square[cell2]
+        square[cell1] = letter2
+        square[cell2] = letter1
+        self.pos[letter1] = cell2
+        self.pos[letter2] = cell1
+
+    def swap_rows(self, row1, row2):
+        cols = self.cols
+        for col in range(cols):
+            self.swap_cells(row1 * cols + col, row2 * cols + col)
+
+    def swap_cols(self, col1, col2):
+        cols = self.cols
+        for row in range(self.rows):
+            self.swap_cells(row * cols + col1, row * cols + col2)
+
+    def mutate(self, rng):
+        """Provede náhodnou mutaci; vrací funkci a argumenty pro její vrácení."""
+        roll = rng.random()
+        if roll < SWAP_CELLS_RATE:
+            cell1, cell2 = rng.sample(range(len(self.square)), 2)
+            move = (self.swap_cells, cell1, cell2)
+        elif roll < SWAP_CELLS_RATE + SWAP_ROWS_RATE:
+            move = (self.swap_rows, *rng.sample(range(self.rows), 2))
+        else:
+            move = (self.swap_cols, *rng.sample(range(self.cols), 2))
+        move[0](move[1], move[2])
+        return move
+
+    def table(self, alphabet):
+        """Tabulka jako n-tice řádků znaků (pro CompiledKey)."""
+        cols = self.cols
+        return tuple(tuple(alphabet[letter] for letter in self.square[row * cols:(row + 1) * cols])
+                     for row in range(self.rows))
+
+
+class Annealer:
+    """
+    Simulované žíhání nad jedním šifrovým textem.
+
+    Šifrový text se jednou převede na indexy písmen; ohodnocení kandidáta
+    je dešifrování přes cell_rules a součet quadgramů. S NumPy proběhne
+    obojí vektorově.
+    """
+
+    def __init__(self, scorer, ciphertext, use_numpy=None):
+        if use_numpy is None:
+            use_numpy = HAS_NUMPY
+        if use_numpy and not HAS_NUMPY:
+            raise ImportError("NumPy není nainstalováno")
+
+        alphabet = scorer.alphabet
+        index = {char: i for i, char in enumerate(alphabet)}
+        values = [index[char] for char in ciphertext if char in index]
+        values = values[:len(values) - len(values) % 2]
+        if len(values) < 4:
+            raise ValueError("Šifrový text je na luštění příliš krátký")
+
+        self.scorer = scorer
+        self.rows, self.cols = grid_shape(len(alphabet))
+        self.cells = len(alphabet)
+        self.length = len(values)
+        self.first = values[0::2]
+        self.second = values[1::2]
+        self.rules = cell_rules(self.rows, self.cols)
+        self.use_numpy = use_numpy
+
+        if use_numpy:
+            self._first = np.array(self.first, dtype=np.intp)
+            self._second = np.array(self.second, dtype=np.intp)
+            self._rules = tuple(np.array(rule, dtype=np.intp) for rule in self.rules)
+            self._table = np.frombuffer(scorer.table, dtype=np.float64)
+            self._plain = np.empty(self.length, dtype=np.intp)
+
+    def decrypt(self, candidate):
+        """Otevřený text kandidáta jako seznam indexů písmen."""
+        pos = candidate.pos
+        square = candidate.square
+        cells = self.cells
+        rule1, rule2 = self.rules
+        keys = [pos[a] * cells + pos[b] for a, b in zip(self.first, self.second)]
+        plain = [0] * self.length
+        plain[0::2] = [square[rule1[k]] for k in keys]
+        plain[1::2] = [square[rule2[k]] for k in keys]
+        return plain
+
+    def score(self, candidate):
+        """Skóre otevřeného textu, který dává kandidátní tabulka."""
+        if not self.use_numpy:
+            return self.scorer.score_indices(self.decrypt(candidate))
+        pos = np.array(candidate.pos, dtype=np.intp)
+        square = np.array(candidate.square, dtype=np.intp)
+        keys = pos[self._first] * self.cells + pos[self._second]
+        plain = self._plain
+        plain[0::2] = square[self._rules[0][keys]]
+        plain[1::2] = square[self._rules[1][keys]]
+        n = self.cells
+        grams = ((plain[:-3] * n + plain[1:-2]) * n + plain[2:-1]) * n + plain[3:]
+        return float(self._table[grams].sum())
+
+    def default_temperature(self):
+        """Počáteční teplota podle délky textu (empirické doporučení pro Playfair)."""
+        return max(1.0, 10 + 0.087 * (self.length - 84))
+
+    def run(self, seed=None, steps=DEFAULT_STEPS, iterations=DEFAULT_ITERATIONS, temperature=None):
+        """Jeden běh žíhání z náhodné tabulky; vrací (nejlepší skóre, pole square)."""
+        rng = random.Random(seed)
+        square = list(range(self.cells))
+        rng.shuffle(square)
+        candidate = Candidate(square, self.rows, self.cols)
+
+        if temperature is None:
+            temperature = self.default_temperature()
+        current = self.score(candidate)
+        best = current
+        best_square = list(candidate.square)
+        score = self.score
+        for step in range(steps):
+            heat = temperature * (1 - step / steps)
+            for _ in range(iterations):
+                undo, arg1, arg2 = candidate.mutate(rng)
+                trial = score(candidate)
+                delta = trial - current
+                if delta >= 0 or rng.random() < math.exp(delta / heat):
+                    current = trial
+                    if current > best:
+                        best = current
+                        best_square = list(candidate.square)
+                else:
+                    undo(arg1, arg2)
+        return best, best_square
+
+
+# Stav pracovního procesu (nastaví _init_worker)
+_worker_annealer = None
+
+
+def _init_worker(scorer, ciphertext, use_numpy):
+    global _worker_annealer
+    _worker_annealer = Annealer(scorer, ciphertext, use_numpy)
+
+
+def _run_restart(task):
+    seed, steps, iterations, temperature = task
+    return _worker_annealer.run(seed, steps, iterations, temperature)
+
+
+def solve(ciphertext, scorer, lang='EN', restarts=4, workers=None, seed=None, steps=DEFAULT_STEPS,
+          iterations=DEFAULT_ITERATIONS, temperature=None, use_numpy=None):
+    """
+    Najde tabulku, která dává nejpravděpodobnější otevřený text.
+
+    Nezávislé restarty žíhání běží ve více procesech (workers=1 v aktuálním
+    procesu). Výsledný otevřený text vzniká běžným decrypt_raw, takže
+    odpovídá pravidlům šifry, ne jen interní reprezentaci. Nalezená tabulka
+    se od původní může lišit cyklickým posunem řádků nebo sloupců; takové
+    tabulky šifrují stejně, proto se úspěch posuzuje podle otevřeného textu.
+    """
+    _, alphabet, replace_char, padding_char, secondary_padding_char = resolve_language(lang)
+    if alphabet != scorer.alphabet:
+        raise ValueError("Quadgramy nejsou pro abecedu zvoleného jazyka")
+    filtered, _ = filter_text(ciphertext, alphabet, replace_char)
+
+    base = random.Random(seed)
+    tasks = [(base.getrandbits(64), steps, iterations, temperature) for _ in range(restarts)]
+    if workers == 1:
+        _init_worker(scorer, filtered, use_numpy)
+        results = [_run_restart(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(scorer, filtered, use_numpy)) as executor:
+            results = list(executor.map(_run_restart, tasks))
+
+    score, square = max(results, key=lambda result: result[0])
+    table = Candidate(square, *grid_shape(len(alphabet))).table(alphabet)
+    compiled = CompiledKey(table, alphabet, replace_char, padding_char, secondary_padding_char, lang=lang)
+    return SolveResult(score, compiled.letters, table, decrypt_raw(compiled, filtered))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m playfair_solver',
+                                     description="Luštění Playfair ze šifrového textu")
+    parser.add_argument('-i', '--input', help="soubor se šifrovým textem (výchozí stdin)")
+    parser.add_argument('--lang', default='EN', choices=sorted(LANGUAGES))
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('--quadgrams', help="soubor s četnostmi quadgramů ('ABCD počet' na řádek; "
+                                            "výchozí přiložená tabulka jazyka)")
+    source.add_argument('--train', help="text, ze kterého se četnosti quadgramů natrénují")
+    parser.add_argument('--restarts', type=int, default=os.cpu_count() or 1, help="počet nezávislých běhů")
+    parser.add_argument('--workers', type=int, help="počet procesů")
+    parser.add_argument('--steps', type=int, default=DEFAULT_STEPS, help="počet teplot")
+    parser.add_argument('--iterations', type=int, default=DEFAULT_ITERATIONS, help="iterací na teplotu")
+    parser.add_argument('--temperature', type=float, help="počáteční teplota (výchozí podle délky textu)")
+    parser.add_argument('--seed', type=int)
+    args = parser.parse_args(argv)
+
+    try:
+        if args.quadgrams:
+            scorer = QuadgramScorer.from_file(args.quadgrams, args.lang)
+        elif args.train:
+            with open(args.train, encoding='utf-8') as handle:
+                scorer = QuadgramScorer.from_text(handle.read(), args.lang)
+        else:
+            scorer = QuadgramScorer.default(args.lang)
+        if args.input:
+            with open(args.input, encoding='utf-8') as handle:
+                ciphertext = handle.read()
+        else:
+            ciphertext = sys.stdin.read()
+        result = solve(ciphertext, scorer, args.lang, args.restarts, args.workers, args.seed,
+                       args.steps, args.iterations, args.temperature)
+    except (OSError, ValueError) as error:
+        print(f"Chyba: {error}", file=sys.stderr)
+        return 1
+
+    print(f"Skóre: {result.score:.2f}")
+    print("Tabulka:")
+    for row in result.table:
+        print('  ' + ' '.join(row))
+    print(f"Klíč: {result.key}")
+    print(f"Otevřený text: {result.plaintext}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
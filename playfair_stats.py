@@ -0,0 +1,151 @@
+# Volitelná instrumentace šifrovacího řetězce (časy fází, počítadla, export)
+# License: MIT License
+#
+# Použití:
+#     with profile() as stats:
+#         cipher.encrypt(text)
+#     print(stats.to_prometheus())
+#
+# Když sběr neběží, stojí instrumentace v playfair_core jen jedno porovnání
+# `_stats is not None` na volání.
+
+import threading
+from contextlib import contextmanager
+
+import playfair_core
+
+# Popisy metrik pro textový export
+_STAGE_METRICS = (
+    ('calls', 'calls_total', "Počet volání fáze"),
+    ('seconds', 'seconds_total', "Celkový čas fáze v sekundách"),
+    ('chars_in', 'input_chars_total', "Počet znaků na vstupu fáze"),
+    ('chars_out', 'output_chars_total', "Počet znaků na výstupu fáze"),
+)
+
+
+class StageStats:
+    """Souhrn jedné fáze: počet volání, čas (celkem/min/max) a znaky na vstupu/výstupu."""
+
+    __slots__ = ('calls', 'seconds', 'min', 'max', 'chars_in', 'chars_out')
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.min = None
+        self.max = 0.0
+        self.chars_in = 0
+        self.chars_out = 0
+
+    def as_dict(self):
+        return {
+            'calls': self.calls,
+            'seconds': self.seconds,
+            'mean': self.seconds / self.calls if self.calls else 0.0,
+            'min': self.min or 0.0,
+            'max': self.max,
+            'chars_in': self.chars_in,
+            'chars_out': self.chars_out,
+        }
+
+
+class PipelineStats:
+    """
+    Sběr statistik z playfair_core (filter_text, prepare_text, encrypt_pairs,
+    decrypt_pairs, format_groups, restore_spaces_and_special, proudy)
+    a počítadel (volání, výplně, zásahy cache tabulek).
+
+    Zápis je chráněný zámkem, takže jeden objekt lze sdílet mezi vlákny.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stages = {}
+        self.counters = {}
+
+    def record(self, stage, seconds, chars_in=0, chars_out=0):
+        """Zaznamená jedno volání fáze."""
+        with self._lock:
+            item = self.stages.get(stage)
+            if item is None:
+                item = self.stages[stage] = StageStats()
+            item.calls += 1
+            item.seconds += seconds
+            item.min = seconds if item.min is None else min(item.min, seconds)
+            item.max = max(item.max, seconds)
+            item.chars_in += chars_in
+            item.chars_out += chars_out
+
+    def count(self, name, value=1):
+        """Přičte hodnotu k počítadlu."""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def reset(self):
+        with self._lock:
+            self.stages.clear()
+            self.counters.clear()
+
+    def snapshot(self):
+        """Aktuální stav jako slovník {'stages': {...}, 'counters': {...}}."""
+        with self._lock:
+            return {
+                'stages': {name: item.as_dict() for name, item in self.stages.items()},
+                'counters': dict(self.counters),
+            }
+
+    def to_prometheus(self, prefix='playfair'):
+        """Textový export ve formátu Prometheus (exposition format 0.0.4)."""
+        data = self.snapshot()
+        lines = []
+        for field, suffix, description in _STAGE_METRICS:
+            metric = f"{prefix}_stage_{suffix}"
+            lines.append(f"# HELP {metric} {description}")
+            lines.append(f"# TYPE {metric} counter")
+            for stage, values in sorted(data['stages'].items()):
+                lines.append(f'{metric}{{stage="{stage}"}} {values[field]}')
+        for name, value in sorted(data['counters'].items()):
+            metric = f"{prefix}_{name}_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {value}")
+        return '\n'.join(lines) + '\n'
+
+    def format_table(self):
+        """Čitelná tabulka fází seřazená podle celkového času."""
+        data = self.snapshot()
+        lines = [f"{'fáze':<28} {'volání':>8} {'celkem ms':>12} {'průměr ms':>12} {'vstup':>12} {'výstup':>12}"]
+        for stage, values in sorted(data['stages'].items(), key=lambda item: -item[1]['seconds']):
+            lines.append(f"{stage:<28} {values['calls']:>8} {values['seconds'] * 1000:>12.3f} "
+                         f"{values['mean'] * 1000:>12.3f} {values['chars_in']:>12} {values['chars_out']:>12}")
+        for name, value in sorted(data['counters'].items()):
+            lines.append(f"{name:<28} {value:>8}")
+        return '\n'.join(lines)
+
+
+def enable(stats=None):
+    """Zapne sběr statistik do stats (nebo nového PipelineStats) a vrátí ho."""
+    if stats is None:
+        stats = PipelineStats()
+    playfair_core.set_stats(stats)
+    return stats
+
+
+def disable():
+    """Vypne sběr statistik; vrací dosud aktivní objekt (nebo None)."""
+    return playfair_core.set_stats(None)
+
+
+def get_stats():
+    """Aktuálně aktivní PipelineStats, nebo None."""
+    return playfair_core._stats
+
+
+@contextmanager
+def profile(stats=None):
+    """Sbírá statistiky jen uvnitř bloku with; předchozí nastavení se pak obnoví."""
+    if stats is None:
+        stats = PipelineStats()
+    previous = playfair_core.set_stats(stats)
+    try:
+        yield stats
+    finally:
+        playfair_core.set_stats(previous)